@@ -3,10 +3,21 @@ AI 에이전트 - OpenAI GPT-4o Vision을 사용한 음식 인식
 """
 import os
 import base64
+import threading
 from datetime import date, timedelta
 from openai import OpenAI
 import json
 
+from food_classifier import EGG_SHELF_LIFE_DAYS
+from tracing import annotate, trace_methods
+
+# 모델별 토큰 단가 (USD / 1M 토큰)
+MODEL_PRICING = {
+    "gpt-4o": {"input": 2.50, "output": 10.00},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
+}
+
+@trace_methods("llm", exclude=("encode_image", "estimate_cost", "stream_recipe_suggestions", "stream_cooking_answer"))
 class FoodRecognitionAgent:
     """음식 인식 AI 에이전트"""
 
@@ -16,6 +27,40 @@ class FoodRecognitionAgent:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
         self.client = OpenAI(api_key=self.api_key)
 
+        # 모델별 누적 토큰 사용량 (여러 스레드에서 호출 가능)
+        self.usage = {}
+        self._usage_lock = threading.Lock()
+
+    def _record_usage(self, model, response):
+        """응답의 토큰 사용량 누적"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            annotate(model=model)
+            return
+        annotate(model=model, prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+        with self._usage_lock:
+            totals = self.usage.setdefault(model, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            totals["requests"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens or 0
+            totals["completion_tokens"] += usage.completion_tokens or 0
+
+    def estimate_cost(self):
+        """
+        누적 토큰 사용량 기준 예상 비용
+
+        Returns:
+            float: 예상 비용 (USD)
+        """
+        with self._usage_lock:
+            cost = 0.0
+            for model, totals in self.usage.items():
+                pricing = MODEL_PRICING.get(model)
+                if not pricing:
+                    continue
+                cost += totals["prompt_tokens"] / 1_000_000 * pricing["input"]
+                cost += totals["completion_tokens"] / 1_000_000 * pricing["output"]
+            return cost
+
     def encode_image(self, image_path):
         """이미지를 base64로 인코딩"""
         with open(image_path, "rb") as image_file:
@@ -42,7 +87,7 @@ class FoodRecognitionAgent:
 
         # 예시 날짜 계산 (오늘 기준)
         example_egg_date = date(today.year, 12, 1) if today.month <= 12 else date(today.year, today.month, 1)
-        example_egg_expiry = example_egg_date + timedelta(days=40)
+        example_egg_expiry = example_egg_date + timedelta(days=EGG_SHELF_LIFE_DAYS)
         example_days_left = (example_egg_expiry - today).days
 
         # 날짜 문자열 미리 포맷
@@ -55,11 +100,11 @@ class FoodRecognitionAgent:
 
 **계란(달걀) 특별 규칙:**
 - 계란 껍질에 적힌 숫자는 **산란일자**(닭이 알을 낳은 날)입니다
-- 냉장 보관 기준: 산란일자 + 40일 = 소비기한
+- 냉장 보관 기준: 산란일자 + {EGG_SHELF_LIFE_DAYS}일 = 소비기한
 - 예시: "1201" → 12월 1일 산란 → 냉장 보관 시 {example_egg_expiry.year}년 {example_egg_expiry.month}월 {example_egg_expiry.day}일 소비기한
 
 날짜 형식 예시:
-- 계란 껍질: "1201" = {example_egg_date.year}년 12월 1일 산란 → 냉장 보관 시 산란일 + 40일 = {example_egg_expiry.year}년 {example_egg_expiry.month}월 {example_egg_expiry.day}일 소비기한
+- 계란 껍질: "1201" = {example_egg_date.year}년 12월 1일 산란 → 냉장 보관 시 산란일 + {EGG_SHELF_LIFE_DAYS}일 = {example_egg_expiry.year}년 {example_egg_expiry.month}월 {example_egg_expiry.day}일 소비기한
 - 우유팩: "2024.12.15" = 소비기한 12월 15일 (표기된 날짜가 소비기한)
 - "25/12/20" = 2025년 12월 20일
 - "2025.12.20" = 2025년 12월 20일
@@ -114,6 +159,7 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
                 ],
                 max_tokens=1024
             )
+            self._record_usage("gpt-4o", response)
 
             # 응답에서 JSON 추출
             response_text = response.choices[0].message.content
@@ -195,6 +241,7 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
                 ],
                 max_tokens=512
             )
+            self._record_usage("gpt-4o-mini", response)
 
             response_text = response.choices[0].message.content
 
@@ -242,16 +289,7 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
         if not ingredients:
             return "냉장고에 재료가 없습니다."
 
-        prompt = f"""냉장고에 다음 재료들이 있습니다:
-{', '.join(ingredients)}
-
-이 재료들로 만들 수 있는 레시피 3가지를 추천해주세요. 각 레시피는:
-1. 요리 이름
-2. 필요한 주재료 (위 재료 중)
-3. 간단한 조리 방법 (3-4단계)
-4. 예상 조리 시간
-
-소비기한이 임박한 재료를 우선적으로 사용하는 레시피를 추천해주세요."""
+        prompt = self._recipe_prompt(ingredients)
 
         try:
             response = self.client.chat.completions.create(
@@ -264,6 +302,7 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
                 ],
                 max_tokens=2048
             )
+            self._record_usage("gpt-4o-mini", response)
 
             return response.choices[0].message.content
 
@@ -285,12 +324,50 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
         if not question or question.strip() == "":
             return "질문을 입력해주세요."
 
+        prompt = self._cooking_prompt(question, ingredients)
+
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                max_tokens=1500
+            )
+            self._record_usage("gpt-4o-mini", response)
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            print(f"요리 질문 답변 오류: {e}")
+            return f"답변 중 오류가 발생했습니다: {str(e)}"
+
+    @staticmethod
+    def _recipe_prompt(ingredients):
+        """레시피 추천 프롬프트"""
+        return f"""냉장고에 다음 재료들이 있습니다:
+{', '.join(ingredients)}
+
+이 재료들로 만들 수 있는 레시피 3가지를 추천해주세요. 각 레시피는:
+1. 요리 이름
+2. 필요한 주재료 (위 재료 중)
+3. 간단한 조리 방법 (3-4단계)
+4. 예상 조리 시간
+
+소비기한이 임박한 재료를 우선적으로 사용하는 레시피를 추천해주세요."""
+
+    @staticmethod
+    def _cooking_prompt(question, ingredients=None):
+        """요리 질문 프롬프트 (냉장고 재료가 있으면 컨텍스트에 포함)"""
         # 냉장고 재료 정보를 컨텍스트에 포함
         context = ""
         if ingredients and len(ingredients) > 0:
             context = f"\n\n참고: 현재 냉장고에 있는 재료는 다음과 같습니다:\n{', '.join(ingredients)}"
 
-        prompt = f"""당신은 전문 요리사이자 영양 상담가입니다. 사용자의 요리 관련 질문에 친절하고 상세하게 답변해주세요.{context}
+        return f"""당신은 전문 요리사이자 영양 상담가입니다. 사용자의 요리 관련 질문에 친절하고 상세하게 답변해주세요.{context}
 
 사용자 질문: {question}
 
@@ -301,20 +378,56 @@ JSON만 반환하고 다른 설명은 추가하지 마세요."""
 - 보관 및 식품 안전 정보
 - 영양 정보 (필요한 경우)"""
 
+    def _stream_completion(self, model, prompt, max_tokens):
+        """응답을 생성되는 대로 텍스트 조각으로 반환 (마지막 청크의 토큰 사용량 누적)"""
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.usage is not None:
+                self._record_usage(model, chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def stream_recipe_suggestions(self, ingredients):
+        """
+        레시피 추천 (스트리밍)
+
+        Args:
+            ingredients: 재료 리스트 (음식 이름들)
+
+        Yields:
+            str: 레시피 추천 텍스트 조각
+        """
+        if not ingredients:
+            yield "냉장고에 재료가 없습니다."
+            return
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=1500
-            )
+            yield from self._stream_completion("gpt-4o-mini", self._recipe_prompt(ingredients), 2048)
+        except Exception as e:
+            print(f"레시피 추천 오류: {e}")
+            yield f"레시피 추천 중 오류가 발생했습니다: {str(e)}"
 
-            return response.choices[0].message.content
+    def stream_cooking_answer(self, question, ingredients=None):
+        """
+        요리 관련 질문에 답변 (스트리밍)
+
+        Args:
+            question: 사용자의 질문
+            ingredients: 냉장고에 있는 재료 리스트 (선택사항)
 
+        Yields:
+            str: 답변 텍스트 조각
+        """
+        if not question or question.strip() == "":
+            yield "질문을 입력해주세요."
+            return
+        try:
+            yield from self._stream_completion("gpt-4o-mini", self._cooking_prompt(question, ingredients), 1500)
         except Exception as e:
             print(f"요리 질문 답변 오류: {e}")
-            return f"답변 중 오류가 발생했습니다: {str(e)}"
+            yield f"답변 중 오류가 발생했습니다: {str(e)}"
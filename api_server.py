@@ -0,0 +1,386 @@
+"""
+냉요 REST API 서버 (Streamlit 화면 없이 재고/AI 기능 사용)
+
+실행:
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+    (또는 python api_server.py)
+
+의존성은 requirements-api.txt, 환경 변수는 앱과 같습니다. (FRIDGE_DB_URL, FRIDGE_SHARD_DIR, OPENAI_API_KEY, FRIDGE_MOCK_LLM)
+가구는 Authorization: Bearer <가구 접속 키> 헤더로 확인합니다. (FRIDGE_HOUSEHOLD_KEYS, 설정하지 않았으면 기본 가구)
+API 문서는 서버 실행 후 /docs 에서 확인할 수 있습니다.
+"""
+import base64
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional
+
+from dotenv import load_dotenv
+from fastapi import Depends, FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from starlette.concurrency import run_in_threadpool
+
+from database import CATEGORIES, HISTORY_OUTCOMES, LOCATIONS
+from food_classifier import FoodClassifier
+from household_router import HouseholdRouter, authenticate_household
+
+load_dotenv()
+
+# 목록 페이지 최대 크기
+MAX_PAGE_SIZE = 500
+
+# 일괄 추가 한 번에 받을 최대 음식 수
+MAX_BULK_ITEMS = 1000
+
+# 업로드 이미지 최대 크기 (바이트)
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+# 재료를 지정하지 않았을 때 레시피/채팅에 사용할 냉장고 재료 수 (임박 재료 우선)
+MAX_CONTEXT_INGREDIENTS = 30
+
+Category = Literal[tuple(CATEGORIES)]
+Location = Literal[tuple(LOCATIONS)]
+Status = Literal["신선", "임박", "만료"]
+Outcome = Literal[tuple(HISTORY_OUTCOMES)]
+
+
+class FoodIn(BaseModel):
+    """음식 추가 요청"""
+    name: str = Field(min_length=1, max_length=100)
+    category: Category
+    purchase_date: date = Field(default_factory=date.today)
+    expiry_date: date
+    location: Location = "냉장"
+    quantity: float = Field(default=1.0, gt=0)
+    unit: str = Field(default="개", max_length=20)
+    memo: Optional[str] = Field(default=None, max_length=200)
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.expiry_date < self.purchase_date:
+            raise ValueError("소비기한은 구매일보다 이후여야 합니다.")
+        return self
+
+
+class FoodUpdate(BaseModel):
+    """음식 수정 요청 (보낸 항목만 수정)"""
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    category: Optional[Category] = None
+    purchase_date: Optional[date] = None
+    expiry_date: Optional[date] = None
+    location: Optional[Location] = None
+    quantity: Optional[float] = Field(default=None, gt=0)
+    unit: Optional[str] = Field(default=None, max_length=20)
+    memo: Optional[str] = Field(default=None, max_length=200)
+
+    @model_validator(mode="after")
+    def check_values(self):
+        # 생략은 "수정 안 함"이지만 null은 비울 수 있는 항목(memo)에만 허용
+        nulls = [field for field in self.model_fields_set if field != "memo" and getattr(self, field) is None]
+        if nulls:
+            raise ValueError(f"null로 바꿀 수 없는 항목입니다: {', '.join(sorted(nulls))}")
+        if self.purchase_date and self.expiry_date and self.expiry_date < self.purchase_date:
+            raise ValueError("소비기한은 구매일보다 이후여야 합니다.")
+        return self
+
+
+class FoodOut(BaseModel):
+    """음식 응답"""
+    id: int
+    name: str
+    category: str
+    purchase_date: date
+    expiry_date: date
+    location: str
+    quantity: float
+    unit: Optional[str]
+    memo: Optional[str]
+    status: Status
+    days_until_expiry: int
+    updated_at: Optional[datetime]
+
+
+class FoodPage(BaseModel):
+    items: List[FoodOut]
+    total: int
+    limit: int
+    offset: int
+
+
+class HistoryOut(BaseModel):
+    """음식 기록 응답 (다 먹음/버림/만료 정리)"""
+    model_config = ConfigDict(from_attributes=True)
+
+    food_id: int
+    name: str
+    category: str
+    location: str
+    quantity: Optional[float]
+    unit: Optional[str]
+    purchase_date: date
+    expiry_date: date
+    outcome: Outcome
+    closed_at: datetime
+
+
+class HistoryPage(BaseModel):
+    items: List[HistoryOut]
+    total: int
+    limit: int
+    offset: int
+
+
+class RecipeRequest(BaseModel):
+    ingredients: Optional[List[str]] = Field(default=None, description="비우면 냉장고 재료 사용 (임박 재료 우선)")
+
+
+class ChatRequest(BaseModel):
+    question: str = Field(min_length=1, max_length=2000)
+    ingredients: Optional[List[str]] = None
+    use_inventory: bool = Field(default=True, description="ingredients가 없으면 냉장고 재료를 참고")
+
+
+def to_out(food):
+    return FoodOut(
+        id=food.id,
+        name=food.name,
+        category=food.category,
+        purchase_date=food.purchase_date,
+        expiry_date=food.expiry_date,
+        location=food.location,
+        quantity=food.quantity,
+        unit=food.unit,
+        memo=food.memo,
+        status=food.status(),
+        days_until_expiry=food.days_until_expiry(),
+        updated_at=food.updated_at,
+    )
+
+
+class AgentHolder:
+    """프로세스 전역 AI 에이전트 (첫 사용 시 생성, 모든 요청이 공유)"""
+
+    def __init__(self):
+        self._agent = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._agent is None:
+            with self._lock:
+                if self._agent is None:
+                    self._agent = self._create()
+        return self._agent
+
+    @staticmethod
+    def _create():
+        if os.getenv('FRIDGE_MOCK_LLM'):
+            from mock_agent import MockFoodRecognitionAgent
+            return MockFoodRecognitionAgent(latency=float(os.getenv('FRIDGE_MOCK_LLM_LATENCY_MS', 0)) / 1000)
+
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise HTTPException(status_code=503, detail="OPENAI_API_KEY가 설정되지 않았습니다.")
+        from ai_agent import FoodRecognitionAgent
+        return FoodRecognitionAgent(api_key=api_key)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.router = HouseholdRouter.from_env()
+    # 분류기는 기본 가구의 등록 기록으로 학습 (요청마다 가구별로 학습하지 않음)
+    default_db = await app.state.router.async_database()
+    app.state.classifier = FoodClassifier(CATEGORIES).fit(await default_db.get_all_foods())
+    app.state.agent = AgentHolder()
+    yield
+    await app.state.router.dispose_async()
+
+
+app = FastAPI(title="냉요 API", description="냉장고 음식 소비기한 관리 및 레시피 추천", lifespan=lifespan)
+
+
+bearer = HTTPBearer(auto_error=False, description="가구 접속 키 (FRIDGE_HOUSEHOLD_KEYS)")
+
+
+def get_household(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)):
+    """요청한 가구 ID (Authorization: Bearer <가구 접속 키>, 키를 설정하지 않았으면 기본 가구)"""
+    household_id = authenticate_household(credentials.credentials if credentials else None)
+    if household_id is None:
+        raise HTTPException(status_code=401, detail="가구 접속 키가 올바르지 않습니다.",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return household_id
+
+
+async def get_db(request: Request, household_id: str = Depends(get_household)):
+    """요청한 가구의 AsyncDatabase"""
+    return await request.app.state.router.async_database(household_id)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/foods", response_model=FoodPage)
+async def list_foods(db=Depends(get_db),
+                     limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+                     offset: int = Query(0, ge=0),
+                     category: Optional[Category] = None,
+                     location: Optional[Location] = None,
+                     status: Optional[Status] = None):
+    """음식 목록 (소비기한순, 페이지 단위)"""
+    foods, total = await db.get_foods_page(limit, offset, category, location, status)
+    return FoodPage(items=[to_out(food) for food in foods], total=total, limit=limit, offset=offset)
+
+
+@app.get("/foods/expiring", response_model=List[FoodOut])
+async def expiring_foods(db=Depends(get_db), days: int = Query(3, ge=0, le=365)):
+    """N일 안에 만료되는 음식"""
+    foods = await db.get_expiring_soon(days)
+    return [to_out(food) for food in foods]
+
+
+@app.get("/foods/expired", response_model=List[FoodOut])
+async def expired_foods(db=Depends(get_db)):
+    """만료된 음식 (최근 만료순)"""
+    foods = await db.get_expired_foods()
+    return [to_out(food) for food in foods]
+
+
+@app.get("/foods/{food_id}", response_model=FoodOut)
+async def get_food(food_id: int, db=Depends(get_db)):
+    food = await db.get_food_by_id(food_id)
+    if food is None:
+        raise HTTPException(status_code=404, detail="음식을 찾을 수 없습니다.")
+    return to_out(food)
+
+
+@app.post("/foods", response_model=FoodOut, status_code=201)
+async def add_food(item: FoodIn, db=Depends(get_db)):
+    food = await db.add_food(**item.model_dump())
+    return to_out(food)
+
+
+@app.post("/foods/bulk", status_code=201)
+async def add_foods(items: List[FoodIn], db=Depends(get_db)):
+    """음식 일괄 추가 (단일 트랜잭션)"""
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {MAX_BULK_ITEMS}개까지 추가할 수 있습니다.")
+    added = await db.add_foods([item.model_dump() for item in items])
+    return {"added": added}
+
+
+@app.patch("/foods/{food_id}", response_model=FoodOut)
+async def update_food(food_id: int, changes: FoodUpdate, db=Depends(get_db)):
+    values = changes.model_dump(exclude_unset=True)
+    try:
+        food = await db.update_food(food_id, **values)
+    except ValueError as e:
+        # 저장된 구매일/소비기한과 합친 값 검사 (요청에 한쪽 날짜만 있을 때)
+        raise HTTPException(status_code=422, detail=str(e))
+    if food is None:
+        raise HTTPException(status_code=404, detail="음식을 찾을 수 없습니다.")
+    return to_out(food)
+
+
+@app.delete("/foods/{food_id}", status_code=204)
+async def delete_food(food_id: int, db=Depends(get_db)):
+    if not await db.delete_food(food_id):
+        raise HTTPException(status_code=404, detail="음식을 찾을 수 없습니다.")
+
+
+async def close_food(db, food_id, outcome):
+    if not await db.close_foods([food_id], outcome):
+        raise HTTPException(status_code=404, detail="음식을 찾을 수 없습니다.")
+
+
+@app.post("/foods/{food_id}/consume", status_code=204)
+async def consume_food(food_id: int, db=Depends(get_db)):
+    """다 먹은 음식을 재고에서 빼고 기록으로 옮김"""
+    await close_food(db, food_id, "consumed")
+
+
+@app.post("/foods/{food_id}/discard", status_code=204)
+async def discard_food(food_id: int, db=Depends(get_db)):
+    """버린 음식을 재고에서 빼고 기록으로 옮김"""
+    await close_food(db, food_id, "discarded")
+
+
+@app.get("/history", response_model=HistoryPage)
+async def food_history(db=Depends(get_db),
+                       limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+                       offset: int = Query(0, ge=0),
+                       outcome: Optional[Outcome] = None):
+    items, total = await db.get_food_history(limit=limit, offset=offset, outcome=outcome)
+    return HistoryPage(items=[HistoryOut.model_validate(item) for item in items],
+                       total=total, limit=limit, offset=offset)
+
+
+@app.post("/analyze-image")
+async def analyze_image(request: Request, image: UploadFile = File(...),
+                        household_id: str = Depends(get_household)):
+    """
+    음식 사진 분석 (방향 보정/축소 후 AI 인식, 카테고리는 앱 기준으로 정규화)
+
+    추천 소비기한(suggested_expiry_date)을 함께 반환합니다.
+    """
+    image_bytes = await image.read()
+    if len(image_bytes) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="이미지가 너무 큽니다.")
+
+    from image_processing import process_upload
+
+    try:
+        processed = await run_in_threadpool(process_upload, image_bytes)
+        analysis_bytes, image_type = processed["analysis_bytes"], processed["image_type"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="이미지를 읽을 수 없습니다.")
+
+    agent = request.app.state.agent.get()
+    image_base64 = base64.b64encode(analysis_bytes).decode('utf-8')
+    try:
+        result = await run_in_threadpool(agent.analyze_food_image, image_base64, image_type)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"이미지 분석 중 오류가 발생했습니다: {e}")
+
+    result = request.app.state.classifier.normalize_result(result)
+    days = int(result.get("estimated_shelf_life_days") or 0)
+    result["suggested_expiry_date"] = (date.today() + timedelta(days=days)).isoformat()
+    return result
+
+
+async def inventory_ingredients(db):
+    """레시피/채팅 컨텍스트용 냉장고 재료 이름 (임박 재료 우선, 중복 제거)"""
+    names = []
+    for status in ("임박", "신선"):
+        foods, _ = await db.get_foods_page(limit=MAX_CONTEXT_INGREDIENTS, status=status)
+        names.extend(food.name for food in foods)
+    return list(dict.fromkeys(names))[:MAX_CONTEXT_INGREDIENTS]
+
+
+@app.post("/recipes/stream")
+async def stream_recipes(request: Request, body: RecipeRequest, db=Depends(get_db)):
+    """레시피 추천 (생성되는 대로 text/plain 스트리밍)"""
+    ingredients = body.ingredients or await inventory_ingredients(db)
+    agent = request.app.state.agent.get()
+    # 동기 제너레이터는 StreamingResponse가 스레드 풀에서 순회
+    return StreamingResponse(agent.stream_recipe_suggestions(ingredients), media_type="text/plain; charset=utf-8")
+
+
+@app.post("/chat/stream")
+async def stream_chat(request: Request, body: ChatRequest, db=Depends(get_db)):
+    """요리 질문 답변 (생성되는 대로 text/plain 스트리밍)"""
+    ingredients = body.ingredients
+    if ingredients is None and body.use_inventory:
+        ingredients = await inventory_ingredients(db)
+    agent = request.app.state.agent.get()
+    return StreamingResponse(agent.stream_cooking_answer(body.question, ingredients),
+                             media_type="text/plain; charset=utf-8")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("FRIDGE_API_HOST", "127.0.0.1"), port=int(os.getenv("FRIDGE_API_PORT", 8000)))
@@ -2,20 +2,35 @@
 냉장고 음식 소비기한 관리 앱
 """
 import streamlit as st
-from datetime import date, timedelta
-import pandas as pd
+from datetime import date, datetime, timedelta
 import base64
 import os
+import time
 from dotenv import load_dotenv
-from database import Database, FoodItem
-from ai_agent import FoodRecognitionAgent
-from calendar_integration import GoogleCalendarIntegration
-from PIL import Image
-import io
+from database import FoodItem, CATEGORIES, HISTORY_OUTCOMES, LOCATIONS, UNITS, summarize_foods
+from food_classifier import EGG_SHELF_LIFE_DAYS, FoodClassifier, detected_expiry_date, is_egg_result
+from food_cards import (
+    STATUS_COLORS, LOCATION_ICONS, CATEGORY_ICONS, CATEGORY_COLORS,
+    FOOD_LIST_PAGE_SIZE, MAX_REMAINING_TAGS, food_card_html, calendar_rows_html, ingredient_tags_html
+)
+from household_router import HouseholdRouter, authenticate_household, default_household, household_keys
+from jobs import JobWorker, maintenance_interval
+from perf_panel import perf_panel_requested, session_trace_attrs, show_perf_panel
+import tracing
+import query_profiler
+
+# 무거운 선택 모듈(openai, 구글 API 클라이언트, 이미지 처리)은 처음 사용할 때 불러옵니다.
+# - AI 에이전트: get_agent()
+# - 이미지 전처리: init_image_pipeline()
+# - 구글 캘린더: jobs.py의 백그라운드 작업 안에서만 import
 
 # 환경 변수 로드
 load_dotenv()
 
+# 가짜 AI 에이전트 사용 시 API 키 없이도 AI 기능 화면을 표시
+if os.getenv('FRIDGE_MOCK_LLM'):
+    os.environ.setdefault('OPENAI_API_KEY', 'mock')
+
 # 페이지 설정
 st.set_page_config(
     page_title="냉요",
@@ -24,118 +39,284 @@ st.set_page_config(
     initial_sidebar_state="collapsed"  # 모바일에서 사이드바 기본 접힘
 )
 
-# 데이터베이스 초기화
+# 개발자용 성능 패널 (?perf=1 또는 FRIDGE_PERF_PANEL=1, 켜면 프로세스 전체에서 트레이싱도 켜짐)
+perf_panel_enabled = perf_panel_requested()
+if perf_panel_enabled:
+    tracing.set_enabled(True)
+
+# 이번 재실행의 트레이스 (FRIDGE_TRACE 설정 시, 스크립트 끝에서 종료)
+tracing.set_attrs_provider(session_trace_attrs)
+rerun_trace = tracing.start_trace("rerun", replace=True)
+
+# 메모리에 유지할 가구별 음식 분류기 수 (넘으면 오래 안 쓴 가구부터 다시 학습)
+MAX_CACHED_CLASSIFIERS = 32
+
+
+# 가구별 데이터베이스 라우터 (FRIDGE_DB_URL 공유 또는 FRIDGE_SHARD_DIR 샤드 파일)
 @st.cache_resource
-def init_db():
-    return Database()
-
-db = init_db()
-
-# 카테고리 및 위치 옵션
-CATEGORIES = [
-    "채소", "과일", "육류/해산물", "계란/두부", "유제품", "쌀/잡곡",
-    "조미료/소스", "반찬/김치", "즉석식품/밀키트", "빵/디저트", "음료", "기타"
-]
-LOCATIONS = ["냉장", "냉동", "실온"]
-UNITS = ["개", "kg", "g", "L", "mL", "팩", "봉지"]
-
-# 상태별 색상
-STATUS_COLORS = {
-    "신선": "🟢",
-    "임박": "🟡",
-    "만료": "🔴"
-}
+def init_router():
+    return HouseholdRouter.from_env()
+
+
+def current_household():
+    """
+    현재 가구 ID (FRIDGE_HOUSEHOLD_KEYS를 설정했으면 접속 키로 로그인한 가구, 아니면 FRIDGE_HOUSEHOLD_ID)
+
+    Returns:
+        str: 가구 ID (로그인 전이면 None)
+    """
+    if not household_keys():
+        return default_household()
+    return st.session_state.get('household_id')
+
+
+def show_household_login():
+    """가구 접속 키 입력 화면 (로그인하면 세션에 가구 ID 저장)"""
+    st.title("🧚 냉요(냉장고 요정)")
+    with st.form("household_login"):
+        key = st.text_input("가구 접속 키", type="password")
+        if st.form_submit_button("들어가기", type="primary"):
+            household_id = authenticate_household(key)
+            if household_id:
+                st.session_state.household_id = household_id
+                st.rerun()
+            st.error("❌ 접속 키가 올바르지 않습니다.")
+    st.stop()
 
-# 보관 위치별 아이콘 및 색상
-LOCATION_ICONS = {
-    "냉장": "❄️",
-    "냉동": "🧊",
-    "실온": "🌡️"
-}
 
-LOCATION_COLORS = {
-    "냉장": "#E3F2FD",  # 연한 파랑
-    "냉동": "#B3E5FC",  # 진한 파랑
-    "실온": "#FFF9C4"   # 연한 노랑
-}
+# 데이터베이스 (가구별, 라우터가 엔진을 공유하므로 가구마다 캐시하지 않음)
+try:
+    household_id = current_household()
+    if household_id is None:
+        show_household_login()
+    db = init_router().database(household_id)
+except ValueError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+query_profiler.install_query_profiler(db.engine)  # FRIDGE_QUERY_PROFILE 설정 시에만 (엔진마다 한 번)
+query_profiler.begin_run("rerun", **session_trace_attrs())
 
-# 카테고리별 아이콘 및 색상
-CATEGORY_ICONS = {
-    "채소": "🥬",
-    "과일": "🍎",
-    "육류/해산물": "🥩",
-    "계란/두부": "🥚",
-    "유제품": "🥛",
-    "쌀/잡곡": "🌾",
-    "조미료/소스": "🧂",
-    "반찬/김치": "🥘",
-    "즉석식품/밀키트": "🍱",
-    "빵/디저트": "🍰",
-    "음료": "🥤",
-    "기타": "📦"
-}
 
-CATEGORY_COLORS = {
-    "채소": "#C8E6C9",      # 연한 초록
-    "과일": "#FFCCBC",      # 연한 주황
-    "육류/해산물": "#D7CCC8",  # 연한 갈색
-    "계란/두부": "#FFF9C4",    # 연한 노랑
-    "유제품": "#E1F5FE",     # 연한 하늘색
-    "쌀/잡곡": "#F0E68C",    # 카키색
-    "조미료/소스": "#F5F5F5",   # 연한 회색
-    "반찬/김치": "#FFCDD2",    # 연한 빨강
-    "즉석식품/밀키트": "#FFE0B2", # 연한 오렌지
-    "빵/디저트": "#F8BBD0",    # 연한 핑크
-    "음료": "#B3E5FC",      # 연한 파랑
-    "기타": "#E0E0E0"       # 회색
-}
+# 로컬 음식 분류기 (등록된 음식 기록으로 학습, API 호출 없음, 최근 가구 MAX_CACHED_CLASSIFIERS개만 유지)
+@st.cache_resource(max_entries=MAX_CACHED_CLASSIFIERS)
+def init_classifier(household_id, _db):
+    return FoodClassifier(CATEGORIES).fit(_db.get_all_foods())
 
+classifier = init_classifier(db.household_id, db)
 
-def fix_image_orientation(image_bytes):
-    """EXIF 정보를 읽어서 이미지 방향 수정"""
-    try:
-        image = Image.open(io.BytesIO(image_bytes))
-
-        # EXIF 데이터에서 Orientation 태그 읽기
-        exif = image.getexif()
-        if exif:
-            orientation = exif.get(0x0112)  # 0x0112는 Orientation 태그
-
-            # Orientation 값에 따라 회전
-            if orientation == 3:
-                image = image.rotate(180, expand=True)
-            elif orientation == 6:
-                image = image.rotate(270, expand=True)
-            elif orientation == 8:
-                image = image.rotate(90, expand=True)
-
-        # 수정된 이미지를 bytes로 변환
-        output = io.BytesIO()
-        image.save(output, format=image.format or 'JPEG')
-        return output.getvalue()
-    except Exception as e:
-        print(f"이미지 방향 수정 오류: {e}")
-        return image_bytes  # 오류 시 원본 반환
+
+# 백그라운드 작업 워커 (캘린더 동기화 등, 프로세스에 하나로 모든 가구의 작업 실행)
+@st.cache_resource
+def init_job_worker():
+    return JobWorker(router=init_router(), maintenance_interval=maintenance_interval()).start()
+
+job_worker = init_job_worker()
+
+
+def calendar_enabled():
+    """구글 캘린더 연동 설정 여부 (credentials.json 또는 가짜 서버 주소)"""
+    return os.path.exists('credentials.json') or bool(os.getenv('GOOGLE_CALENDAR_API_ENDPOINT'))
+
+
+def inventory_stamp():
+    """음식 목록 캐시 확인용 값 (가구가 바뀌어도 다시 불러오도록 가구 ID 포함)"""
+    return (db.household_id, *db.get_inventory_stamp())
+
+
+def get_inventory():
+    """
+    세션에 캐시된 음식 목록 (소비기한 순)
+
+    전체 조회 대신 변경 확인용 값만 조회하여, CLI나 다른 세션에서 바뀐 경우에만 다시 불러옵니다.
+    """
+    stamp = inventory_stamp()
+    if st.session_state.get('inventory_stamp') != stamp or 'inventory' not in st.session_state:
+        st.session_state.inventory = {food.id: food for food in db.get_all_foods()}
+        st.session_state.inventory_stamp = stamp
+    return sorted(st.session_state.inventory.values(), key=lambda food: food.expiry_date)
+
+
+def put_inventory_item(food):
+    """추가/수정한 음식을 캐시에 반영 (다시 조회하지 않음)"""
+    if 'inventory' in st.session_state:
+        st.session_state.inventory[food.id] = food
+        st.session_state.inventory_stamp = inventory_stamp()
+
+
+def remove_inventory_item(food_id):
+    """삭제한 음식을 캐시에서 제거"""
+    if 'inventory' in st.session_state:
+        st.session_state.inventory.pop(food_id, None)
+        st.session_state.inventory_stamp = inventory_stamp()
+
+
+def delete_food(food_id):
+    """음식 삭제 (캘린더에 동기화된 음식이면 해당 이벤트 삭제 작업 등록)"""
+    deleted = db.delete_food(food_id)
+    if deleted:
+        remove_inventory_item(food_id)
+    if deleted and calendar_enabled() and db.get_calendar_event(food_id) is not None:
+        job_worker.submit('calendar_delete_food', {'food_id': food_id}, db=db)
+    return deleted
+
+
+def close_food(food_id, outcome):
+    """다 먹은/버린 음식을 재고에서 빼고 기록으로 옮김 (캘린더 이벤트는 delete_food와 같이 정리)"""
+    closed = db.close_foods([food_id], outcome) > 0
+    if closed:
+        remove_inventory_item(food_id)
+    if closed and calendar_enabled() and db.get_calendar_event(food_id) is not None:
+        job_worker.submit('calendar_delete_food', {'food_id': food_id}, db=db)
+    return closed
+
+# 업로드 이미지 전처리 파이프라인 (프로세스 전역 스레드 풀)
+@st.cache_resource
+def init_image_pipeline():
+    from image_processing import ImagePipeline
+    return ImagePipeline()
+
+
+# AI 에이전트 (API 키별로 하나, 첫 AI 기능 사용 시 openai 로드)
+@st.cache_resource
+def get_agent(api_key):
+    if os.getenv('FRIDGE_MOCK_LLM'):
+        from mock_agent import MockFoodRecognitionAgent
+        return MockFoodRecognitionAgent(latency=float(os.getenv('FRIDGE_MOCK_LLM_LATENCY_MS', 0)) / 1000)
+
+    from ai_agent import FoodRecognitionAgent
+    return FoodRecognitionAgent(api_key=api_key)
 
 
 def main():
     st.title("🧚 냉요(냉장고 요정) - 냉장고를 부탁해!")
     st.caption("냉장고 음식 소비기한 관리 및 레시피 추천 에이전트")
+    show_household_logout()
+
+    views = {
+        "📊 대시보드": show_dashboard,
+        "➕ 음식 추가": show_add_food,
+        "📝 음식 목록": show_food_list,
+        "🤖 AI 추천": show_ai_recommendations,
+    }
+
+    # 화면 메뉴 (st.tabs는 숨겨진 탭까지 매번 모두 실행하므로 선택한 화면만 실행)
+    active_view = st.radio("화면", list(views), horizontal=True, key="active_view",
+                           label_visibility="collapsed")
+
+    started = time.perf_counter()
+    tracing.set_trace_attrs(view=active_view)
+    views[active_view]()
+    record_view_timing(active_view, (time.perf_counter() - started) * 1000)
+
+    show_view_timings()
+
+    if perf_panel_enabled:
+        show_perf_panel()
+
+
+def show_household_logout():
+    """사이드바에 로그인한 가구와 로그아웃 버튼 표시 (접속 키를 설정했을 때만)"""
+    if not household_keys():
+        return
+    st.sidebar.caption(f"🏠 가구: {db.household_id}")
+    if st.sidebar.button("🚪 로그아웃"):
+        st.session_state.clear()  # 다른 가구로 로그인해도 이전 가구의 캐시를 쓰지 않도록
+        st.rerun()
+
+
+def record_view_timing(view, elapsed_ms):
+    """화면별 마지막 렌더링 시간 기록 (ms)"""
+    if 'view_timings' not in st.session_state:
+        st.session_state.view_timings = {}
+    st.session_state.view_timings[view] = elapsed_ms
+
+
+def show_view_timings():
+    """화면별 렌더링 시간 표시 (방문한 화면만)"""
+    timings = st.session_state.get('view_timings', {})
+    if timings:
+        st.caption("⏱️ 렌더링 시간: " + " · ".join(f"{view} {ms:.0f}ms" for view, ms in timings.items()))
+
+
+CALENDAR_JOB_LABELS = {
+    'calendar_sync': "구글 캘린더 동기화",
+    'calendar_delete': "캘린더 이벤트 삭제",
+}
 
-    # 탭 메뉴
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 대시보드", "➕ 음식 추가", "📝 음식 목록", "🤖 AI 추천"])
 
-    with tab1:
-        show_dashboard()
+# 실행 중인 캘린더 작업의 진행 상황을 다시 조회하는 주기 (초)
+CALENDAR_JOB_POLL_SECONDS = 1.5
 
-    with tab2:
-        show_add_food()
 
-    with tab3:
-        show_food_list()
+@st.fragment(run_every=CALENDAR_JOB_POLL_SECONDS)
+def show_active_calendar_job(job_id):
+    """
+    실행 중인 캘린더 작업 진행 상황 (이 부분만 주기적으로 다시 실행)
 
-    with tab4:
-        show_ai_recommendations()
+    작업이 끝나면 전체 화면을 다시 실행하여 결과를 표시하고 동기화 버튼을 다시 활성화합니다.
+    """
+    job = db.get_job(job_id)
+    if job is None:
+        return
+    if not job.is_active():
+        st.rerun()
+    label = CALENDAR_JOB_LABELS.get(job.kind, job.kind)
+
+    if job.status == 'queued':
+        st.progress(0.0, text=f"⏳ {label} 대기 중...")
+    else:
+        ratio = job.progress_done / job.progress_total if job.progress_total else 0.0
+        st.progress(ratio, text=f"🔄 {label} 중... ({job.progress_done}/{job.progress_total})")
+
+    if st.button("⏹️ 취소", key="cancel_calendar_job", use_container_width=True,
+                 disabled=job.cancel_requested):
+        job_worker.cancel(job.id, db=db)
+        job = db.get_job(job.id)
+    if job.cancel_requested:
+        st.caption("현재 배치가 끝나면 중단합니다.")
+
+
+def show_calendar_job(job):
+    """캘린더 작업 진행 상황/결과 표시"""
+    if job.is_active():
+        show_active_calendar_job(job.id)
+        return
+
+    label = CALENDAR_JOB_LABELS.get(job.kind, job.kind)
+    finished_at = job.updated_at.strftime('%m/%d %H:%M') if job.updated_at else ""
+    result = job.get_result() or {}
+
+    if job.status == 'failed':
+        st.error(f"{label} 오류 ({finished_at}): {job.error}")
+        return
+
+    if job.kind == 'calendar_delete':
+        deleted_count = result.get('deleted', 0)
+        if job.status == 'cancelled':
+            st.warning(f"⏹️ {label} 취소됨 ({finished_at}, {deleted_count}개 삭제)")
+        elif deleted_count > 0:
+            st.success(f"✅ {deleted_count}개 이벤트를 삭제했습니다! ({finished_at})")
+        elif result.get('failed', 0) == 0:
+            st.info(f"삭제할 이벤트가 없습니다. ({finished_at})")
+        if result.get('failed', 0) > 0:
+            st.warning(f"⚠️ {result['failed']}개 이벤트 삭제 실패 (다시 시도해주세요)")
+            for error in result.get('errors', [])[:3]:
+                st.caption(error)
+        return
+
+    changed = result.get('created', 0) + result.get('updated', 0) + result.get('deleted', 0)
+    summary = (f"추가 {result.get('created', 0)}개, 수정 {result.get('updated', 0)}개, "
+               f"삭제 {result.get('deleted', 0)}개")
+    if job.status == 'cancelled':
+        st.warning(f"⏹️ 동기화 취소됨 ({finished_at}, {summary}) — 다시 동기화하면 남은 항목만 처리합니다")
+    elif changed > 0:
+        st.success(f"✅ 구글 캘린더 동기화 완료! ({finished_at}, {summary})")
+    elif result.get('failed', 0) == 0:
+        st.info(f"변경 사항이 없습니다. ({finished_at}, 동기화된 음식 {result.get('unchanged', 0)}개)")
+    if result.get('failed', 0) > 0:
+        st.warning(f"⚠️ {result['failed']}개 음식 동기화 실패 (다시 동기화하면 실패한 항목만 재시도합니다)")
+        for error in result.get('errors', [])[:3]:
+            st.caption(error)
 
 
 def show_dashboard():
@@ -147,9 +328,11 @@ def show_dashboard():
         st.session_state.dashboard_filter = None
 
     # 통계 (한 줄로 압축)
-    all_foods = db.get_all_foods()
-    expiring_soon = db.get_expiring_soon(days=3)
-    expired = db.get_expired_foods()
+    all_foods = get_inventory()
+    today = date.today()
+    summary = summarize_foods(all_foods, today)
+    expiring_soon = summary['expiring_soon']
+    expired = summary['expired']
 
     # 컬러를 활용한 압축 통계
     st.markdown(f"""
@@ -179,13 +362,7 @@ def show_dashboard():
         st.subheader("📅 소비기한 캘린더 (향후 1개월)")
 
         # 향후 30일간의 날짜별 만료 음식 그룹화
-        from collections import defaultdict
-        calendar_data = defaultdict(list)
-        today = date.today()
-
-        for food in all_foods:
-            if food.expiry_date >= today and food.expiry_date <= today + timedelta(days=30):
-                calendar_data[food.expiry_date].append(food)
+        calendar_data = summary['calendar']
 
         if calendar_data:
             # 날짜순으로 정렬
@@ -207,68 +384,40 @@ def show_dashboard():
                     date_color = "#E3F2FD"  # 파랑
 
                 with st.expander(f"{date_label} - {len(foods)}개", expanded=(days_left <= 14)):
-                    for food in foods:
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        with col1:
-                            category_icon = CATEGORY_ICONS.get(food.category, "📦")
-                            location_icon = LOCATION_ICONS.get(food.location, "📦")
-                            st.write(f"{category_icon} **{food.name}** {location_icon}")
-                        with col2:
-                            st.write(f"{food.quantity} {food.unit}")
-                        with col3:
-                            st.write(f"{food.category}")
+                    # 음식마다 columns + write 4개 대신 날짜별 HTML 하나 (행 단위 캐시)
+                    st.markdown(calendar_rows_html(foods), unsafe_allow_html=True)
         else:
             st.info("📌 향후 1개월 내 만료 예정인 음식이 없습니다.")
 
-        # 구글 캘린더 동기화 버튼 (credentials.json이 있을 때만 표시)
-        if os.path.exists('credentials.json'):
+        # 구글 캘린더 동기화 버튼 (credentials.json 또는 가짜 서버 주소가 있을 때만 표시)
+        if calendar_enabled():
             st.markdown("---")
             col_sync1, col_sync2, col_sync3 = st.columns([1, 1, 1])
 
+            # 진행 중이거나 가장 최근에 실행된 캘린더 작업 (새로고침해도 유지)
+            recent_jobs = db.get_recent_jobs(kinds=CALENDAR_JOB_LABELS, limit=1)
+            calendar_job = recent_jobs[0] if recent_jobs else None
+            job_running = calendar_job is not None and calendar_job.is_active()
+
             with col_sync1:
-                if st.button("📅 구글 캘린더 동기화", type="primary", use_container_width=True):
-                    with st.spinner("구글 캘린더에 동기화하는 중..."):
-                        try:
-                            calendar = GoogleCalendarIntegration()
-
-                            # 향후 30일 내 만료 예정 음식만 동기화
-                            foods_to_sync = [food for food in all_foods
-                                           if food.expiry_date >= date.today()
-                                           and food.expiry_date <= date.today() + timedelta(days=30)]
-
-                            if foods_to_sync:
-                                success_count, fail_count = calendar.sync_food_items(foods_to_sync)
-                                if success_count > 0:
-                                    st.success(f"✅ {success_count}개 음식을 구글 캘린더에 추가했습니다!")
-                                if fail_count > 0:
-                                    st.warning(f"⚠️ {fail_count}개 음식 동기화 실패")
-                            else:
-                                st.info("동기화할 음식이 없습니다.")
-                        except Exception as e:
-                            st.error(f"동기화 오류: {str(e)}")
+                if st.button("📅 구글 캘린더 동기화", type="primary", use_container_width=True,
+                             disabled=job_running):
+                    calendar_job = job_worker.submit('calendar_sync', db=db)
 
             with col_sync2:
-                if st.button("🗑️ 캘린더 이벤트 삭제", use_container_width=True):
-                    with st.spinner("구글 캘린더에서 냉요 이벤트를 삭제하는 중..."):
-                        try:
-                            calendar = GoogleCalendarIntegration()
-                            deleted_count = calendar.delete_expiry_events()
-                            if deleted_count > 0:
-                                st.success(f"✅ {deleted_count}개 이벤트를 삭제했습니다!")
-                            else:
-                                st.info("삭제할 이벤트가 없습니다.")
-                        except Exception as e:
-                            st.error(f"삭제 오류: {str(e)}")
+                if st.button("🗑️ 캘린더 이벤트 삭제", use_container_width=True, disabled=job_running):
+                    calendar_job = job_worker.submit('calendar_delete', db=db)
 
             with col_sync3:
                 st.info("💡 첫 사용 시 구글 계정 로그인이 필요합니다")
 
+            if calendar_job is not None:
+                show_calendar_job(calendar_job)
+
     # 보관 위치별 통계 (클릭 가능)
     if all_foods:
         st.subheader("📍 보관 위치별 현황 (클릭하여 상세보기)")
-        location_data = {}
-        for food in all_foods:
-            location_data[food.location] = location_data.get(food.location, 0) + 1
+        location_data = summary['by_location']
 
         col_loc1, col_loc2, col_loc3, col_loc4 = st.columns(4)
 
@@ -335,16 +484,14 @@ def show_dashboard():
             with col1:
                 st.error(f"{STATUS_COLORS[food.status()]} {location_icon} **{food.name}** ({food.location}) - {days}일 전 만료")
             with col2:
-                if st.button("삭제", key=f"del_{food.id}"):
-                    db.delete_food(food.id)
+                if st.button("🗑️ 버림", key=f"del_{food.id}", help="버린 음식으로 기록"):
+                    close_food(food.id, 'discarded')
                     st.rerun()
 
     # 카테고리별 분포
     if all_foods:
         st.subheader("📈 카테고리별 분포")
-        category_data = {}
-        for food in all_foods:
-            category_data[food.category] = category_data.get(food.category, 0) + 1
+        category_data = summary['by_category']
 
         # 카테고리별 카드 형식으로 표시
         cols = st.columns(4)
@@ -360,8 +507,44 @@ def show_dashboard():
                     </div>
                 """, unsafe_allow_html=True)
 
-        df = pd.DataFrame(list(category_data.items()), columns=['카테고리', '개수'])
-        st.bar_chart(df.set_index('카테고리'))
+        st.bar_chart({'개수': category_data})
+
+    show_history_summary()
+
+
+def show_history_summary(days=30):
+    """최근 다 먹음/버림/만료 정리 기록 (기록이 있을 때만)"""
+    counts = db.get_history_summary(since=datetime.now() - timedelta(days=days))
+    if not counts:
+        return
+
+    st.subheader(f"🧾 최근 {days}일 기록")
+    cols = st.columns(len(HISTORY_OUTCOMES))
+    for col, (outcome, label) in zip(cols, HISTORY_OUTCOMES.items()):
+        col.metric(label, f"{counts.get(outcome, 0)}개")
+
+    with st.expander("최근 기록 보기"):
+        history, total = db.get_food_history(limit=20)
+        st.dataframe([{
+            '음식': item.name,
+            '카테고리': item.category,
+            '기록': HISTORY_OUTCOMES.get(item.outcome, item.outcome),
+            '소비기한': item.expiry_date,
+            '기록 시각': item.closed_at.strftime('%Y-%m-%d %H:%M'),
+        } for item in history], use_container_width=True, hide_index=True)
+        if total > len(history):
+            st.caption(f"전체 {total}개 중 최근 {len(history)}개")
+
+
+def guess_search_category(form_key):
+    """소비기한 추천 이름 입력 콜백 (사용자가 카테고리를 직접 고르기 전까지 이름으로 추측한 카테고리 선택)"""
+    state = st.session_state
+    if state.get(f"search_category_picked_{form_key}"):
+        return
+    name = state[f"search_name_{form_key}"]
+    state[f"search_category_{form_key}"] = (
+        classifier.predict_category(name, min_confidence=30) if name else CATEGORIES[0]
+    )
 
 
 def show_add_food():
@@ -405,18 +588,25 @@ def show_add_food():
         st.session_state.ai_result = None
 
     if uploaded_files:
-        # 업로드된 이미지 미리보기
+        # 업로드된 이미지 병렬 전처리 (끝나는 대로 순서대로 썸네일 표시)
         cols = st.columns(min(len(uploaded_files), 4))
+        pipeline = init_image_pipeline()
         fixed_images = []
+        timings = {}
 
-        for idx, uploaded_file in enumerate(uploaded_files):
-            # 이미지 방향 수정
-            image_bytes = uploaded_file.read()
-            fixed_image_bytes = fix_image_orientation(image_bytes)
-            fixed_images.append((fixed_image_bytes, uploaded_file))
+        processed_images = pipeline.process([f.getvalue() for f in uploaded_files])
+        for idx, (uploaded_file, processed) in enumerate(zip(uploaded_files, processed_images)):
+            # 분석용 축소 이미지는 AI 분석에만 사용
+            image_type = processed['image_type'] or f"image/{uploaded_file.type.split('/')[-1]}"
+            fixed_images.append((processed['analysis_bytes'], image_type))
+            timings = processed['batch_timings']
 
             with cols[idx % 4]:
-                st.image(fixed_image_bytes, caption=f"사진 {idx+1}", use_column_width=True)
+                st.image(processed['thumbnail'], caption=f"사진 {idx+1}", use_column_width=True)
+
+        st.caption(f"⏱️ 사진 {len(uploaded_files)}장 처리 {timings.get('wall', 0):.0f}ms "
+                   f"(디코딩 {timings.get('decode', 0):.0f} · 회전 {timings.get('orient', 0):.0f} · "
+                   f"리사이즈 {timings.get('resize', 0):.0f} · 인코딩 {timings.get('encode', 0):.0f}ms)")
 
         if st.button("🤖 AI로 분석하기", type="primary"):
             with st.spinner("AI가 이미지를 분석하고 있습니다..."):
@@ -426,12 +616,11 @@ def show_add_food():
                     if not api_key:
                         st.error("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
                     else:
-                        agent = FoodRecognitionAgent(api_key=api_key)
+                        agent = get_agent(api_key)
 
                         # 첫 번째 이미지로 기본 분석
-                        first_image_bytes, first_file = fixed_images[0]
+                        first_image_bytes, image_type = fixed_images[0]
                         image_base64 = base64.b64encode(first_image_bytes).decode('utf-8')
-                        image_type = f"image/{first_file.type.split('/')[-1]}"
 
                         # AI 분석
                         result = agent.analyze_food_image(image_base64, image_type)
@@ -439,10 +628,9 @@ def show_add_food():
                         # 여러 이미지가 있으면 추가 분석 (날짜 정보 등)
                         if len(fixed_images) > 1:
                             st.info(f"📸 {len(fixed_images)}장의 사진을 분석했습니다.")
-                            for idx, (img_bytes, img_file) in enumerate(fixed_images[1:], start=2):
+                            for idx, (img_bytes, img_type) in enumerate(fixed_images[1:], start=2):
                                 try:
                                     img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-                                    img_type = f"image/{img_file.type.split('/')[-1]}"
                                     extra_result = agent.analyze_food_image(img_base64, img_type)
 
                                     # 추가 이미지에서 날짜 정보가 있으면 업데이트
@@ -453,6 +641,9 @@ def show_add_food():
                                 except:
                                     continue
 
+                        # 모델 카테고리를 앱 카테고리로 정규화
+                        result = classifier.normalize_result(result)
+
                         # 결과 저장
                         st.session_state.ai_result = result
 
@@ -477,9 +668,16 @@ def show_add_food():
     with st.expander("🔍 소비기한 모를 때? AI가 자동으로 추천해드립니다!", expanded=False):
         col_a, col_b, col_c = st.columns(3)
         with col_a:
-            search_name = st.text_input("음식 이름", placeholder="예: 토마토, 두부", key=f"search_name_{st.session_state.form_key}")
+            search_name = st.text_input("음식 이름", placeholder="예: 토마토, 두부", key=f"search_name_{st.session_state.form_key}",
+                                        on_change=guess_search_category, args=(st.session_state.form_key,))
         with col_b:
-            search_category = st.selectbox("카테고리", CATEGORIES, key=f"search_category_{st.session_state.form_key}")
+            # 입력한 이름으로 카테고리 자동 선택 (guess_search_category, 직접 고른 뒤에는 유지)
+            search_category = st.selectbox(
+                "카테고리", CATEGORIES,
+                key=f"search_category_{st.session_state.form_key}",
+                on_change=st.session_state.__setitem__,
+                args=(f"search_category_picked_{st.session_state.form_key}", True)
+            )
         with col_c:
             search_location = st.selectbox("보관 위치", LOCATIONS, key=f"search_location_{st.session_state.form_key}")
 
@@ -493,7 +691,7 @@ def show_add_food():
                         if not api_key:
                             st.error("⚠️ OPENAI_API_KEY가 설정되지 않았습니다.")
                         else:
-                            agent = FoodRecognitionAgent(api_key=api_key)
+                            agent = get_agent(api_key)
                             result = agent.estimate_shelf_life(search_name, search_category, search_location)
 
                             # 결과 저장 (음식 정보도 함께 저장)
@@ -567,6 +765,32 @@ def show_add_food():
         help="구매일을 먼저 선택하면 소비기한이 자동으로 계산됩니다"
     )
 
+    # 음식 이름도 폼 밖에서 입력 (카테고리 자동 분류를 위해)
+    name = st.text_input(
+        "음식 이름 *",
+        value=default_name,
+        placeholder="예: 우유, 사과, 닭고기",
+        key=f"food_name_{st.session_state.form_key}_{default_name}"
+    )
+
+    # 직접 입력한 이름은 로컬 분류기로 카테고리 자동 선택 (API 호출 없음)
+    if name and name != default_name:
+        predicted = classifier.classify(name)
+        if predicted['confidence'] >= 30:
+            default_category_idx = CATEGORIES.index(predicted['category'])
+            st.caption(f"🏷️ 자동 분류: {CATEGORY_ICONS.get(predicted['category'], '📦')} {predicted['category']}")
+
+    # 카테고리도 폼 밖에서 선택 (폼 안 위젯은 on_change를 쓸 수 없음)
+    # 사용자가 직접 고르기 전까지만 자동 분류 결과로 채우고, 고른 뒤에는 이름이 바뀌어도 유지
+    category_key = f"food_category_{st.session_state.form_key}"
+    if not st.session_state.get(f"food_category_picked_{st.session_state.form_key}"):
+        st.session_state[category_key] = CATEGORIES[default_category_idx]
+    category = st.selectbox(
+        "카테고리 *", CATEGORIES, key=category_key,
+        on_change=st.session_state.__setitem__,
+        args=(f"food_category_picked_{st.session_state.form_key}", True)
+    )
+
     # AI 추정 또는 이미지 분석 결과가 있을 때 실시간 계산 표시
     if (st.session_state.estimated_shelf_life or (ai_result and ai_result['confidence'] > 50)) and not detected_date:
         # OCR 날짜가 없는 경우에만 계산 표시
@@ -577,8 +801,6 @@ def show_add_food():
         col1, col2 = st.columns(2)
 
         with col1:
-            name = st.text_input("음식 이름 *", value=default_name, placeholder="예: 우유, 사과, 닭고기")
-            category = st.selectbox("카테고리 *", CATEGORIES, index=default_category_idx)
             location = st.selectbox("보관 위치 *", LOCATIONS, index=default_location_idx)
 
         with col2:
@@ -598,24 +820,20 @@ def show_add_food():
                 expiry_days = default_expiry_days
                 has_ai_recommendation = False
 
-            # OCR로 읽은 날짜가 있으면 그대로 사용 (고정된 날짜)
-            if detected_date:
-                from datetime import datetime
-                # detected_date가 문자열이면 파싱
-                if isinstance(detected_date, str):
-                    try:
-                        parsed_date = datetime.strptime(detected_date, "%Y-%m-%d").date()
-                        default_expiry_value = parsed_date
-                        expiry_help = "📸 OCR로 읽은 실제 소비기한"
-                    except:
-                        default_expiry_value = purchase_date + timedelta(days=expiry_days)
-                        if has_ai_recommendation:
-                            expiry_help = f"🤖 AI 추천: 구매일로부터 {expiry_days}일 후"
-                        else:
-                            expiry_help = "소비기한을 입력하세요 (위에서 AI 추천 또는 사진 분석 가능)"
+            # OCR로 읽은 날짜가 있으면 그대로 사용 (고정된 날짜, 계란은 산란일자 + 보관 일수)
+            detected_expiry = detected_expiry_date(ai_result) if detected_date else None
+            if detected_expiry:
+                default_expiry_value = detected_expiry
+                if is_egg_result(ai_result):
+                    expiry_help = f"📸 OCR로 읽은 산란일자 + {EGG_SHELF_LIFE_DAYS}일"
                 else:
-                    default_expiry_value = detected_date
                     expiry_help = "📸 OCR로 읽은 실제 소비기한"
+            elif detected_date:
+                default_expiry_value = purchase_date + timedelta(days=expiry_days)
+                if has_ai_recommendation:
+                    expiry_help = f"🤖 AI 추천: 구매일로부터 {expiry_days}일 후"
+                else:
+                    expiry_help = "소비기한을 입력하세요 (위에서 AI 추천 또는 사진 분석 가능)"
             else:
                 # OCR 날짜가 없으면 구매일 기준으로 계산
                 default_expiry_value = purchase_date + timedelta(days=expiry_days)
@@ -646,7 +864,7 @@ def show_add_food():
             elif expiry_date < purchase_date:
                 st.error("소비기한은 구매일보다 이후여야 합니다.")
             else:
-                db.add_food(
+                food = db.add_food(
                     name=name,
                     category=category,
                     purchase_date=purchase_date,
@@ -656,6 +874,9 @@ def show_add_food():
                     unit=unit,
                     memo=memo
                 )
+                put_inventory_item(food)
+                classifier.learn(name, category)
+
                 # AI 결과 및 추정 소비기한 초기화 (페이지 전체 리셋)
                 st.session_state.ai_result = None
                 st.session_state.estimated_shelf_life = None
@@ -683,9 +904,9 @@ def show_food_list():
     """음식 목록 화면"""
     st.header("📝 음식 목록")
 
-    # 편집 중인 음식 ID 세션 스테이트
-    if 'editing_food_id' not in st.session_state:
-        st.session_state.editing_food_id = None
+    # 편집 중인 음식 ID 세션 스테이트 (카드마다 따로 다시 실행되므로 여러 개 가능)
+    if 'editing_food_ids' not in st.session_state:
+        st.session_state.editing_food_ids = set()
 
     # 필터
     col1, col2, col3 = st.columns(3)
@@ -696,8 +917,8 @@ def show_food_list():
     with col3:
         filter_status = st.selectbox("상태 필터", ["전체", "신선", "임박", "만료"])
 
-    # 음식 목록 조회
-    foods = db.get_all_foods()
+    # 음식 목록 조회 (세션 캐시)
+    foods = get_inventory()
 
     # 필터 적용
     if filter_category != "전체":
@@ -716,143 +937,146 @@ def show_food_list():
     # 📌 재료 요약 섹션
     st.markdown("### 🛒 냉장고 재료")
 
-    # 음식 이름과 카테고리 아이콘 추출
-    ingredients_data = [(food.name, CATEGORY_ICONS.get(food.category, "📦"), food.category) for food in foods]
-
-    # 상위 10개
-    visible_ingredients = ingredients_data[:10]
-    remaining_ingredients = ingredients_data[10:]
-
-    # 컬러풀한 태그로 표시
-    tags_html = ""
-    for name, icon, category in visible_ingredients:
-        tags_html += f"<span style='display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 8px 15px; margin: 5px; border-radius: 20px; font-size: 14px; font-weight: 500; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>{icon} {name}</span>"
-
+    # 컬러풀한 태그로 표시 (상위 10개)
+    tags_html = ingredient_tags_html(foods, limit=10)
     st.markdown(f"<div style='margin-bottom: 15px;'>{tags_html}</div>", unsafe_allow_html=True)
 
-    # 나머지 재료 (접기/펼치기)
-    if remaining_ingredients:
-        with st.expander(f"➕ 나머지 {len(remaining_ingredients)}개 재료 보기"):
-            remaining_tags_html = ""
-            for name, icon, category in remaining_ingredients:
-                remaining_tags_html += f"<span style='display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 8px 15px; margin: 5px; border-radius: 20px; font-size: 14px; font-weight: 500; box-shadow: 0 2px 4px rgba(0,0,0,0.1);'>{icon} {name}</span>"
+    # 나머지 재료 (접기/펼치기, 최대 MAX_REMAINING_TAGS개)
+    remaining_foods = foods[10:]
+    if remaining_foods:
+        with st.expander(f"➕ 나머지 {len(remaining_foods)}개 재료 보기"):
+            remaining_tags_html = ingredient_tags_html(remaining_foods, limit=MAX_REMAINING_TAGS)
             st.markdown(f"<div>{remaining_tags_html}</div>", unsafe_allow_html=True)
+            if len(remaining_foods) > MAX_REMAINING_TAGS:
+                st.caption(f"외 {len(remaining_foods) - MAX_REMAINING_TAGS}개 (아래 목록에서 확인하세요)")
 
     st.markdown("---")
 
-    # 컴팩트한 카드형 레이아웃
-    for food in foods:
-        location_icon = LOCATION_ICONS.get(food.location, "📦")
-        location_color = LOCATION_COLORS.get(food.location, "#FFFFFF")
-
-        days = food.days_until_expiry()
-        if days >= 0:
-            days_text = f"D-{days}"
-        else:
-            days_text = f"D+{abs(days)}"
-
-        # 상태별 카드 배경색 및 D-day 색상
-        status = food.status()
-        if status == "만료":
-            card_bg_color = "#FFEBEE"  # 연한 빨강
-            dday_color = "#9E9E9E"  # 회색
-        elif status == "임박":
-            card_bg_color = "#FFF9C4"  # 연한 노랑
-            if days <= 2:
-                dday_color = "#F44336"  # 빨강
-            else:
-                dday_color = "#FF9800"  # 주황
-        else:  # 신선
-            card_bg_color = "#E8F5E9"  # 연한 초록
-            dday_color = "#4CAF50"  # 초록
-
-        # HTML 카드 생성
-        st.markdown(f"""
-        <div style='background-color: {card_bg_color}; padding: 15px; border-radius: 10px; margin-bottom: 10px; border: 1px solid #ddd;'>
-            <div style='margin-bottom: 8px;'>
-                <span style='font-size: 18px; font-weight: bold; color: #333;'>{STATUS_COLORS[food.status()]} {location_icon} {food.name}</span>
-                <span style='font-size: 22px; font-weight: bold; color: {dday_color}; margin-left: 15px;'>{days_text}</span>
-            </div>
-            <div style='color: #555; font-size: 13px; margin-bottom: 5px;'>
-                {food.category} | {food.location} | {food.quantity} {food.unit}
-            </div>
-            <div style='color: #555; font-size: 13px;'>
-                소비기한: {food.expiry_date.strftime('%m/%d')}
-            </div>
-            {"<div style='color: #555; font-size: 13px; margin-top: 5px;'>📝 " + food.memo + "</div>" if food.memo else ""}
-        </div>
-        """, unsafe_allow_html=True)
-
-        # 버튼들은 카드 밖에 배치
-        btn_col1, btn_col2, btn_col3 = st.columns([1, 1, 8])
-        with btn_col1:
-            if st.button("✏️", key=f"edit_{food.id}", help="수정"):
-                st.session_state.editing_food_id = food.id
-                st.rerun()
-        with btn_col2:
-            if st.button("❌", key=f"delete_{food.id}", help="삭제"):
-                db.delete_food(food.id)
-                st.session_state.editing_food_id = None
-                st.rerun()
+    # 페이지 단위로 카드 표시 (보이는 카드만 렌더링)
+    page_count = (len(foods) + FOOD_LIST_PAGE_SIZE - 1) // FOOD_LIST_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.selectbox("페이지", range(1, page_count + 1), format_func=lambda p: f"{p} / {page_count} 페이지")
+    page_foods = foods[(page - 1) * FOOD_LIST_PAGE_SIZE:page * FOOD_LIST_PAGE_SIZE]
+
+    # 컴팩트한 카드형 레이아웃 (카드마다 fragment로 분리)
+    today = date.today()
+    for food in page_foods:
+        show_food_card(food.id, today)
+
+
+def save_food_edit(food_id):
+    """편집 폼 저장 콜백 (DB 수정 후 세션 캐시의 음식만 교체)"""
+    state = st.session_state
+    name = state[f"edit_name_{food_id}"]
+    purchase_date = state[f"edit_purchase_date_{food_id}"]
+    expiry_date = state[f"edit_expiry_date_{food_id}"]
+    errors = state.setdefault('edit_errors', {})
+
+    if not name:
+        errors[food_id] = "음식 이름을 입력해주세요."
+        return
+    if expiry_date < purchase_date:
+        errors[food_id] = "소비기한은 구매일보다 이후여야 합니다."
+        return
 
-        # 편집 폼 표시
-        if st.session_state.editing_food_id == food.id:
-            with st.expander("✏️ 수정하기", expanded=True):
-                with st.form(key=f"edit_form_{food.id}"):
-                    edit_col1, edit_col2 = st.columns(2)
-
-                    with edit_col1:
-                        edit_name = st.text_input("음식 이름", value=food.name)
-                        edit_category = st.selectbox("카테고리", CATEGORIES, index=CATEGORIES.index(food.category))
-                        edit_location = st.selectbox("보관 위치", LOCATIONS, index=LOCATIONS.index(food.location))
-
-                    with edit_col2:
-                        edit_purchase_date = st.date_input("구매일", value=food.purchase_date)
-                        edit_expiry_date = st.date_input("소비기한", value=food.expiry_date)
-
-                        edit_col2_1, edit_col2_2 = st.columns(2)
-                        with edit_col2_1:
-                            edit_quantity = st.number_input("수량", min_value=1, value=int(food.quantity) if food.quantity >= 1 else 1, step=1)
-                        with edit_col2_2:
-                            edit_unit = st.selectbox("단위", UNITS, index=UNITS.index(food.unit) if food.unit in UNITS else 0)
-
-                    edit_memo = st.text_area("메모", value=food.memo if food.memo else "")
-
-                    col_save, col_cancel = st.columns(2)
-                    with col_save:
-                        if st.form_submit_button("💾 저장", use_container_width=True):
-                            if not edit_name:
-                                st.error("음식 이름을 입력해주세요.")
-                            elif edit_expiry_date < edit_purchase_date:
-                                st.error("소비기한은 구매일보다 이후여야 합니다.")
-                            else:
-                                db.update_food(
-                                    food.id,
-                                    name=edit_name,
-                                    category=edit_category,
-                                    purchase_date=edit_purchase_date,
-                                    expiry_date=edit_expiry_date,
-                                    location=edit_location,
-                                    quantity=edit_quantity,
-                                    unit=edit_unit,
-                                    memo=edit_memo if edit_memo else None
-                                )
-                                st.success(f"✅ '{edit_name}'이(가) 수정되었습니다!")
-                                st.session_state.editing_food_id = None
-                                st.rerun()
-                    with col_cancel:
-                        if st.form_submit_button("❌ 취소", use_container_width=True):
-                            st.session_state.editing_food_id = None
-                            st.rerun()
+    memo = state[f"edit_memo_{food_id}"]
+    food = db.update_food(
+        food_id,
+        name=name,
+        category=state[f"edit_category_{food_id}"],
+        purchase_date=purchase_date,
+        expiry_date=expiry_date,
+        location=state[f"edit_location_{food_id}"],
+        quantity=state[f"edit_quantity_{food_id}"],
+        unit=state[f"edit_unit_{food_id}"],
+        memo=memo if memo else None
+    )
+    stop_editing_food(food_id)
+    if food is not None:
+        put_inventory_item(food)
+        st.toast(f"✅ '{name}'이(가) 수정되었습니다!")
+
+
+def stop_editing_food(food_id):
+    """편집 폼 닫기"""
+    st.session_state.editing_food_ids.discard(food_id)
+    st.session_state.get('edit_errors', {}).pop(food_id, None)
+
+
+@st.fragment
+@tracing.entry_point("fragment:food_card")
+def show_food_card(food_id, today):
+    """음식 카드 하나 (수정/삭제 시 이 카드만 다시 실행)"""
+    food = st.session_state.inventory.get(food_id)
+    if food is None:
+        return  # 삭제된 음식
+
+    # 카드 HTML (변경되지 않은 음식은 캐시된 마크업 재사용)
+    st.markdown(food_card_html(food, today), unsafe_allow_html=True)
+
+    # 버튼들은 카드 밖에 배치 (콜백에서 처리하므로 이 카드만 다시 실행)
+    btn_col1, btn_col2, btn_col3, btn_col4, btn_col5 = st.columns([1, 1, 1, 1, 6])
+    with btn_col1:
+        st.button("✏️", key=f"edit_{food.id}", help="수정",
+                  on_click=st.session_state.editing_food_ids.add, args=(food.id,))
+    with btn_col2:
+        st.button("🍽️", key=f"consume_{food.id}", help="다 먹음 (기록으로 이동)",
+                  on_click=close_food, args=(food.id, 'consumed'))
+    with btn_col3:
+        st.button("🗑️", key=f"discard_{food.id}", help="버림 (기록으로 이동)",
+                  on_click=close_food, args=(food.id, 'discarded'))
+    with btn_col4:
+        st.button("❌", key=f"delete_{food.id}", help="삭제 (잘못 등록한 음식, 기록 남지 않음)",
+                  on_click=delete_food, args=(food.id,))
+
+    # 편집 폼 표시
+    if food.id in st.session_state.editing_food_ids:
+        with st.expander("✏️ 수정하기", expanded=True):
+            with st.form(key=f"edit_form_{food.id}"):
+                edit_col1, edit_col2 = st.columns(2)
+
+                with edit_col1:
+                    st.text_input("음식 이름", value=food.name, key=f"edit_name_{food.id}")
+                    st.selectbox("카테고리", CATEGORIES, index=CATEGORIES.index(food.category),
+                                 key=f"edit_category_{food.id}")
+                    st.selectbox("보관 위치", LOCATIONS, index=LOCATIONS.index(food.location),
+                                 key=f"edit_location_{food.id}")
+
+                with edit_col2:
+                    st.date_input("구매일", value=food.purchase_date, key=f"edit_purchase_date_{food.id}")
+                    st.date_input("소비기한", value=food.expiry_date, key=f"edit_expiry_date_{food.id}")
+
+                    edit_col2_1, edit_col2_2 = st.columns(2)
+                    with edit_col2_1:
+                        st.number_input("수량", min_value=1, value=int(food.quantity) if food.quantity >= 1 else 1, step=1,
+                                        key=f"edit_quantity_{food.id}")
+                    with edit_col2_2:
+                        st.selectbox("단위", UNITS, index=UNITS.index(food.unit) if food.unit in UNITS else 0,
+                                     key=f"edit_unit_{food.id}")
+
+                st.text_area("메모", value=food.memo if food.memo else "", key=f"edit_memo_{food.id}")
+
+                edit_error = st.session_state.get('edit_errors', {}).get(food.id)
+                if edit_error:
+                    st.error(edit_error)
+
+                col_save, col_cancel = st.columns(2)
+                with col_save:
+                    st.form_submit_button("💾 저장", use_container_width=True,
+                                          on_click=save_food_edit, args=(food.id,))
+                with col_cancel:
+                    st.form_submit_button("❌ 취소", use_container_width=True,
+                                          on_click=stop_editing_food, args=(food.id,))
 
-        st.divider()
+    st.divider()
 
 
 def show_ai_recommendations():
     """AI 레시피 추천 화면"""
     st.header("🤖 AI 레시피 추천")
 
-    foods = db.get_all_foods()
+    foods = get_inventory()
 
     if not foods:
         st.info("냉장고에 음식이 없습니다. 음식을 추가해주세요!")
@@ -874,6 +1098,31 @@ def show_ai_recommendations():
         st.warning("신선한 재료가 없습니다.")
         return
 
+    # 신선한 재료 리스트
+    fresh_foods = [f for f in foods if f.status() != "만료"]
+
+    show_ingredient_picker(fresh_foods, ingredients, expiring_ingredients)
+
+    if not os.getenv('OPENAI_API_KEY'):
+        return
+
+    st.divider()
+    show_cooking_chat(ingredients)
+
+
+def toggle_ingredient(name):
+    """재료 선택/해제"""
+    selected = st.session_state.selected_ingredients
+    if name in selected:
+        selected.remove(name)
+    else:
+        selected.add(name)
+
+
+@st.fragment
+@tracing.entry_point("fragment:ingredient_picker")
+def show_ingredient_picker(fresh_foods, ingredients, expiring_ingredients):
+    """재료 선택 + 레시피 추천 (재료 클릭 시 이 영역만 다시 실행)"""
     # 선택된 재료 세션 스테이트 초기화
     if 'selected_ingredients' not in st.session_state:
         st.session_state.selected_ingredients = set()
@@ -881,9 +1130,6 @@ def show_ai_recommendations():
     # 재료 선택 UI
     st.write("**재료를 선택하세요** (클릭하여 선택/해제)")
 
-    # 신선한 재료 리스트
-    fresh_foods = [f for f in foods if f.status() != "만료"]
-
     # 재료를 버튼으로 표시 (5개씩 행으로)
     for i in range(0, len(fresh_foods), 5):
         cols = st.columns(5)
@@ -902,13 +1148,9 @@ def show_ai_recommendations():
                 # 선택 여부에 따라 버튼 타입 변경
                 button_type = "primary" if is_selected else "secondary"
 
-                if st.button(label, key=f"ingredient_btn_{food.id}", type=button_type, use_container_width=True):
-                    # 토글
-                    if is_selected:
-                        st.session_state.selected_ingredients.remove(food.name)
-                    else:
-                        st.session_state.selected_ingredients.add(food.name)
-                    st.rerun()
+                # 클릭 시 콜백에서 토글 (재료 선택 영역만 다시 실행되며 바로 반영)
+                st.button(label, key=f"ingredient_btn_{food.id}", type=button_type, use_container_width=True,
+                          on_click=toggle_ingredient, args=(food.name,))
 
     # 선택된 재료 표시
     if st.session_state.selected_ingredients:
@@ -941,11 +1183,10 @@ def show_ai_recommendations():
             if st.button(f"🍳 선택한 재료로 레시피 추천 ({len(st.session_state.selected_ingredients)}개)", type="primary", use_container_width=True):
                 with st.spinner("AI가 맞춤 레시피를 추천하고 있습니다..."):
                     try:
-                        agent = FoodRecognitionAgent(api_key=api_key)
+                        agent = get_agent(api_key)
                         selected_list = list(st.session_state.selected_ingredients)
                         recipes = agent.get_recipe_suggestions(selected_list)
                         st.session_state.generated_recipes = recipes
-                        st.rerun()
                     except Exception as e:
                         st.error(f"❌ 레시피 추천 중 오류가 발생했습니다: {str(e)}")
                         st.info("💡 API 키가 올바른지 확인해주세요.")
@@ -957,19 +1198,17 @@ def show_ai_recommendations():
         if st.button(f"🍳 전체 재료로 레시피 추천 ({len(ingredients)}개)", use_container_width=True):
             with st.spinner("AI가 레시피를 추천하고 있습니다..."):
                 try:
-                    agent = FoodRecognitionAgent(api_key=api_key)
+                    agent = get_agent(api_key)
                     recipes = agent.get_recipe_suggestions(ingredients)
                     st.session_state.generated_recipes = recipes
-                    st.rerun()
                 except Exception as e:
                     st.error(f"❌ 레시피 추천 중 오류가 발생했습니다: {str(e)}")
                     st.info("💡 API 키가 올바른지 확인해주세요.")
 
     with col_btn3:
         if st.session_state.generated_recipes:
-            if st.button("🗑️ 지우기", use_container_width=True):
-                st.session_state.generated_recipes = None
-                st.rerun()
+            st.button("🗑️ 지우기", use_container_width=True,
+                      on_click=lambda: st.session_state.update(generated_recipes=None))
 
     # 생성된 레시피가 있으면 표시
     if st.session_state.generated_recipes:
@@ -1001,12 +1240,18 @@ def show_ai_recommendations():
                     use_container_width=True
                 )
 
-    st.divider()
 
+
+@st.fragment
+@tracing.entry_point("fragment:cooking_chat")
+def show_cooking_chat(ingredients):
+    """AI 요리 질문 채팅 (질문 시 채팅 영역만 다시 실행)"""
     # 대화형 AI 질문 섹션
     st.subheader("💬 AI에게 요리 질문하기")
     st.caption("아니면 직접 AI에게 요리 관련 질문을 해보세요!")
 
+    api_key = os.getenv('OPENAI_API_KEY')
+
     # 채팅 히스토리 초기화
     if 'chat_messages' not in st.session_state:
         st.session_state.chat_messages = []
@@ -1027,7 +1272,7 @@ def show_ai_recommendations():
         with st.chat_message("assistant"):
             with st.spinner("AI가 답변을 생성하고 있습니다..."):
                 try:
-                    agent = FoodRecognitionAgent(api_key=api_key)
+                    agent = get_agent(api_key)
                     response = agent.ask_cooking_question(user_question, ingredients)
                     st.markdown(response)
                     st.session_state.chat_messages.append({"role": "assistant", "content": response})
@@ -1041,9 +1286,8 @@ def show_ai_recommendations():
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            if st.button("🗑️ 대화 내역 지우기", key="clear_chat", use_container_width=True):
-                st.session_state.chat_messages = []
-                st.rerun()
+            st.button("🗑️ 대화 내역 지우기", key="clear_chat", use_container_width=True,
+                      on_click=lambda: st.session_state.update(chat_messages=[]))
 
         with col2:
             # 전체 대화 내용 포맷팅
@@ -1070,4 +1314,8 @@ def show_ai_recommendations():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        query_profiler.end_run()
+        tracing.finish_trace(rerun_trace)
@@ -0,0 +1,244 @@
+"""
+비동기 데이터베이스 접근 (SQLAlchemy AsyncEngine)
+
+Database와 같은 테이블/모델(FoodItem)을 사용하며 이벤트 루프를 막지 않습니다.
+API 서버처럼 요청을 동시에 처리하거나 AI 호출과 DB 조회를 겹쳐 실행할 때 사용합니다.
+
+    db = AsyncDatabase('sqlite:///fridge.db')   # sqlite는 aiosqlite, postgresql은 asyncpg 드라이버로 자동 변경
+    await db.create_tables()
+    foods = await db.get_expiring_soon()
+    await db.dispose()
+
+의존성: aiosqlite, asyncpg (requirements-api.txt)
+"""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database import (ARCHIVE_BATCH_SIZE, DEFAULT_HOUSEHOLD, CalendarEvent, FoodHistory, FoodItem,
+                      apply_food_changes, close_food_statements, ensure_schema, food_filters,
+                      validate_household_id)
+
+# 백엔드 → 비동기 드라이버
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+# 비동기 드라이버로 바꿀 동기 드라이버 (기본 드라이버 포함)
+SYNC_DRIVERS = ("pysqlite", "psycopg2")
+
+
+def async_url(db_url):
+    """동기 DB URL을 비동기 드라이버 URL로 변환 (이미 비동기 드라이버면 그대로)"""
+    url = make_url(db_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS and url.get_driver_name() in SYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url
+
+
+class AsyncDatabase:
+    """비동기 데이터베이스 관리 클래스 (Database와 같은 메서드, 모두 코루틴, 한 가구로 한정)"""
+
+    def __init__(self, db_url=None, household_id=DEFAULT_HOUSEHOLD, engine=None):
+        """
+        Args:
+            db_url: 데이터베이스 URL (None이면 db_config.database_url(), engine을 주면 무시)
+            household_id: 가구 ID
+            engine: 공유할 AsyncEngine
+        """
+        from db_config import create_async_db_engine
+
+        self.household_id = validate_household_id(household_id)
+        self.engine = engine if engine is not None else create_async_db_engine(db_url)
+        # Database와 같이 커밋 후에도 반환한 객체의 속성을 읽을 수 있도록 만료하지 않음
+        self.Session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def for_household(self, household_id):
+        """같은 엔진(연결 풀)을 쓰는 다른 가구의 AsyncDatabase"""
+        return AsyncDatabase(household_id=household_id, engine=self.engine)
+
+    async def create_tables(self):
+        """테이블/인덱스 생성 및 기존 데이터베이스 갱신 (database.ensure_schema)"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(ensure_schema)
+
+    async def dispose(self):
+        """연결 풀 정리"""
+        await self.engine.dispose()
+
+    async def add_food(self, name, category, purchase_date, expiry_date, location='냉장',
+                       quantity=1.0, unit='개', memo=None):
+        """음식 추가"""
+        async with self.Session() as session:
+            food = FoodItem(
+                household_id=self.household_id,
+                name=name,
+                category=category,
+                purchase_date=purchase_date,
+                expiry_date=expiry_date,
+                location=location,
+                quantity=quantity,
+                unit=unit,
+                memo=memo
+            )
+            session.add(food)
+            await session.commit()
+            return food
+
+    async def add_foods(self, items):
+        """
+        음식 여러 개 일괄 추가 (단일 트랜잭션)
+
+        Args:
+            items: add_food 인자와 같은 키를 가진 dict 리스트
+
+        Returns:
+            int: 추가된 음식 개수
+        """
+        if not items:
+            return 0
+
+        async with self.Session() as session:
+            session.add_all([
+                FoodItem(
+                    household_id=self.household_id,
+                    name=item['name'],
+                    category=item['category'],
+                    purchase_date=item['purchase_date'],
+                    expiry_date=item['expiry_date'],
+                    location=item.get('location', '냉장'),
+                    quantity=item.get('quantity', 1.0),
+                    unit=item.get('unit', '개'),
+                    memo=item.get('memo')
+                )
+                for item in items
+            ])
+            await session.commit()
+            return len(items)
+
+    async def get_all_foods(self):
+        """모든 음식 조회"""
+        async with self.Session() as session:
+            result = await session.scalars(self._foods().order_by(FoodItem.expiry_date))
+            return result.all()
+
+    async def get_foods_page(self, limit=50, offset=0, category=None, location=None, status=None):
+        """
+        음식 목록 한 페이지 (소비기한순, 필터 적용)
+
+        Returns:
+            tuple: (음식 리스트, 필터에 맞는 전체 개수)
+        """
+        conditions = [FoodItem.household_id == self.household_id, *food_filters(category, location, status)]
+        async with self.Session() as session:
+            total = await session.scalar(select(func.count(FoodItem.id)).where(*conditions))
+            result = await session.scalars(
+                select(FoodItem).where(*conditions)
+                .order_by(FoodItem.expiry_date, FoodItem.id).offset(offset).limit(limit)
+            )
+            return result.all(), total
+
+    async def get_expiring_soon(self, days=3):
+        """곧 만료될 음식 조회"""
+        today = date.today()
+        target_date = today + timedelta(days=days)
+        async with self.Session() as session:
+            result = await session.scalars(
+                self._foods().where(
+                    FoodItem.expiry_date >= today,
+                    FoodItem.expiry_date <= target_date
+                ).order_by(FoodItem.expiry_date)
+            )
+            return result.all()
+
+    async def get_expired_foods(self):
+        """만료된 음식 조회"""
+        today = date.today()
+        async with self.Session() as session:
+            result = await session.scalars(
+                self._foods().where(FoodItem.expiry_date < today).order_by(FoodItem.expiry_date.desc())
+            )
+            return result.all()
+
+    async def update_food(self, food_id, **kwargs):
+        """음식 정보 수정 (소비기한이 구매일보다 이전이 되면 ValueError, 저장하지 않음)"""
+        async with self.Session() as session:
+            food = await self._get_food(session, food_id)
+            if food:
+                apply_food_changes(food, kwargs)
+                await self._mark_calendar_dirty(session, food_id)
+                await session.commit()
+                return food
+            return None
+
+    async def delete_food(self, food_id):
+        """음식 삭제"""
+        async with self.Session() as session:
+            food = await self._get_food(session, food_id)
+            if food:
+                await session.delete(food)
+                await self._mark_calendar_dirty(session, food_id)
+                await session.commit()
+                return True
+            return False
+
+    async def close_foods(self, food_ids, outcome):
+        """음식을 재고에서 빼고 기록 테이블로 옮김 (Database.close_foods 참고)"""
+        food_ids = list(dict.fromkeys(food_ids))
+        if not food_ids:
+            return 0
+
+        closed_at = datetime.now()
+        async with self.Session() as session:
+            moved = 0
+            for start in range(0, len(food_ids), ARCHIVE_BATCH_SIZE):
+                archive, remove, mark_dirty = close_food_statements(
+                    self.household_id, food_ids[start:start + ARCHIVE_BATCH_SIZE], outcome, closed_at
+                )
+                await session.execute(archive)
+                moved += (await session.execute(remove)).rowcount
+                await session.execute(mark_dirty)
+            await session.commit()
+            return moved
+
+    async def get_food_history(self, limit=50, offset=0, outcome=None):
+        """
+        음식 기록 한 페이지 (최근순)
+
+        Returns:
+            tuple: (FoodHistory 리스트, 전체 개수)
+        """
+        conditions = [FoodHistory.household_id == self.household_id]
+        if outcome:
+            conditions.append(FoodHistory.outcome == outcome)
+        async with self.Session() as session:
+            total = await session.scalar(select(func.count(FoodHistory.id)).where(*conditions))
+            result = await session.scalars(
+                select(FoodHistory).where(*conditions)
+                .order_by(FoodHistory.closed_at.desc(), FoodHistory.id.desc()).offset(offset).limit(limit)
+            )
+            return result.all(), total
+
+    async def get_food_by_id(self, food_id):
+        """ID로 음식 조회"""
+        async with self.Session() as session:
+            return await self._get_food(session, food_id)
+
+    def _foods(self):
+        """이 가구의 음식 SELECT"""
+        return select(FoodItem).where(FoodItem.household_id == self.household_id)
+
+    async def _get_food(self, session, food_id):
+        return await session.scalar(self._foods().where(FoodItem.id == food_id))
+
+    async def _mark_calendar_dirty(self, session, food_id):
+        """음식이 수정/삭제되면 캘린더 매핑을 재동기화 대상으로 표시"""
+        await session.execute(
+            update(CalendarEvent).where(
+                CalendarEvent.household_id == self.household_id, CalendarEvent.food_id == food_id
+            ).values(dirty=True)
+        )
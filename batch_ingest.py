@@ -0,0 +1,248 @@
+"""
+음식 사진 폴더 일괄 등록 CLI
+
+사용법:
+    python batch_ingest.py <사진 폴더> [--workers 4] [--concurrency 4] [--dry-run]
+
+- 이미지 전처리(EXIF 방향 보정, 리사이즈)는 프로세스 풀에서 병렬 실행
+- Vision API 분석은 동시 요청 수를 제한하여 실행
+- 분석 결과는 Database.add_foods로 일괄 저장
+- 처리한 이미지 해시를 매니페스트에 기록하여 중단 후 재실행 시 이어서 처리
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from ai_agent import FoodRecognitionAgent
+from database import CATEGORIES, LOCATIONS
+from food_classifier import FoodClassifier, detected_expiry_date
+from household_router import HouseholdRouter
+from image_processing import MAX_ANALYSIS_SIZE, MIME_TYPES, hash_bytes, preprocess_image_file
+
+MANIFEST_NAME = ".ingest_manifest.jsonl"
+
+
+def find_images(directory):
+    """폴더에서 이미지 파일 목록 찾기 (하위 폴더 포함, 이름순)"""
+    return sorted(
+        path for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in MIME_TYPES
+    )
+
+
+def load_manifest(manifest_path):
+    """매니페스트에서 처리 완료된 이미지 해시 읽기"""
+    done = set()
+    if not manifest_path.exists():
+        return done
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                done.add(json.loads(line)["hash"])
+            except (json.JSONDecodeError, KeyError):
+                continue  # 중단 중 잘린 줄은 무시
+    return done
+
+
+def append_manifest(manifest_path, entries):
+    """처리 완료된 이미지를 매니페스트에 추가"""
+    with open(manifest_path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def percentile(values, pct):
+    """최근접 순위 방식 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def result_to_food(result, classifier, today):
+    """AI 분석 결과를 add_foods 입력으로 변환"""
+    result = classifier.normalize_result(result)
+
+    # 사진에서 읽은 날짜 (계란은 산란일자 + 보관 일수), 없으면 AI가 추정한 남은 일수
+    expiry_date = detected_expiry_date(result)
+    if expiry_date is None:
+        try:
+            days = int(result.get("estimated_shelf_life_days", 7))
+        except (TypeError, ValueError):
+            days = 7
+        expiry_date = today + timedelta(days=max(days, 0))
+
+    try:
+        quantity = float(result.get("quantity", 1))
+    except (TypeError, ValueError):
+        quantity = 1.0
+
+    # 사진에서 읽은 날짜가 이미 지났으면 그대로 두고 호출한 쪽에서 만료로 표시
+    # (구매일은 소비기한보다 늦을 수 없으므로 함께 당김)
+    return {
+        "name": result["name"],
+        "category": result["category"] if result["category"] in CATEGORIES else "기타",
+        "purchase_date": min(today, expiry_date),
+        "expiry_date": expiry_date,
+        "location": result["location"] if result.get("location") in LOCATIONS else "냉장",
+        "quantity": quantity if quantity >= 1 else 1.0,
+        "unit": "개",
+        "memo": "사진 일괄 등록",
+    }
+
+
+def analyze(agent, item):
+    """전처리된 이미지 하나를 분석하고 지연 시간 측정"""
+    started = time.perf_counter()
+    image_base64 = base64.b64encode(item["image_bytes"]).decode("utf-8")
+    result = agent.analyze_food_image(image_base64, item["image_type"])
+    return result, time.perf_counter() - started
+
+
+def run(args):
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"❌ 폴더를 찾을 수 없습니다: {directory}")
+        return 1
+
+    manifest_path = Path(args.manifest) if args.manifest else directory / MANIFEST_NAME
+    done_hashes = load_manifest(manifest_path)
+
+    # 원본 해시로 이미 처리한 이미지 제외 (전처리 비용도 아끼기 위해 먼저 확인)
+    pending = []
+    for path in find_images(directory):
+        with open(path, "rb") as f:
+            if hash_bytes(f.read()) not in done_hashes:
+                pending.append(path)
+
+    print(f"📂 이미지 {len(pending)}장 처리 예정 (완료된 {len(done_hashes)}장 건너뜀)")
+    if not pending:
+        return 0
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
+        return 1
+
+    agent = FoodRecognitionAgent(api_key=api_key)
+    db = None if args.dry_run else HouseholdRouter.from_env().database(args.household)
+    classifier = FoodClassifier(CATEGORIES).fit(db.get_all_foods() if db else [])
+    today = date.today()
+
+    latencies = []
+    added = skipped = failed = expired = 0
+    pending_foods, pending_entries = [], []
+
+    def flush():
+        nonlocal added
+        if db:
+            added += db.add_foods(pending_foods)
+            # DB 저장이 끝난 뒤에만 완료로 기록 (중단 시 재처리)
+            append_manifest(manifest_path, pending_entries)
+        else:
+            added += len(pending_foods)
+        pending_foods.clear()
+        pending_entries.clear()
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as preprocess_pool, \
+            ThreadPoolExecutor(max_workers=args.concurrency) as analysis_pool:
+        preprocess_futures = [
+            preprocess_pool.submit(preprocess_image_file, str(path), args.max_size)
+            for path in pending
+        ]
+
+        # 전처리가 끝나는 순서대로 분석 요청 (동시 요청 수는 analysis_pool 크기로 제한)
+        analysis_futures = {}
+        for future in as_completed(preprocess_futures):
+            try:
+                item = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ 전처리 실패: {e}")
+                continue
+            analysis_futures[analysis_pool.submit(analyze, agent, item)] = item
+
+        for future in as_completed(analysis_futures):
+            item = analysis_futures[future]
+            name = Path(item["path"]).name
+            try:
+                result, latency = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ {name}: 분석 실패 ({e})")
+                continue
+
+            latencies.append(latency)
+            entry = {"hash": item["hash"], "path": item["path"], "name": result.get("name")}
+
+            if float(result.get("confidence", 0)) < args.min_confidence:
+                skipped += 1
+                entry["status"] = "skipped"
+                print(f"  ⚠️ {name}: 신뢰도 낮음 ({result.get('confidence')}%) - 건너뜀")
+            else:
+                food = result_to_food(result, classifier, today)
+                pending_foods.append(food)
+                entry["status"] = "added"
+                entry["expiry_date"] = food["expiry_date"].isoformat()
+                if food["expiry_date"] < today:
+                    expired += 1
+                    entry["expired"] = True
+                    print(f"  🗑️ {name}: {food['name']} ({food['category']}) - 이미 만료됨 ({food['expiry_date']})")
+                else:
+                    print(f"  ✅ {name}: {food['name']} ({food['category']}, ~{food['expiry_date']})")
+
+            pending_entries.append(entry)
+            if len(pending_entries) >= args.batch_size:
+                flush()
+
+    flush()
+    elapsed = time.perf_counter() - started
+    processed = added + skipped + failed
+
+    print("\n" + "=" * 50)
+    print("일괄 등록 결과:")
+    print("=" * 50)
+    print(f"추가: {added}개 (이미 만료 {expired}개) / 건너뜀: {skipped}개 / 실패: {failed}개"
+          + (" (dry-run)" if args.dry_run else ""))
+    print(f"소요 시간: {elapsed:.1f}초")
+    print(f"처리량: {processed / elapsed * 60 if elapsed else 0:.1f} 장/분")
+    print(f"분석 지연 p50: {percentile(latencies, 50):.2f}초 / "
+          f"p90: {percentile(latencies, 90):.2f}초 / p99: {percentile(latencies, 99):.2f}초")
+    print(f"예상 비용: ${agent.estimate_cost():.4f}")
+    print("=" * 50)
+    return 0 if failed == 0 else 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="음식 사진 폴더를 분석하여 냉장고에 일괄 등록합니다.")
+    parser.add_argument("directory", help="사진이 들어있는 폴더")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="전처리 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 Vision API 요청 수")
+    parser.add_argument("--batch-size", type=int, default=10, help="DB 일괄 저장 단위")
+    parser.add_argument("--max-size", type=int, default=MAX_ANALYSIS_SIZE, help="분석용 이미지 최대 변 길이")
+    parser.add_argument("--min-confidence", type=float, default=50, help="이 신뢰도 미만은 등록하지 않음")
+    parser.add_argument("--manifest", help="매니페스트 경로 (기본값: <폴더>/.ingest_manifest.jsonl)")
+    parser.add_argument("--household", help="등록할 가구 ID (기본값: FRIDGE_HOUSEHOLD_ID 또는 default)")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 저장하지 않고 분석만 실행")
+    return run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    sys.exit(main())
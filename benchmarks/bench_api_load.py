@@ -0,0 +1,249 @@
+"""
+REST API 부하 테스트 (api_server.py)
+
+사용법:
+    python benchmarks/bench_api_load.py [--items 5000] [--concurrency 1,8,32] [--duration 10]
+                                        [--llm-latency-ms 200] [--url http://127.0.0.1:8000] [--json out.json]
+
+--url을 주지 않으면 inventory_generator로 음식 N개를 넣은 임시 데이터베이스와
+가짜 AI 에이전트(FRIDGE_MOCK_LLM=1)로 uvicorn 서버를 새 프로세스에서 띄웁니다.
+동시 사용자 수마다 --duration초 동안 요청을 섞어 보내고(비중은 MIX 참고)
+초당 요청 수(RPS)와 엔드포인트별 지연 시간 p50/p95/p99를 출력합니다.
+스트리밍 엔드포인트는 응답 본문을 끝까지 받은 시간입니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from database import Database, CATEGORIES, LOCATIONS  # noqa: E402
+from inventory_generator import populate_database  # noqa: E402
+
+# (요청 이름, 비중)
+MIX = [
+    ("list_page", 40),
+    ("list_filtered", 15),
+    ("get_food", 15),
+    ("expiring", 10),
+    ("add_food", 8),
+    ("update_food", 5),
+    ("bulk_add", 2),
+    ("chat_stream", 3),
+    ("recipe_stream", 2),
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def new_food(rng):
+    today = date.today()
+    return {
+        "name": rng.choice(["우유", "두부", "양파", "달걀", "사과", "닭가슴살"]),
+        "category": rng.choice(CATEGORIES),
+        "location": rng.choice(LOCATIONS),
+        "purchase_date": today.isoformat(),
+        "expiry_date": (today + timedelta(days=rng.randint(1, 30))).isoformat(),
+        "quantity": rng.randint(1, 5),
+    }
+
+
+class LoadClient:
+    """요청 한 종류를 실행하고 지연 시간을 기록"""
+
+    def __init__(self, client, items, seed):
+        self.client = client
+        self.items = items
+        self.rng = random.Random(seed)
+        self.names, weights = zip(*MIX)
+        self.weights = weights
+        self.latencies = {name: [] for name in self.names}
+        self.errors = {name: 0 for name in self.names}
+
+    async def request(self, name):
+        rng = self.rng
+        if name == "list_page":
+            offset = rng.randrange(0, max(self.items, 1), 50)
+            return await self.client.get("/foods", params={"limit": 50, "offset": offset})
+        if name == "list_filtered":
+            return await self.client.get("/foods", params={"limit": 50, "location": rng.choice(LOCATIONS),
+                                                           "status": rng.choice(["신선", "임박", "만료"])})
+        if name == "get_food":
+            return await self.client.get(f"/foods/{rng.randint(1, self.items)}")
+        if name == "expiring":
+            return await self.client.get("/foods/expiring", params={"days": 3})
+        if name == "add_food":
+            return await self.client.post("/foods", json=new_food(rng))
+        if name == "update_food":
+            return await self.client.patch(f"/foods/{rng.randint(1, self.items)}",
+                                           json={"quantity": rng.randint(1, 9)})
+        if name == "bulk_add":
+            return await self.client.post("/foods/bulk", json=[new_food(rng) for _ in range(20)])
+        if name == "chat_stream":
+            return await self._stream("/chat/stream", {"question": "된장찌개 끓이는 법 알려줘"})
+        if name == "recipe_stream":
+            return await self._stream("/recipes/stream", {})
+        raise ValueError(name)
+
+    async def _stream(self, path, body):
+        async with self.client.stream("POST", path, json=body) as response:
+            async for _ in response.aiter_bytes():
+                pass
+        return response
+
+    async def worker(self, deadline):
+        while time.perf_counter() < deadline:
+            name = self.rng.choices(self.names, self.weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await self.request(name)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                self.latencies[name].append((time.perf_counter() - started) * 1000)
+            else:
+                self.errors[name] += 1
+
+
+async def run_level(url, items, concurrency, duration, seed):
+    """동시 사용자 concurrency명으로 duration초 동안 부하"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        load = LoadClient(client, items, seed)
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(load.worker(deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [ms for values in load.latencies.values() for ms in values]
+    endpoints = {
+        name: {"count": len(values), "errors": load.errors[name],
+               "p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+               "p99_ms": percentile(values, 99)}
+        for name, values in load.latencies.items()
+    }
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests": len(all_latencies),
+        "errors": sum(load.errors.values()),
+        "rps": len(all_latencies) / elapsed,
+        "p50_ms": percentile(all_latencies, 50),
+        "p95_ms": percentile(all_latencies, 95),
+        "p99_ms": percentile(all_latencies, 99),
+        "endpoints": endpoints,
+    }
+
+
+def start_server(workdir, db_path, llm_latency_ms):
+    """임시 데이터베이스와 가짜 AI 에이전트로 uvicorn 서버 시작"""
+    port = free_port()
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+    env.update({
+        "FRIDGE_DB_URL": f"sqlite:///{db_path}",
+        "FRIDGE_MOCK_LLM": "1",
+        "FRIDGE_MOCK_LLM_LATENCY_MS": str(llm_latency_ms),
+        "PYTHONPATH": str(REPO_DIR) + os.pathsep + env.get("PYTHONPATH", ""),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api_server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("API 서버가 시작되지 않았습니다.")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API 서버 시작 시간 초과")
+
+
+def print_results(levels):
+    print(f"\n{'동시 사용자':>10}{'요청':>9}{'오류':>6}{'RPS':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}")
+    for level in levels:
+        print(f"{level['concurrency']:>10}{level['requests']:>9}{level['errors']:>6}{level['rps']:>10.1f}"
+              f"{level['p50_ms']:>10.1f}{level['p95_ms']:>10.1f}{level['p99_ms']:>10.1f}")
+
+    print(f"\n{'엔드포인트 p99(ms)':<20}" + "".join(f"{'c=' + str(level['concurrency']):>12}" for level in levels))
+    for name, _ in MIX:
+        print(f"{name:<20}" + "".join(f"{level['endpoints'][name]['p99_ms']:>12.1f}" for level in levels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REST API 부하 테스트")
+    parser.add_argument("--items", type=int, default=5000, help="미리 넣을 음식 개수 (--url 없을 때)")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 사용자 수 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10, help="동시 사용자 수마다 부하 시간 (초)")
+    parser.add_argument("--llm-latency-ms", type=float, default=200, help="가짜 AI 응답 지연 (ms)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (주면 서버를 띄우지 않음)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터/요청 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    levels = []
+    with tempfile.TemporaryDirectory(prefix="bench_api_load_") as tmp:
+        process = None
+        url = args.url
+        items = args.items
+        if url is None:
+            db_path = Path(tmp) / "fridge.db"
+            db = Database(f"sqlite:///{db_path}")
+            populate_database(db, items, seed=args.seed)
+            db.engine.dispose()
+            process, url = start_server(tmp, db_path, args.llm_latency_ms)
+        else:
+            items = httpx.get(f"{url}/foods", params={"limit": 1}).json()["total"]
+
+        try:
+            for concurrency in (int(c) for c in args.concurrency.split(",")):
+                print(f"측정 중: 동시 사용자 {concurrency}명, {args.duration:g}초...", flush=True)
+                levels.append(asyncio.run(run_level(url, items, concurrency, args.duration, args.seed)))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    print_results(levels)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"items": items, "llm_latency_ms": args.llm_latency_ms, "mix": dict(MIX),
+                       "levels": levels}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+앱 상호작용 벤치마크 (AppTest로 실제 app.py 재실행 측정)
+
+사용법:
+    python benchmarks/bench_app_interactions.py [--sizes 100,1000,5000] [--json out.json]
+
+크기마다 inventory_generator로 음식 N개를 넣은 데이터베이스(FRIDGE_DB_URL)와
+가짜 AI 에이전트(FRIDGE_MOCK_LLM=1)로 새 프로세스에서 앱을 실행하고,
+자주 쓰는 상호작용을 차례로 실행하여 각 재실행의 다음 값을 기록합니다.
+- seconds: 스크립트 재실행 시간
+- queries: 실행된 SQL 문 수 (SQLAlchemy before_cursor_execute, 백그라운드 작업 워커 제외)
+- elements: 화면 요소 수
+
+상호작용 순서:
+    first_load → dashboard_filter → dashboard_filter_all → open_food_list → food_list_filter →
+    food_list_filter_reset → edit_open → edit_save → open_ai → toggle_chip → recipe → chat
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from database import Database  # noqa: E402
+from inventory_generator import populate_database  # noqa: E402
+
+CHILD_CODE = """
+import json, sys, threading, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from streamlit.testing.v1 import AppTest
+
+queries = [0]
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    if threading.current_thread().name != "fridge-job-worker":
+        queries[0] += 1
+
+def count_elements(node):
+    count = 1 if hasattr(getattr(node, 'proto', None), 'ByteSize') else 0
+    return count + sum(count_elements(child) for child in getattr(node, 'children', {}).values())
+
+at = AppTest.from_file(sys.argv[1], default_timeout=1800)
+results = []
+
+def step(name, action):
+    queries[0] = 0
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    assert not at.exception, (name, at.exception)
+    results.append({'interaction': name, 'seconds': elapsed, 'queries': queries[0],
+                    'elements': count_elements(at._tree)})
+
+def button(prefix=None, label=None):
+    return next(b for b in at.button
+                if (prefix and (b.key or '').startswith(prefix)) or (label and b.label.startswith(label)))
+
+def selectbox(label):
+    return next(s for s in at.selectbox if s.label == label)
+
+step('first_load', at.run)
+step('dashboard_filter', lambda: at.button(key='filter_냉장').click().run())
+step('dashboard_filter_all', lambda: at.button(key='filter_all').click().run())
+step('open_food_list', lambda: at.radio(key='active_view').set_value('📝 음식 목록').run())
+step('food_list_filter', lambda: selectbox('위치 필터').set_value('냉동').run())
+step('food_list_filter_reset', lambda: selectbox('위치 필터').set_value('전체').run())
+
+edit_button = button(prefix='edit_')
+food_id = edit_button.key[len('edit_'):]
+step('edit_open', lambda: edit_button.click().run())
+
+def save_edit():
+    quantity = at.number_input(key=f'edit_quantity_{food_id}')
+    quantity.set_value(quantity.value + 1)
+    button(label='💾 저장').click().run()
+
+step('edit_save', save_edit)
+step('open_ai', lambda: at.radio(key='active_view').set_value('🤖 AI 추천').run())
+step('toggle_chip', lambda: button(prefix='ingredient_btn_').click().run())
+step('recipe', lambda: button(label='🍳 선택한 재료로').click().run())
+step('chat', lambda: at.chat_input(key='cooking_chat_input').set_value('된장찌개 끓이는 법 알려줘').run())
+print('RESULTS', json.dumps(results))
+"""
+
+
+def child_env(db_path):
+    env = dict(os.environ)
+    env.pop("GOOGLE_CALENDAR_API_ENDPOINT", None)
+    env.pop("OPENAI_API_KEY", None)
+    env["FRIDGE_DB_URL"] = f"sqlite:///{db_path}"
+    env["FRIDGE_MOCK_LLM"] = "1"
+    env["PYTHONPATH"] = str(REPO_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def run_child(workdir, db_path):
+    """새 프로세스에서 상호작용 실행 (cache_resource가 크기마다 새로 만들어지도록)"""
+    result = subprocess.run([sys.executable, "-c", CHILD_CODE, str(REPO_DIR / "app.py")],
+                            cwd=workdir, env=child_env(db_path), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    line = next(line for line in result.stdout.splitlines() if line.startswith("RESULTS"))
+    return json.loads(line[len("RESULTS "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 상호작용 벤치마크")
+    parser.add_argument("--sizes", default="100,1000,5000", help="음식 개수 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_app_interactions_") as tmp:
+        for size in sizes:
+            db_path = Path(tmp) / f"fridge_{size}.db"
+            db = Database(f"sqlite:///{db_path}")
+            populate_database(db, size, seed=args.seed)
+            db.engine.dispose()
+
+            print(f"측정 중: 음식 {size}개...", flush=True)
+            for result in run_child(tmp, db_path):
+                rows.append({"items": size, **result})
+
+    interactions = list(dict.fromkeys(r["interaction"] for r in rows))
+    print(f"\n{'상호작용':<24}" + "".join(f"{f'{size}개 (초/쿼리/요소)':>26}" for size in sizes))
+    for name in interactions:
+        cells = []
+        for size in sizes:
+            r = next(r for r in rows if r["items"] == size and r["interaction"] == name)
+            cells.append(f"{r['seconds']:>10.3f}{r['queries']:>7}{r['elements']:>9}")
+        print(f"{name:<24}" + "".join(f"{cell:>26}" for cell in cells))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "results": rows}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
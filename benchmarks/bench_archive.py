@@ -0,0 +1,102 @@
+"""
+만료 음식 정리(food_history로 이동) 전후의 재고 조회 비용 벤치마크
+
+사용법:
+    python benchmarks/bench_archive.py [--live 2000] [--backlog 50000] [--retention-days 30] [--json out.json]
+
+임시 SQLite 데이터베이스에 현재 재고 --live개와, 1년 전 기준으로 만든 음식 --backlog개
+(대부분 오래전에 만료되어 정리하지 않으면 계속 쌓이는 음식)를 넣고
+자주 쓰는 조회 시간과 파일 크기를 측정합니다.
+그 뒤 정기 점검 작업과 같은 순서(archive_all_expired_foods → optimize_storage)로 정리하고 다시 측정합니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from database import Database  # noqa: E402
+from inventory_generator import generate_foods, populate_database  # noqa: E402
+
+OPS = {
+    "get_all_foods": lambda db: db.get_all_foods(),
+    "get_expired_foods": lambda db: db.get_expired_foods(),
+    "get_foods_page": lambda db: db.get_foods_page(limit=50, status="신선"),
+    "get_inventory_stamp": lambda db: db.get_inventory_stamp(),
+}
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure(db, path, repeat):
+    row = {f"{op}_ms": median_ms(lambda: func(db), repeat) for op, func in OPS.items()}
+    row["rows"] = db.get_inventory_stamp()[0]
+    row["file_kb"] = os.path.getsize(path) / 1024
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="만료 음식 정리 전후 조회 비용 벤치마크")
+    parser.add_argument("--live", type=int, default=2000, help="현재 재고 음식 개수")
+    parser.add_argument("--backlog", type=int, default=50000, help="1년 전 기준으로 만든 음식 개수")
+    parser.add_argument("--retention-days", type=int, default=30, help="만료 후 재고에 남겨 둘 일수")
+    parser.add_argument("--repeat", type=int, default=10, help="조회 반복 횟수 (중앙값 기록)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_archive_") as tmp:
+        path = Path(tmp) / "fridge.db"
+        db = Database(f"sqlite:///{path}")
+        print(f"생성 중: 재고 {args.live}개 + 지난 음식 {args.backlog}개...", flush=True)
+        db.add_foods(list(generate_foods(args.backlog, seed=args.seed + 1,
+                                         today=date.today() - timedelta(days=365))))
+        populate_database(db, args.live, seed=args.seed)
+
+        print("측정 중: 정리 전...", flush=True)
+        before = measure(db, path, args.repeat)
+
+        print("정리 중: archive_all_expired_foods → optimize_storage...", flush=True)
+        started = time.perf_counter()
+        archived = db.archive_all_expired_foods(args.retention_days)['archived']
+        archive_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        storage = db.optimize_storage()
+        optimize_ms = (time.perf_counter() - started) * 1000
+
+        print("측정 중: 정리 후...", flush=True)
+        after = measure(db, path, args.repeat)
+        history_rows = db.get_food_history(limit=1)[1]
+        db.engine.dispose()
+
+    print(f"\n옮긴 음식 {archived}개 ({archive_ms:.0f} ms), 기록 {history_rows}개, "
+          f"optimize_storage {optimize_ms:.0f} ms (VACUUM {'실행' if storage['vacuumed'] else '생략'})")
+    print(f"\n{'':<8}{'행':>8}{'파일(KB)':>10}" + "".join(f"{op:>22}" for op in OPS))
+    for label, row in (("정리 전", before), ("정리 후", after)):
+        print(f"{label:<8}{row['rows']:>8}{row['file_kb']:>10.0f}"
+              + "".join(f"{row[f'{op}_ms']:>19.2f} ms" for op in OPS))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"live": args.live, "backlog": args.backlog, "retention_days": args.retention_days,
+                       "archived": archived, "archive_ms": archive_ms, "optimize_ms": optimize_ms,
+                       "storage": storage, "before": before, "after": after}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+동기 Database와 비동기 AsyncDatabase 동시 처리 벤치마크
+
+사용법:
+    python benchmarks/bench_async_database.py [--items 20000] [--ops 2000] [--concurrency 1,8,32]
+                                              [--llm-latency-ms 0] [--json out.json]
+
+inventory_generator로 음식 N개를 넣은 임시 SQLite 데이터베이스에서 같은 작업 묶음을
+세 가지 방식으로 실행하고 처리량(ops/s)과 작업별 지연 시간 p50/p99를 비교합니다.
+- sync: 동기 Database를 한 스레드에서 순서대로 (동시 사용자 수와 무관, 기준값)
+- sync_threads: 동기 Database를 스레드 풀(동시 사용자 수만큼)에서 실행
+- async: AsyncDatabase를 이벤트 루프에서 동시에 실행
+
+작업 구성은 ID 조회 70%, 임박 음식 조회 20%, 수정 10%이며,
+--llm-latency-ms를 주면 작업마다 AI 호출을 흉내 낸 대기 시간을 DB 조회 뒤에 추가합니다.
+(DB 조회와 AI 호출을 겹쳐 실행할 때의 이득 확인용)
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from async_database import AsyncDatabase  # noqa: E402
+from database import Database  # noqa: E402
+from inventory_generator import populate_database  # noqa: E402
+
+# (작업 이름, 비중)
+MIX = [
+    ("get_food_by_id", 70),
+    ("get_expiring_soon", 20),
+    ("update_food", 10),
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def make_ops(count, items, seed):
+    """(작업 이름, 인자) 리스트 (모든 방식이 같은 작업을 실행하도록 미리 생성)"""
+    rng = random.Random(seed)
+    names, weights = zip(*MIX)
+    ops = []
+    for name in rng.choices(names, weights, k=count):
+        if name == "get_food_by_id":
+            ops.append((name, (rng.randint(1, items),), {}))
+        elif name == "get_expiring_soon":
+            ops.append((name, (3,), {}))
+        else:
+            ops.append((name, (rng.randint(1, items),), {"quantity": rng.randint(1, 9)}))
+    return ops
+
+
+def summarize(mode, concurrency, latencies, elapsed):
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "ops": len(latencies),
+        "seconds": elapsed,
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def run_sync(db, ops, llm_latency):
+    latencies = []
+    started = time.perf_counter()
+    for name, args, kwargs in ops:
+        op_started = time.perf_counter()
+        getattr(db, name)(*args, **kwargs)
+        if llm_latency:
+            time.sleep(llm_latency)
+        latencies.append((time.perf_counter() - op_started) * 1000)
+    return latencies, time.perf_counter() - started
+
+
+async def run_sync_threads(db, ops, concurrency, llm_latency):
+    """동기 Database 호출을 스레드 풀에서 실행 (AI 대기는 이벤트 루프에서)"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(executor, name, args, kwargs):
+        async with semaphore:
+            op_started = time.perf_counter()
+            await loop.run_in_executor(executor, lambda: getattr(db, name)(*args, **kwargs))
+            if llm_latency:
+                await asyncio.sleep(llm_latency)
+            latencies.append((time.perf_counter() - op_started) * 1000)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(executor, *op) for op in ops))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+async def run_async(db, ops, concurrency, llm_latency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(name, args, kwargs):
+        async with semaphore:
+            op_started = time.perf_counter()
+            await getattr(db, name)(*args, **kwargs)
+            if llm_latency:
+                await asyncio.sleep(llm_latency)
+            latencies.append((time.perf_counter() - op_started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*op) for op in ops))
+    return latencies, time.perf_counter() - started
+
+
+async def run_async_levels(db_url, ops, levels, llm_latency):
+    db = AsyncDatabase(db_url)
+    try:
+        await db.get_food_by_id(1)  # 연결 준비
+        return [summarize("async", c, *await run_async(db, ops, c, llm_latency)) for c in levels]
+    finally:
+        await db.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기/비동기 데이터베이스 동시 처리 벤치마크")
+    parser.add_argument("--items", type=int, default=20000, help="미리 넣을 음식 개수")
+    parser.add_argument("--ops", type=int, default=2000, help="방식마다 실행할 작업 수")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 실행 수 (쉼표 구분)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="작업마다 추가할 AI 호출 대기 (ms)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터/작업 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    llm_latency = args.llm_latency_ms / 1000
+    ops = make_ops(args.ops, args.items, args.seed)
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="bench_async_database_") as tmp:
+        db_url = f"sqlite:///{Path(tmp) / 'fridge.db'}"
+        db = Database(db_url)
+        populate_database(db, args.items, seed=args.seed)
+
+        print("측정 중: sync...", flush=True)
+        rows.append(summarize("sync", 1, *run_sync(db, ops, llm_latency)))
+        for concurrency in levels:
+            print(f"측정 중: sync_threads, 동시 {concurrency}...", flush=True)
+            rows.append(summarize("sync_threads", concurrency,
+                                  *asyncio.run(run_sync_threads(db, ops, concurrency, llm_latency))))
+        db.engine.dispose()
+
+        print("측정 중: async...", flush=True)
+        rows.extend(asyncio.run(run_async_levels(db_url, ops, levels, llm_latency)))
+
+    print(f"\n{'방식':<14}{'동시':>6}{'ops/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for row in rows:
+        print(f"{row['mode']:<14}{row['concurrency']:>6}{row['ops_per_sec']:>10.1f}"
+              f"{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"items": args.items, "ops": args.ops, "llm_latency_ms": args.llm_latency_ms,
+                       "mix": dict(MIX), "results": rows}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
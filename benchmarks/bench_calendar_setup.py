@@ -0,0 +1,123 @@
+"""
+구글 캘린더 서비스 준비 시간 벤치마크 (동기화 1회당 설정 비용)
+
+사용법:
+    python benchmarks/bench_calendar_setup.py [--repeat 20] [--json out.json]
+
+측정 방식:
+- legacy: 동기화마다 token.pickle 로드 + build() (이전 구현)
+- cold: 캐시를 비운 뒤 첫 authenticate() (프로세스당 한 번)
+- cached: 이후 authenticate() (캐시된 서비스 재사용)
+- legacy+list / cached+list: 가짜 서버에 목록 조회 1회 포함 (HTTP 연결 재사용 효과)
+
+실제 구글 계정 없이 측정하도록 만료 전인 가짜 토큰을 임시 폴더에 만들어 사용합니다.
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httplib2  # noqa: E402
+from google.oauth2.credentials import Credentials  # noqa: E402
+from googleapiclient.discovery import build  # noqa: E402
+
+import calendar_integration  # noqa: E402
+import fake_calendar  # noqa: E402
+from calendar_integration import GoogleCalendarIntegration, reset_calendar_service  # noqa: E402
+
+
+def write_fake_token(path):
+    creds = Credentials(
+        token="fake-access-token",
+        refresh_token="fake-refresh-token",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="fake-client-id",
+        client_secret="fake-client-secret",
+        scopes=calendar_integration.SCOPES,
+        expiry=datetime.utcnow() + timedelta(hours=1),
+    )
+    with open(path, "wb") as f:
+        pickle.dump(creds, f)
+
+
+def legacy_authenticate():
+    """이전 구현: 매번 토큰 파일을 읽고 서비스 생성"""
+    with open(calendar_integration.TOKEN_PATH, "rb") as token:
+        creds = pickle.load(token)
+    return build("calendar", "v3", credentials=creds)
+
+
+def legacy_endpoint_service(endpoint):
+    return build("calendar", "v3", http=httplib2.Http(),
+                 client_options={"api_endpoint": endpoint}, static_discovery=True)
+
+
+def cached_authenticate(api_endpoint=None):
+    calendar = GoogleCalendarIntegration(api_endpoint=api_endpoint)
+    assert calendar.authenticate()
+    return calendar.service
+
+
+def measure(name, func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "name": name,
+        "runs": repeat,
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구글 캘린더 서비스 준비 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    parser.add_argument("--latency-ms", type=float, default=0, help="가짜 서버 HTTP 지연 (ms)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    os.environ.pop("GOOGLE_CALENDAR_API_ENDPOINT", None)
+    workdir = tempfile.mkdtemp(prefix="bench_calendar_setup_")
+    os.chdir(workdir)
+    write_fake_token(calendar_integration.TOKEN_PATH)
+
+    server, endpoint = fake_calendar.start_in_thread(latency=args.latency_ms / 1000)
+
+    def list_once(service):
+        service.events().list(calendarId="primary", maxResults=10).execute()
+
+    results = [
+        measure("legacy", legacy_authenticate, args.repeat),
+        measure("cold", cached_authenticate, args.repeat, setup=reset_calendar_service),
+        measure("cached", cached_authenticate, args.repeat),
+        measure("legacy+list", lambda: list_once(legacy_endpoint_service(endpoint)), args.repeat),
+        measure("cached+list", lambda: list_once(cached_authenticate(endpoint)), args.repeat),
+    ]
+    server.shutdown()
+
+    print(f"\n{'방식':<14}{'평균(ms)':>12}{'중앙값(ms)':>14}{'최대(ms)':>12}")
+    for r in results:
+        print(f"{r['name']:<14}{r['mean_ms']:>12.2f}{r['median_ms']:>14.2f}{r['max_ms']:>12.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
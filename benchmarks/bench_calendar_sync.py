@@ -0,0 +1,113 @@
+"""
+구글 캘린더 동기화 벤치마크 (로컬 가짜 캘린더 서버 사용)
+
+사용법:
+    python benchmarks/bench_calendar_sync.py [--items 1000] [--latency-ms 20] [--error-rate 0] [--json out.json]
+
+측정 전략:
+- serial: 음식마다 events.insert 한 번씩 (이전 방식)
+- batched: 증분 동기화 첫 실행 (최대 50개씩 배치)
+- noop: 변경 없이 다시 동기화 (API 호출 0회가 목표)
+- edit-5%: 5% 수정 + 1% 삭제 후 다시 동기화
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fake_calendar  # noqa: E402
+from calendar_integration import GoogleCalendarIntegration, SYNC_WINDOW_DAYS  # noqa: E402
+from database import Database, CATEGORIES, LOCATIONS  # noqa: E402
+
+
+def seed_database(db, count):
+    today = date.today()
+    db.add_foods([
+        {
+            "name": f"음식{i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "purchase_date": today,
+            "expiry_date": today + timedelta(days=1 + i % SYNC_WINDOW_DAYS),
+            "location": LOCATIONS[i % len(LOCATIONS)],
+            "quantity": 1 + i % 5,
+        }
+        for i in range(count)
+    ])
+
+
+def run_strategy(name, server, func):
+    server.backend.reset_stats()
+    started = time.perf_counter()
+    outcome = func()
+    elapsed = time.perf_counter() - started
+    stats = dict(server.backend.stats)
+    return {"strategy": name, "seconds": elapsed, "outcome": outcome, **stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구글 캘린더 동기화 벤치마크")
+    parser.add_argument("--items", type=int, default=1000, help="동기화할 음식 수")
+    parser.add_argument("--latency-ms", type=float, default=20, help="가짜 서버 HTTP 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0, help="429/403 오류 주입 확률")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    server, endpoint = fake_calendar.start_in_thread(
+        latency=args.latency_ms / 1000, error_rate=args.error_rate, seed=42
+    )
+    workdir = tempfile.mkdtemp(prefix="bench_calendar_")
+    db = Database(f"sqlite:///{workdir}/bench.db")
+    seed_database(db, args.items)
+    foods = db.get_all_foods()
+    print(f"음식 {len(foods)}개, 서버 지연 {args.latency_ms:.0f}ms, 오류 확률 {args.error_rate:.0%}")
+
+    results = []
+
+    # 이전 방식: 매핑 없이 한 건씩 생성
+    serial = GoogleCalendarIntegration(api_endpoint=endpoint)
+    serial.authenticate()
+
+    def serial_sync():
+        return sum(1 for food in foods if serial.create_expiry_event(
+            food.name, food.expiry_date, food.category, food.location, food.quantity, food.unit))
+
+    results.append(run_strategy("serial", server, serial_sync))
+    server.backend.calendars.clear()
+
+    calendar = GoogleCalendarIntegration(db=db, api_endpoint=endpoint)
+    calendar.authenticate()
+
+    def sync():
+        stats = calendar.sync_food_items(db.get_all_foods())
+        return {k: v for k, v in stats.items() if k != "errors"}
+
+    results.append(run_strategy("batched", server, sync))
+    results.append(run_strategy("noop", server, sync))
+
+    for food in foods[: max(1, len(foods) // 20)]:
+        db.update_food(food.id, quantity=food.quantity + 1)
+    for food in foods[-max(1, len(foods) // 100):]:
+        db.delete_food(food.id)
+    results.append(run_strategy("edit-5%", server, sync))
+
+    server.shutdown()
+
+    print(f"\n{'전략':<10}{'시간(초)':>10}{'HTTP 요청':>12}{'API 호출':>10}{'주입 오류':>10}  결과")
+    for r in results:
+        print(f"{r['strategy']:<10}{r['seconds']:>10.2f}{r['http_requests']:>12}"
+              f"{r['api_calls']:>10}{r['injected_errors']:>10}  {r['outcome']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"items": args.items, "latency_ms": args.latency_ms,
+                       "error_rate": args.error_rate, "results": results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+데이터베이스 계층 벤치마크 (조회/수정 + 대시보드 집계, 회귀 감지용 JSON 기록)
+
+사용법:
+    python benchmarks/bench_database.py [--sizes 1000,100000,1000000] [--json out.json]
+    python benchmarks/bench_database.py --sizes 1000,100000 --compare baseline.json [--threshold 1.25]
+
+크기마다 inventory_generator로 같은 시드의 가상 음식 N개를 새 SQLite 파일에 넣고 다음을 측정합니다.
+- get_all_foods / get_expiring_soon / get_expired_foods / get_inventory_stamp
+- dashboard: get_all_foods + summarize_foods (대시보드 첫 화면 데이터 준비)
+- summarize_foods: 이미 읽은 목록의 집계만
+- add_food / update_food / delete_food: 한 건씩 (--writes 회 반복)
+
+조회는 --repeat 회 (단, 한 항목이 --budget 초를 넘으면 그만) 실행한 중앙값을 기록합니다.
+--compare로 이전 결과 JSON을 주면 같은 (크기, 항목)의 중앙값을 비교하여
+--threshold 배 이상 (그리고 --min-delta-ms 이상) 느려진 항목이 있으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import sqlalchemy  # noqa: E402
+
+from database import Database, summarize_foods  # noqa: E402
+from inventory_generator import populate_database  # noqa: E402
+
+
+def timed_runs(func, repeat, budget):
+    """func를 최대 repeat회 실행 (누적 budget초를 넘으면 중단), 실행별 시간(ms)과 마지막 결과"""
+    timings, result = [], None
+    spent = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed * 1000)
+        spent += elapsed
+        if spent >= budget:
+            break
+    return timings, result
+
+
+def record(results, size, op, timings, rows=None):
+    entry = {
+        "items": size,
+        "op": op,
+        "runs": len(timings),
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.mean(timings),
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+    }
+    if rows is not None:
+        entry["rows"] = rows
+    results.append(entry)
+    print(f"  {op:<20}{entry['median_ms']:>12.2f} ms  (runs={entry['runs']}"
+          + (f", rows={rows}" if rows is not None else "") + ")", flush=True)
+
+
+def bench_size(size, workdir, args):
+    """음식 size개 데이터베이스에서 항목별 측정"""
+    results = []
+    db = Database(f"sqlite:///{workdir}/bench_{size}.db")
+
+    print(f"음식 {size}개 생성 중...", flush=True)
+    started = time.perf_counter()
+    populate_database(db, size, seed=args.seed)
+    record(results, size, "populate", [(time.perf_counter() - started) * 1000])
+
+    reads = [
+        ("get_all_foods", db.get_all_foods),
+        ("get_expiring_soon", db.get_expiring_soon),
+        ("get_expired_foods", db.get_expired_foods),
+        ("get_inventory_stamp", db.get_inventory_stamp),
+        ("dashboard", lambda: summarize_foods(db.get_all_foods())),
+    ]
+    for op, func in reads:
+        timings, result = timed_runs(func, args.repeat, args.budget)
+        rows = len(result) if isinstance(result, list) else None
+        record(results, size, op, timings, rows)
+
+    foods = db.get_all_foods()
+    timings, _ = timed_runs(lambda: summarize_foods(foods), args.repeat, args.budget)
+    record(results, size, "summarize_foods", timings)
+    del foods
+
+    rng = random.Random(args.seed)
+    today = date.today()
+
+    def add_one():
+        db.add_food("벤치마크 음식", "기타", today, today + timedelta(days=7), "냉장", 1.0, "개")
+
+    timings, _ = timed_runs(add_one, args.writes, args.budget)
+    record(results, size, "add_food", timings)
+
+    timings, _ = timed_runs(lambda: db.update_food(rng.randint(1, size), quantity=rng.randint(1, 5)),
+                            args.writes, args.budget)
+    record(results, size, "update_food", timings)
+
+    delete_ids = iter(rng.sample(range(1, size + 1), min(args.writes, size)))
+    timings, _ = timed_runs(lambda: db.delete_food(next(delete_ids)), min(args.writes, size), args.budget)
+    record(results, size, "delete_food", timings)
+
+    db.engine.dispose()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "-C", str(REPO_DIR), "rev-parse", "--short", "HEAD"],
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold, min_delta_ms):
+    """이전 결과와 비교하여 느려진 항목 목록 반환"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["items"], r["op"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n{'음식 수':>9}  {'항목':<20}{'이전(ms)':>12}{'현재(ms)':>12}{'비율':>8}")
+    for r in results:
+        previous = baseline.get((r["items"], r["op"]))
+        if previous is None:
+            continue
+        ratio = r["median_ms"] / previous["median_ms"] if previous["median_ms"] else float("inf")
+        regressed = ratio >= threshold and r["median_ms"] - previous["median_ms"] >= min_delta_ms
+        marker = "  ← 느려짐" if regressed else ""
+        print(f"{r['items']:>9}  {r['op']:<20}{previous['median_ms']:>12.2f}{r['median_ms']:>12.2f}"
+              f"{ratio:>8.2f}{marker}")
+        if regressed:
+            regressions.append({**r, "baseline_ms": previous["median_ms"], "ratio": ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터베이스 계층 벤치마크")
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="음식 개수 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터 시드")
+    parser.add_argument("--repeat", type=int, default=5, help="조회 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--writes", type=int, default=50, help="추가/수정/삭제 반복 횟수")
+    parser.add_argument("--budget", type=float, default=30.0, help="항목당 최대 측정 시간 (초)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=1.25, help="느려짐으로 판단할 배율")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="느려짐으로 판단할 최소 차이 (ms)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_database_") as tmp:
+        for size in sizes:
+            results.extend(bench_size(size, tmp, args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "writes": args.writes,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 {args.threshold}배 이상 느려졌습니다.")
+            return 1
+        print("\n느려진 항목이 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+대시보드/음식 목록 렌더링 벤치마크 (렌더링 시간 + 화면 전송량)
+
+사용법:
+    python benchmarks/bench_food_list.py [--sizes 1000,10000,50000] [--baseline <git ref>] [--json out.json]
+
+음식 N개를 넣은 데이터베이스로 AppTest를 실행하여 다음을 측정합니다. (크기/버전마다 새 프로세스)
+- dashboard: 첫 실행 (대시보드 화면)
+- list: 음식 목록 화면으로 전환
+- list_warm: 음식 목록 화면 재실행 (렌더링 캐시 적중)
+- payload: 화면 요소 proto 직렬화 크기 합계 (웹소켓으로 전송되는 델타 크기에 해당)
+- elements: 화면 요소 수
+"""
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from database import Database, CATEGORIES, LOCATIONS, UNITS  # noqa: E402
+
+CHILD_CODE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+
+def walk(node):
+    size, count = 0, 0
+    proto = getattr(node, 'proto', None)
+    if proto is not None and hasattr(proto, 'ByteSize'):
+        size, count = proto.ByteSize(), 1
+    for child in getattr(node, 'children', {}).values():
+        child_size, child_count = walk(child)
+        size += child_size
+        count += child_count
+    return size, count
+
+def timed(at, label, results):
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    assert not at.exception, at.exception
+    payload, elements = walk(at._tree)
+    results[label] = {'seconds': elapsed, 'payload_bytes': payload, 'elements': elements}
+
+results = {}
+at = AppTest.from_file('app.py', default_timeout=1800)
+timed(at, 'dashboard', results)
+at.radio[0].set_value('📝 음식 목록')
+timed(at, 'list', results)
+timed(at, 'list_warm', results)
+print('RESULTS', json.dumps(results))
+"""
+
+
+def seed_database(path, count):
+    """소비기한이 -10~60일에 고르게 퍼진 음식 N개"""
+    today = date.today()
+    db = Database(f"sqlite:///{path}")
+    db.add_foods([
+        {
+            "name": f"음식{i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "purchase_date": today - timedelta(days=5),
+            "expiry_date": today + timedelta(days=i % 71 - 10),
+            "location": LOCATIONS[i % len(LOCATIONS)],
+            "quantity": 1 + i % 5,
+            "unit": UNITS[i % len(UNITS)],
+            "memo": "메모" if i % 7 == 0 else None,
+        }
+        for i in range(count)
+    ])
+    db.engine.dispose()
+
+
+def prepare_tree(ref, target):
+    if ref:
+        archive = subprocess.run(["git", "-C", str(REPO_DIR), "archive", ref],
+                                 check=True, capture_output=True).stdout
+        subprocess.run(["tar", "-x", "-C", str(target)], input=archive, check=True)
+    else:
+        for path in REPO_DIR.glob("*.py"):
+            shutil.copy(path, target)
+
+
+def run_child(workdir):
+    result = subprocess.run([sys.executable, "-c", CHILD_CODE], cwd=workdir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    line = next(line for line in result.stdout.splitlines() if line.startswith("RESULTS"))
+    return json.loads(line[len("RESULTS "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드/음식 목록 렌더링 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="음식 개수 (쉼표 구분)")
+    parser.add_argument("--baseline", help="비교할 git ref (예: HEAD~1)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    versions = ([args.baseline] if args.baseline else []) + [None]
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="bench_food_list_") as tmp:
+        for size in sizes:
+            template = Path(tmp) / f"seed_{size}.db"
+            seed_database(template, size)
+            for ref in versions:
+                workdir = Path(tmp) / f"{ref or 'current'}_{size}".replace("/", "_").replace("~", "_")
+                workdir.mkdir()
+                prepare_tree(ref, workdir)
+                shutil.copy(template, workdir / "fridge.db")
+                label = ref or "current"
+                print(f"측정 중: {label}, 음식 {size}개...", flush=True)
+                for view, result in run_child(workdir).items():
+                    rows.append({"version": label, "items": size, "view": view, **result})
+
+    print(f"\n{'버전':<10}{'음식 수':>8}  {'화면':<10}{'시간(초)':>10}{'전송량(KB)':>12}{'요소 수':>9}")
+    for r in rows:
+        print(f"{r['version']:<10}{r['items']:>8}  {r['view']:<10}{r['seconds']:>10.2f}"
+              f"{r['payload_bytes'] / 1024:>12.0f}{r['elements']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": rows}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+가구 수에 따른 한 가구의 조회 비용 벤치마크 (공유 데이터베이스 vs 가구별 샤드 파일)
+
+사용법:
+    python benchmarks/bench_households.py [--households 1,10,100] [--items 500] [--json out.json]
+
+가구 수마다 가구당 음식 --items개를 넣은 두 가지 배치를 만들고,
+가구 하나(가운데 가구)의 자주 쓰는 조회 시간을 측정합니다.
+- shared: 한 SQLite 파일에 모든 가구 (household_id 열 + (household_id, expiry_date) 인덱스)
+- sharded: HouseholdRouter로 가구마다 SQLite 파일 하나
+
+가구 수가 늘어도 두 배치 모두 한 가구의 조회 시간이 거의 일정해야 합니다.
+(shared는 인덱스 깊이만큼 조금 늘어남, 인덱스가 없다면 가구 수에 비례)
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from database import Database  # noqa: E402
+from household_router import HouseholdRouter  # noqa: E402
+from inventory_generator import populate_database  # noqa: E402
+
+OPS = {
+    "get_all_foods": lambda db: db.get_all_foods(),
+    "get_expiring_soon": lambda db: db.get_expiring_soon(),
+    "get_foods_page": lambda db: db.get_foods_page(limit=50, status="신선"),
+    "get_inventory_stamp": lambda db: db.get_inventory_stamp(),
+}
+
+
+def household_ids(count):
+    return [f"h{index:05d}" for index in range(count)]
+
+
+def median_ms(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure(db, repeat):
+    return {op: median_ms(lambda: func(db), repeat) for op, func in OPS.items()}
+
+
+def bench_shared(workdir, count, items, seed, repeat):
+    base = Database(f"sqlite:///{workdir}/shared_{count}.db")
+    ids = household_ids(count)
+    for index, household_id in enumerate(ids):
+        populate_database(base.for_household(household_id), items, seed=seed + index)
+    result = measure(base.for_household(ids[count // 2]), repeat)
+    base.engine.dispose()
+    return result
+
+
+def bench_sharded(workdir, count, items, seed, repeat):
+    router = HouseholdRouter(shard_dir=Path(workdir) / f"shards_{count}")
+    ids = household_ids(count)
+    for index, household_id in enumerate(ids):
+        populate_database(router.database(household_id), items, seed=seed + index)
+    return measure(router.database(ids[count // 2]), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가구 수에 따른 조회 비용 벤치마크")
+    parser.add_argument("--households", default="1,10,100", help="가구 수 (쉼표 구분)")
+    parser.add_argument("--items", type=int, default=500, help="가구당 음식 개수")
+    parser.add_argument("--repeat", type=int, default=20, help="조회 반복 횟수 (중앙값 기록)")
+    parser.add_argument("--seed", type=int, default=42, help="가상 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.households.split(",")]
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bench_households_") as tmp:
+        for count in counts:
+            for layout, bench in (("shared", bench_shared), ("sharded", bench_sharded)):
+                print(f"측정 중: {layout}, 가구 {count}개 × 음식 {args.items}개...", flush=True)
+                timings = bench(tmp, count, args.items, args.seed, args.repeat)
+                rows.append({"layout": layout, "households": count, "items_per_household": args.items,
+                             **{f"{op}_ms": ms for op, ms in timings.items()}})
+
+    print(f"\n{'배치':<9}{'가구':>7}" + "".join(f"{op:>22}" for op in OPS))
+    for row in rows:
+        print(f"{row['layout']:<9}{row['households']:>7}"
+              + "".join(f"{row[f'{op}_ms']:>19.2f} ms" for op in OPS))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": rows}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+이미지 방향 보정 벤치마크
+
+사용법:
+    python benchmarks/bench_image.py [--corpus <사진 폴더>] [--count 8] [--json out.json]
+
+--corpus를 주지 않으면 12MP(4032x3024) JPEG를 Orientation 1~8로 생성하여 측정합니다.
+비교 대상:
+- legacy: 이전 구현 (rotate(expand=True) + 기본 품질 재인코딩, 2/4/5/7 미지원)
+- normalize: transpose 기반 보정 (캐시 없음)
+- preview: draft 모드 축소 디코딩 (미리보기 크기)
+- upload: 앱 업로드 처리 (process_upload, 분석용 축소 + 썸네일을 한 번의 디코딩으로)
+- cached: ImagePipeline의 업로드 해시 기준 캐시 적중 (Streamlit 재실행 상황)
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image  # noqa: E402
+
+import image_processing  # noqa: E402
+from image_processing import ORIENTATION_TAG, ImagePipeline, normalize_image, process_upload  # noqa: E402
+
+PHONE_SIZE = (4032, 3024)
+
+
+def legacy_fix_image_orientation(image_bytes):
+    """이전 app.py 구현"""
+    image = Image.open(io.BytesIO(image_bytes))
+    exif = image.getexif()
+    if exif:
+        orientation = exif.get(ORIENTATION_TAG)
+        if orientation == 3:
+            image = image.rotate(180, expand=True)
+        elif orientation == 6:
+            image = image.rotate(270, expand=True)
+        elif orientation == 8:
+            image = image.rotate(90, expand=True)
+    output = io.BytesIO()
+    image.save(output, format=image.format or 'JPEG')
+    return output.getvalue()
+
+
+def make_corpus(count):
+    """Orientation 1~8을 순환하는 12MP JPEG 생성"""
+    corpus = []
+    gradient = Image.linear_gradient("L").resize(PHONE_SIZE)
+    for i in range(count):
+        image = Image.merge("RGB", (gradient, gradient.rotate(90, expand=False), gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+        exif = Image.Exif()
+        exif[ORIENTATION_TAG] = i % 8 + 1
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=92, exif=exif.tobytes())
+        corpus.append(output.getvalue())
+    return corpus
+
+
+def load_corpus(directory):
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in (".jpg", ".jpeg"))
+    return [p.read_bytes() for p in paths]
+
+
+def measure(name, func, corpus, repeat):
+    timings = []
+    for _ in range(repeat):
+        for data in corpus:
+            started = time.perf_counter()
+            func(data)
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "name": name,
+        "images": len(corpus) * repeat,
+        "mean_ms": statistics.mean(timings),
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 방향 보정 벤치마크")
+    parser.add_argument("--corpus", help="12MP 휴대폰 사진(JPEG) 폴더")
+    parser.add_argument("--count", type=int, default=8, help="생성할 이미지 수 (--corpus 미지정 시)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    parser.add_argument("--preview-size", type=int, default=640, help="미리보기 최대 변 길이")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else make_corpus(args.count)
+    if not corpus:
+        print("❌ 측정할 JPEG 이미지가 없습니다.")
+        return 1
+    print(f"이미지 {len(corpus)}장, 평균 {sum(map(len, corpus)) / len(corpus) / 1e6:.1f}MB")
+
+    pipeline = ImagePipeline(max_workers=1)
+
+    def cached(data):
+        return next(pipeline.process([data]))
+
+    # 캐시 측정 전에 한 번씩 채워둠 (재실행 상황 재현)
+    image_processing._pipeline_cache.clear()
+    for data in corpus:
+        cached(data)
+
+    results = [
+        measure("legacy", legacy_fix_image_orientation, corpus, args.repeat),
+        measure("normalize", normalize_image, corpus, args.repeat),
+        measure("preview", lambda data: normalize_image(data, max_size=args.preview_size), corpus, args.repeat),
+        measure("upload", process_upload, corpus, args.repeat),
+        measure("cached", cached, corpus, args.repeat),
+    ]
+    pipeline.shutdown()
+
+    print(f"\n{'방식':<12}{'평균(ms)':>12}{'중앙값(ms)':>14}{'최대(ms)':>12}")
+    for r in results:
+        print(f"{r['name']:<12}{r['mean_ms']:>12.1f}{r['median_ms']:>14.1f}{r['max_ms']:>12.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"cpu_count": os.cpu_count(), "images": len(corpus), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+앱 콜드 스타트 벤치마크 (import 시간 분석 + 첫 화면 렌더링까지의 시간)
+
+사용법:
+    python benchmarks/bench_startup.py [--baseline <git ref>] [--runs 5] [--json out.json]
+
+측정 항목 (매번 새 프로세스, 빈 데이터베이스):
+- total: 프로세스 시작부터 첫 렌더링 완료까지 (Streamlit Cloud 콜드 부팅과 유사)
+- first_render: streamlit import 이후 app.py 첫 실행 시간 (AppTest)
+- import 분석: python -X importtime 결과를 최상위 패키지별 self 시간으로 합산
+
+--baseline을 주면 해당 git 커밋의 앱도 같은 방식으로 측정하여 비교합니다.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# 자식 프로세스에서 실행할 코드 (첫 렌더링 시간을 표준 출력으로 전달)
+CHILD_CODE = """
+import time
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+at = AppTest.from_file('app.py', default_timeout=120).run()
+elapsed = time.perf_counter() - started
+assert not at.exception, at.exception
+print('FIRST_RENDER', elapsed)
+"""
+
+
+def export_tree(ref, target):
+    """git 커밋의 파일을 임시 폴더로 추출"""
+    archive = subprocess.run(["git", "-C", str(REPO_DIR), "archive", ref], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", str(target)], input=archive, check=True)
+
+
+def copy_working_tree(target):
+    for path in REPO_DIR.glob("*.py"):
+        shutil.copy(path, target)
+
+
+def child_env():
+    env = dict(os.environ)
+    # 캘린더/AI 설정과 무관하게 같은 조건에서 측정
+    env.pop("GOOGLE_CALENDAR_API_ENDPOINT", None)
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def run_once(workdir, importtime=False):
+    """새 프로세스에서 앱 첫 렌더링 (빈 DB)"""
+    db_path = Path(workdir) / "fridge.db"
+    if db_path.exists():
+        db_path.unlink()
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD_CODE]
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, env=child_env(), capture_output=True, text=True)
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    first_render = next(float(line.split()[1]) for line in result.stdout.splitlines()
+                        if line.startswith("FIRST_RENDER"))
+    return total, first_render, result.stderr
+
+
+def import_breakdown(stderr):
+    """-X importtime 출력을 최상위 패키지별 self 시간(ms)으로 합산"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us) / 1000
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def measure(label, workdir, runs):
+    totals, renders = [], []
+    for _ in range(runs):
+        total, first_render, _ = run_once(workdir)
+        totals.append(total)
+        renders.append(first_render)
+    _, _, stderr = run_once(workdir, importtime=True)
+    return {
+        "label": label,
+        "total_s": statistics.median(totals),
+        "first_render_s": statistics.median(renders),
+        "imports_ms": import_breakdown(stderr),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 콜드 스타트 벤치마크")
+    parser.add_argument("--baseline", help="비교할 git ref (예: HEAD~1)")
+    parser.add_argument("--runs", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=12, help="표시할 패키지 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as tmp:
+        current_dir = Path(tmp) / "current"
+        current_dir.mkdir()
+        copy_working_tree(current_dir)
+        if args.baseline:
+            baseline_dir = Path(tmp) / "baseline"
+            baseline_dir.mkdir()
+            export_tree(args.baseline, baseline_dir)
+            results.append(measure(args.baseline, baseline_dir, args.runs))
+        results.append(measure("current", current_dir, args.runs))
+
+    print(f"\n{'버전':<12}{'전체(초)':>10}{'첫 렌더링(초)':>16}")
+    for r in results:
+        print(f"{r['label']:<12}{r['total_s']:>10.2f}{r['first_render_s']:>16.2f}")
+
+    packages = []
+    for r in results:
+        for name in list(r["imports_ms"])[:args.top]:
+            if name not in packages:
+                packages.append(name)
+    print(f"\n{'패키지 (import self 시간 합계, ms)':<36}" + "".join(f"{r['label']:>12}" for r in results))
+    for name in packages:
+        print(f"{name:<36}" + "".join(f"{r['imports_ms'].get(name, 0):>12.0f}" for r in results))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": args.runs, "results": results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+프로세스 전역 LRU 캐시 (적중률 통계 포함)
+"""
+import threading
+from collections import OrderedDict
+
+# 이름 → LRUCache (성능 패널 등에서 통계를 조회하기 위해 등록)
+CACHES = {}
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시"""
+
+    def __init__(self, name, max_entries=128):
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def get(self, key, default=None):
+        """값 조회 (적중 시 최근 사용으로 이동)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """값 저장 (용량 초과 시 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """캐시에 없으면 compute()로 계산하여 저장"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def values(self):
+        """저장된 값 목록 (최근 사용 순서와 통계는 바꾸지 않음)"""
+        with self._lock:
+            return list(self._data.values())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def all_cache_stats():
+    """등록된 모든 캐시의 통계"""
+    return [cache.stats() for cache in CACHES.values()]
@@ -2,74 +2,296 @@
 구글 캘린더 연동 모듈
 """
 import os
-from datetime import datetime, timedelta
+import hashlib
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
+from urllib.parse import urlparse
+import httplib2
 import pickle
-import streamlit as st
+
+from household_router import default_household
+from tracing import span
 
 # 구글 캘린더 API 스코프
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# OAuth 파일 경로
+TOKEN_PATH = 'token.pickle'
+CREDENTIALS_PATH = 'credentials.json'
+
+# 만료 N분 전에 미리 토큰 갱신 (요청 도중 만료되어 401 후 재시도하는 일을 방지)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# HTTP 요청 타임아웃 (초)
+HTTP_TIMEOUT = 30
+
+# API 주소(None이면 실제 구글 API) → (service, credentials)
+# 디스커버리 문서 파싱과 토큰 로드는 프로세스당 한 번만 수행하고 HTTP 연결도 재사용합니다.
+# httplib2는 스레드 안전하지 않으므로 캘린더 작업은 백그라운드 작업 워커 하나에서만 실행합니다.
+_service_cache = {}
+_service_lock = threading.Lock()
+
+# 이벤트 private extendedProperties에 저장하는 앱 식별자 (목록 조회 필터용)
+# 구글 계정 토큰은 프로세스 전체에서 하나이고 음식 ID는 샤드 파일마다 겹치므로 가구 ID(household_id)도 함께 저장
+APP_ID = 'fridge_agent'
+
+# 태그를 붙이기 전 버전이 만든 이벤트를 찾을 검색어와 설명 문구
+LEGACY_EVENT_QUERY = '냉요'
+LEGACY_EVENT_MARKER = '냉요(냉장고 요정)'
+
+# 동기화 대상 기간 (오늘부터 N일 이내 만료 예정)
+SYNC_WINDOW_DAYS = 30
+
+# 배치 요청 하나에 묶을 최대 요청 수 (Calendar API 권장 한도)
+BATCH_SIZE = 50
+
+# 배치 내 개별 요청 재시도 횟수 (속도 제한/일시 오류)
+MAX_BATCH_ATTEMPTS = 3
+
+
+class SyncCancelled(Exception):
+    """작업 취소로 실행하지 않은 요청에 붙는 오류"""
+
+
+class CalendarError(Exception):
+    """캘린더 인증 실패 (백그라운드 작업 스레드에서는 화면에 표시할 수 없으므로 작업 오류로 기록)"""
+
+
+def select_foods_to_sync(food_items, today=None):
+    """동기화 대상 음식 (오늘부터 SYNC_WINDOW_DAYS일 이내 만료 예정)"""
+    today = today or date.today()
+    last_day = today + timedelta(days=SYNC_WINDOW_DAYS)
+    return [food for food in food_items if today <= food.expiry_date <= last_day]
+
+
+def is_retryable_error(error):
+    """속도 제한 또는 일시적인 서버 오류인지 확인"""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status in (429, 500, 502, 503, 504):
+        return True
+    # 403은 rateLimitExceeded / userRateLimitExceeded일 때만 재시도
+    content = error.content or b''
+    return status == 403 and (b'rateLimitExceeded' in content or b'userRateLimitExceeded' in content)
+
+
+def food_content_hash(food):
+    """캘린더 이벤트 내용에 영향을 주는 음식 필드의 해시"""
+    payload = json.dumps([
+        food.name, food.category, food.location,
+        float(food.quantity or 0), food.unit, food.expiry_date.isoformat()
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _save_token(creds):
+    with open(TOKEN_PATH, 'wb') as token:
+        pickle.dump(creds, token)
+
+
+def _needs_refresh(creds):
+    """토큰이 만료되었거나 곧 만료되는지 확인"""
+    if not creds.refresh_token:
+        return False
+    if not creds.valid:
+        return True
+    return creds.expiry is not None and creds.expiry - datetime.utcnow() < TOKEN_REFRESH_MARGIN
+
+
+def _load_credentials():
+    """
+    저장된 토큰을 읽고 필요하면 갱신 (토큰이 없으면 브라우저 로그인)
+
+    Returns:
+        Credentials: 인증 정보 (credentials.json도 없으면 None)
+    """
+    creds = None
+    if os.path.exists(TOKEN_PATH):
+        with open(TOKEN_PATH, 'rb') as token:
+            creds = pickle.load(token)
+
+    if creds and _needs_refresh(creds):
+        creds.refresh(Request())
+        _save_token(creds)
+    elif not creds or not creds.valid:
+        # credentials.json 파일이 있어야 함
+        if not os.path.exists(CREDENTIALS_PATH):
+            return None
+        flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+        creds = flow.run_local_server(port=0)
+        _save_token(creds)
+
+    return creds
+
+
+class _TracedHttp:
+    """HTTP 요청마다 트레이싱 스팬 기록 (배치 요청은 한 번으로 기록, 나머지 속성은 원래 객체로 위임)"""
+
+    def __init__(self, http):
+        self._http = http
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        with span("calendar.http", "calendar", method=method, path=urlparse(uri).path) as current:
+            response, content = self._http.request(uri, method, *args, **kwargs)
+            if current is not None:
+                current.attrs["status"] = response.status
+            return response, content
+
+
+def get_calendar_service(api_endpoint=None):
+    """
+    프로세스 전역으로 캐시된 캘린더 서비스 반환
+
+    - 서비스는 라이브러리에 포함된 정적 디스커버리 문서로 한 번만 생성
+    - 인증된 HTTP 객체를 공유하여 연결(keep-alive) 재사용
+    - 캐시된 토큰이 곧 만료되면 미리 갱신
+
+    Args:
+        api_endpoint: Calendar API 주소 (가짜 서버 등, None이면 실제 구글 API)
+
+    Returns:
+        Resource: 캘린더 서비스 (인증 정보가 없으면 None)
+    """
+    with _service_lock:
+        cached = _service_cache.get(api_endpoint)
+        if cached is not None:
+            service, creds = cached
+            if creds is not None and _needs_refresh(creds):
+                # AuthorizedHttp는 같은 Credentials 객체를 참조하므로 서비스는 그대로 사용
+                creds.refresh(Request())
+                _save_token(creds)
+            return service
+
+        if api_endpoint:
+            # 로컬 가짜 서버는 인증 없이 접속
+            creds = None
+            service = build(
+                'calendar', 'v3',
+                http=_TracedHttp(httplib2.Http(timeout=HTTP_TIMEOUT)),
+                client_options={'api_endpoint': api_endpoint},
+                static_discovery=True,
+                cache_discovery=False
+            )
+        else:
+            creds = _load_credentials()
+            if creds is None:
+                return None
+            service = build(
+                'calendar', 'v3',
+                http=_TracedHttp(AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))),
+                static_discovery=True,
+                cache_discovery=False
+            )
+
+        _service_cache[api_endpoint] = (service, creds)
+        return service
+
+
+def reset_calendar_service():
+    """캐시된 캘린더 서비스 제거 (토큰 파일 교체 후 또는 측정용)"""
+    with _service_lock:
+        _service_cache.clear()
+
+
 class GoogleCalendarIntegration:
     """구글 캘린더 연동 클래스"""
 
-    def __init__(self):
+    def __init__(self, db=None, api_endpoint=None):
+        """
+        Args:
+            db: Database 인스턴스 (이벤트 매핑 저장용, 없으면 증분 동기화 불가)
+            api_endpoint: Calendar API 주소 (예: 가짜 서버 http://127.0.0.1:8765/calendar/v3/)
+                          기본값은 GOOGLE_CALENDAR_API_ENDPOINT 환경 변수, 없으면 실제 구글 API
+        """
         self.creds = None
         self.service = None
+        self.db = db
+        self.household_id = db.household_id if db is not None else default_household()
+        self.api_endpoint = api_endpoint or os.getenv('GOOGLE_CALENDAR_API_ENDPOINT')
 
     def authenticate(self):
         """
         구글 캘린더 인증
 
         Returns:
-            bool: 인증 성공 여부
+            bool: 인증 성공 시 True
+
+        Raises:
+            CalendarError: 인증 파일이 없거나 인증에 실패한 경우
         """
         try:
-            # 저장된 토큰이 있는지 확인
-            if os.path.exists('token.pickle'):
-                with open('token.pickle', 'rb') as token:
-                    self.creds = pickle.load(token)
-
-            # 토큰이 없거나 유효하지 않으면 새로 로그인
-            if not self.creds or not self.creds.valid:
-                if self.creds and self.creds.expired and self.creds.refresh_token:
-                    self.creds.refresh(Request())
-                else:
-                    # credentials.json 파일이 있어야 함
-                    if not os.path.exists('credentials.json'):
-                        st.error("❌ 구글 캘린더 인증 파일(credentials.json)이 없습니다.")
-                        st.info("""
-                        **구글 캘린더 연동 설정 방법:**
-
-                        1. https://console.cloud.google.com/ 접속
-                        2. 새 프로젝트 생성 (또는 기존 프로젝트 선택)
-                        3. "API 및 서비스" > "사용 설정된 API 및 서비스" > "+ API 및 서비스 사용 설정"
-                        4. "Google Calendar API" 검색 후 사용 설정
-                        5. "사용자 인증 정보" > "사용자 인증 정보 만들기" > "OAuth 클라이언트 ID"
-                        6. 애플리케이션 유형: "데스크톱 앱"
-                        7. 생성된 JSON 파일을 다운로드하여 `credentials.json`으로 저장
-                        """)
-                        return False
-
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        'credentials.json', SCOPES)
-                    self.creds = flow.run_local_server(port=0)
-
-                # 토큰 저장
-                with open('token.pickle', 'wb') as token:
-                    pickle.dump(self.creds, token)
-
-            # 캘린더 서비스 생성
-            self.service = build('calendar', 'v3', credentials=self.creds)
-            return True
-
+            self.service = get_calendar_service(self.api_endpoint)
         except Exception as e:
-            st.error(f"구글 캘린더 인증 오류: {str(e)}")
-            return False
+            raise CalendarError(f"구글 캘린더 인증 오류: {e}") from e
+        if self.service is None:
+            raise CalendarError("구글 캘린더 인증 파일(credentials.json)이 없습니다. "
+                                "GOOGLE_CALENDAR_SETUP.md를 참고하여 설정해주세요.")
+        return True
+
+    def _build_event_body(self, food_name, expiry_date, category="기타", location="냉장", quantity=1, unit="개",
+                          food_id=None):
+        """소비기한 이벤트 본문 생성 (앱 식별자, 가구 ID, 음식 ID를 private extendedProperties에 저장)"""
+        # 이벤트 날짜 (소비기한 당일)
+        event_date = expiry_date.isoformat()
+
+        private_properties = {'app': APP_ID, 'household_id': self.household_id}
+        if food_id is not None:
+            private_properties['food_id'] = str(food_id)
+
+        return {
+            'summary': f'🚨 소비기한: {food_name}',
+            'description': f'''
+냉장고 음식 소비기한 알림
+
+음식: {food_name}
+카테고리: {category}
+보관 위치: {location}
+수량: {quantity} {unit}
+소비기한: {expiry_date.strftime('%Y년 %m월 %d일')}
+
+냉요(냉장고 요정)에서 자동 추가된 일정입니다.
+            '''.strip(),
+            'start': {
+                'date': event_date,
+            },
+            'end': {
+                'date': event_date,
+            },
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'popup', 'minutes': 24 * 60},  # 1일 전
+                    {'method': 'popup', 'minutes': 3 * 24 * 60},  # 3일 전
+                ],
+            },
+            'colorId': '11',  # 빨간색
+            'extendedProperties': {'private': private_properties},
+        }
+
+    def _food_event_body(self, food):
+        """FoodItem으로 이벤트 본문 생성"""
+        return self._build_event_body(
+            food_name=food.name,
+            expiry_date=food.expiry_date,
+            category=food.category,
+            location=food.location,
+            quantity=food.quantity,
+            unit=food.unit,
+            food_id=food.id
+        )
 
     def create_expiry_event(self, food_name, expiry_date, category="기타", location="냉장", quantity=1, unit="개"):
         """
@@ -87,123 +309,368 @@ class GoogleCalendarIntegration:
             dict: 생성된 이벤트 정보
         """
         if not self.service:
-            if not self.authenticate():
-                return None
+            self.authenticate()
 
         try:
-            # 이벤트 날짜 (소비기한 당일)
-            event_date = expiry_date.isoformat()
-
-            # 이벤트 생성
-            event = {
-                'summary': f'🚨 소비기한: {food_name}',
-                'description': f'''
-냉장고 음식 소비기한 알림
-
-음식: {food_name}
-카테고리: {category}
-보관 위치: {location}
-수량: {quantity} {unit}
-소비기한: {expiry_date.strftime('%Y년 %m월 %d일')}
-
-냉요(냉장고 요정)에서 자동 추가된 일정입니다.
-                '''.strip(),
-                'start': {
-                    'date': event_date,
-                },
-                'end': {
-                    'date': event_date,
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'popup', 'minutes': 24 * 60},  # 1일 전
-                        {'method': 'popup', 'minutes': 3 * 24 * 60},  # 3일 전
-                    ],
-                },
-                'colorId': '11',  # 빨간색
-            }
-
+            event = self._build_event_body(food_name, expiry_date, category, location, quantity, unit)
             event = self.service.events().insert(calendarId='primary', body=event).execute()
             return event
 
         except HttpError as error:
-            st.error(f"구글 캘린더 이벤트 생성 오류: {error}")
+            print(f"구글 캘린더 이벤트 생성 오류: {error}")
             return None
 
-    def sync_food_items(self, food_items):
+    def plan_sync(self, food_items, mappings, today=None):
+        """
+        현재 음식 목록과 저장된 이벤트 매핑을 비교하여 동기화 계획 수립
+
+        수정/삭제되지 않은(dirty가 아닌) 매핑은 해시 계산 없이 그대로 둡니다.
+
+        Args:
+            food_items: 캘린더에 있어야 할 음식 리스트
+            mappings: food_id → CalendarEvent
+            today: 기준 날짜
+
+        Returns:
+            dict: create/update/clean/delete/forget 목록과 unchanged 개수
+        """
+        today = today or date.today()
+        desired = {food.id: food for food in food_items}
+        plan = {'create': [], 'update': [], 'clean': [], 'delete': [], 'forget': [], 'unchanged': 0}
+
+        for food_id, food in desired.items():
+            mapping = mappings.get(food_id)
+            if mapping is None:
+                plan['create'].append((food, food_content_hash(food)))
+            elif not mapping.dirty:
+                plan['unchanged'] += 1
+            else:
+                content_hash = food_content_hash(food)
+                if content_hash == mapping.content_hash:
+                    plan['clean'].append((food, mapping, content_hash))
+                else:
+                    plan['update'].append((food, mapping, content_hash))
+
+        for food_id, mapping in mappings.items():
+            if food_id in desired:
+                continue
+            if mapping.expiry_date < today:
+                # 이미 지난 이벤트는 기록으로 남기고 매핑만 정리
+                plan['forget'].append(mapping)
+            else:
+                plan['delete'].append(mapping)
+
+        return plan
+
+    def sync_food_items(self, food_items, progress=None):
         """
-        여러 음식 아이템을 구글 캘린더에 동기화
+        여러 음식 아이템을 구글 캘린더에 증분 동기화
+
+        저장된 이벤트 매핑과 비교하여 새 음식은 생성, 수정된 음식은 패치,
+        목록에서 빠진 음식은 삭제합니다. 요청은 최대 50개씩 배치로 묶어 보내며,
+        변경이 없으면 API를 호출하지 않습니다.
 
         Args:
             food_items: 음식 아이템 리스트
+            progress: 배치마다 호출되는 progress(완료 수, 전체 수) 함수
+                      (True를 반환하면 남은 요청을 보내지 않고 중단)
 
         Returns:
-            tuple: (성공 개수, 실패 개수)
+            dict: created, updated, deleted, unchanged, failed, cancelled 개수와 errors(오류 메시지 리스트)
         """
-        if not self.service:
-            if not self.authenticate():
-                return (0, len(food_items))
-
-        success_count = 0
-        fail_count = 0
-
-        for food in food_items:
-            event = self.create_expiry_event(
-                food_name=food.name,
-                expiry_date=food.expiry_date,
-                category=food.category,
-                location=food.location,
-                quantity=food.quantity,
-                unit=food.unit
-            )
+        mappings = self.db.get_calendar_events() if self.db else {}
+        plan = self.plan_sync(food_items, mappings)
+        stats = {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': plan['unchanged'],
+                 'failed': 0, 'cancelled': 0, 'errors': []}
+
+        # API 호출이 필요 없는 정리 작업
+        saved = [(food, mapping.event_id, content_hash) for food, mapping, content_hash in plan['clean']]
+        stats['unchanged'] += len(saved)
+        if plan['forget'] and self.db:
+            self.db.delete_calendar_events([mapping.food_id for mapping in plan['forget']])
 
-            if event:
-                success_count += 1
+        if not (plan['create'] or plan['update'] or plan['delete']):
+            self._save_mappings(saved)
+            return stats
+
+        if not self.service:
+            try:
+                self.authenticate()
+            except CalendarError:
+                # API 호출 없이 정리한 매핑은 저장한 뒤 작업 오류로 전달
+                self._save_mappings(saved)
+                raise
+
+        events = self.service.events()
+        requests = {}
+        for food, content_hash in plan['create']:
+            requests[('create', food.id)] = (lambda food=food: events.insert(
+                calendarId='primary', body=self._food_event_body(food)))
+        for food, mapping, content_hash in plan['update']:
+            requests[('update', food.id)] = (lambda food=food, mapping=mapping: events.patch(
+                calendarId='primary', eventId=mapping.event_id, body=self._food_event_body(food)))
+        for mapping in plan['delete']:
+            requests[('delete', mapping.food_id)] = (lambda mapping=mapping: events.delete(
+                calendarId='primary', eventId=mapping.event_id))
+
+        results = self._execute_batch(requests, progress=progress)
+
+        # 사용자가 캘린더에서 직접 지운 이벤트는 다시 생성
+        recreate = {}
+        for food, mapping, content_hash in plan['update']:
+            response, error = results[('update', food.id)]
+            if isinstance(error, HttpError) and error.resp.status in (404, 410):
+                recreate[('update', food.id)] = (lambda food=food: events.insert(
+                    calendarId='primary', body=self._food_event_body(food)))
+        if recreate:
+            results.update(self._execute_batch(recreate))
+
+        for food, content_hash in plan['create']:
+            response, error = results[('create', food.id)]
+            if error is None:
+                saved.append((food, response['id'], content_hash))
+                stats['created'] += 1
+            elif isinstance(error, SyncCancelled):
+                stats['cancelled'] += 1
+            else:
+                stats['failed'] += 1
+                stats['errors'].append(f"{food.name} 추가 실패: {error}")
+
+        for food, mapping, content_hash in plan['update']:
+            response, error = results[('update', food.id)]
+            if error is None:
+                saved.append((food, response['id'], content_hash))
+                stats['updated'] += 1
+            elif isinstance(error, SyncCancelled):
+                stats['cancelled'] += 1
+            else:
+                stats['failed'] += 1
+                stats['errors'].append(f"{food.name} 수정 실패: {error}")
+
+        deleted_ids = []
+        for mapping in plan['delete']:
+            response, error = results[('delete', mapping.food_id)]
+            # 이미 지워진 이벤트도 삭제 완료로 처리
+            if error is None or (isinstance(error, HttpError) and error.resp.status in (404, 410)):
+                deleted_ids.append(mapping.food_id)
+                stats['deleted'] += 1
+            elif isinstance(error, SyncCancelled):
+                stats['cancelled'] += 1
             else:
-                fail_count += 1
+                stats['failed'] += 1
+                stats['errors'].append(f"이벤트 삭제 실패: {error}")
 
-        return (success_count, fail_count)
+        self._save_mappings(saved)
+        if deleted_ids and self.db:
+            self.db.delete_calendar_events(deleted_ids)
 
-    def delete_expiry_events(self):
+        return stats
+
+    def _new_batch(self, callback):
+        """배치 요청 객체 생성"""
+        if self.api_endpoint:
+            # 디스커버리 문서의 배치 주소는 항상 구글이므로 직접 지정
+            parsed = urlparse(self.api_endpoint)
+            return BatchHttpRequest(callback=callback, batch_uri=f"{parsed.scheme}://{parsed.netloc}/batch/calendar/v3")
+        return self.service.new_batch_http_request(callback=callback)
+
+    def _execute_batch(self, requests, progress=None):
         """
-        냉요에서 생성한 모든 소비기한 이벤트 삭제
+        요청들을 최대 BATCH_SIZE개씩 배치로 실행 (개별 실패는 속도 제한/일시 오류만 재시도)
+
+        Args:
+            requests: 키 → 요청 생성 함수 (재시도 시 새 요청 객체가 필요하므로 함수로 전달)
+            progress: 배치마다 호출되는 progress(완료 수, 전체 수) 함수 (True 반환 시 중단)
+
+        Returns:
+            dict: 키 → (응답, 오류) — 성공하면 오류가 None, 취소로 보내지 않은 요청은 SyncCancelled
+        """
+        results = {}
+        pending = list(requests.items())
+        total = len(pending)
+
+        for attempt in range(MAX_BATCH_ATTEMPTS):
+            retry = []
+            for start in range(0, len(pending), BATCH_SIZE):
+                if progress and progress(len(results), total):
+                    # 이미 보낸 요청 결과는 유지하고 나머지는 취소 처리
+                    for key, make_request in pending[start:] + retry:
+                        results[key] = (None, SyncCancelled())
+                    return results
+
+                chunk = pending[start:start + BATCH_SIZE]
+                responses = {}
+
+                def callback(request_id, response, exception):
+                    responses[request_id] = (response, exception)
+
+                batch = self._new_batch(callback)
+                for index, (key, make_request) in enumerate(chunk):
+                    batch.add(make_request(), request_id=str(index))
+                try:
+                    batch.execute()
+                except HttpError as error:
+                    # 배치 전체가 실패하면 모든 요청에 같은 오류 적용
+                    for index in range(len(chunk)):
+                        responses[str(index)] = (None, error)
+
+                for index, (key, make_request) in enumerate(chunk):
+                    response, error = responses.get(str(index), (None, None))
+                    if error is not None and is_retryable_error(error) and attempt < MAX_BATCH_ATTEMPTS - 1:
+                        retry.append((key, make_request))
+                    else:
+                        results[key] = (response, error)
+
+            if not retry:
+                break
+            time.sleep(0.5 * 2 ** attempt)
+            pending = retry
+
+        if progress:
+            progress(len(results), total)
+        return results
+
+    def _list_events(self, **params):
+        """이벤트 목록 조회 (nextPageToken을 따라 모든 페이지 조회)"""
+        events = []
+        while True:
+            result = self.service.events().list(calendarId='primary', maxResults=2500, **params).execute()
+            events.extend(result.get('items', []))
+            if not result.get('nextPageToken'):
+                return events
+            params['pageToken'] = result['nextPageToken']
+
+    def _save_mappings(self, saved):
+        """동기화한 이벤트 매핑 일괄 저장"""
+        if self.db and saved:
+            self.db.save_calendar_events([
+                {'food_id': food.id, 'event_id': event_id,
+                 'content_hash': content_hash, 'expiry_date': food.expiry_date}
+                for food, event_id, content_hash in saved
+            ])
+
+    def _list_app_events(self, food_id=None, **params):
+        """
+        이 가구가 냉요에서 생성한 이벤트 조회 (private extendedProperties 필터, 전체 페이지)
+
+        기본 가구는 가구 태그를 붙이기 전에 만든 이벤트(앱 태그만 있는 이벤트)도 포함합니다.
+        """
+        filters = [f'app={APP_ID}']
+        if food_id is not None:
+            filters.append(f'food_id={food_id}')
+        events = self._list_events(privateExtendedProperty=filters + [f'household_id={self.household_id}'], **params)
+        if self.household_id == default_household():
+            events.extend(
+                event for event in self._list_events(privateExtendedProperty=filters, **params)
+                if 'household_id' not in event.get('extendedProperties', {}).get('private', {})
+            )
+        return events
+
+    def _list_legacy_events(self, **params):
+        """태그를 붙이기 전 버전이 만든 이벤트 조회 (앱 태그가 없고 설명에 앱 문구가 있는 이벤트만)"""
+        return [
+            event for event in self._list_events(q=LEGACY_EVENT_QUERY, **params)
+            if 'app' not in event.get('extendedProperties', {}).get('private', {})
+            and LEGACY_EVENT_MARKER in event.get('description', '')
+        ]
+
+    def delete_food_event(self, food_id, today=None):
+        """
+        음식 하나의 소비기한 이벤트 삭제 (음식을 삭제했을 때)
+
+        매핑에 저장된 이벤트 ID로 바로 삭제하고, 매핑이 없으면 food_id 태그로 찾아 삭제합니다.
+        이미 지난 이벤트는 기록으로 남기고 매핑만 정리합니다.
+
+        Args:
+            food_id: 음식 ID
+            today: 기준 날짜
 
         Returns:
             int: 삭제된 이벤트 개수
         """
+        today = today or date.today()
+        mapping = self.db.get_calendar_event(food_id) if self.db else None
+        if mapping is not None and mapping.expiry_date < today:
+            self.db.delete_calendar_events([food_id])
+            return 0
+
         if not self.service:
-            if not self.authenticate():
-                return 0
+            self.authenticate()
 
         try:
-            # 향후 1년간의 이벤트 검색
-            now = datetime.utcnow()
-            time_min = now.isoformat() + 'Z'
-            time_max = (now + timedelta(days=365)).isoformat() + 'Z'
-
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                q='냉요',  # 냉요로 검색
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
-            deleted_count = 0
-
-            for event in events:
-                if '냉요(냉장고 요정)' in event.get('description', ''):
-                    self.service.events().delete(
-                        calendarId='primary',
-                        eventId=event['id']
-                    ).execute()
-                    deleted_count += 1
-
+            if mapping is not None:
+                event_ids = [mapping.event_id]
+            else:
+                event_ids = [event['id'] for event in self._list_app_events(
+                    food_id=food_id, timeMin=datetime.combine(today, datetime.min.time()).isoformat() + 'Z')]
+
+            service_events = self.service.events()
+            results = self._execute_batch({
+                event_id: (lambda event_id=event_id: service_events.delete(
+                    calendarId='primary', eventId=event_id))
+                for event_id in event_ids
+            })
+            deleted_count = sum(
+                1 for response, error in results.values()
+                if error is None or (isinstance(error, HttpError) and error.resp.status in (404, 410))
+            )
+            if self.db and deleted_count == len(results):
+                self.db.delete_calendar_events([food_id])
             return deleted_count
 
         except HttpError as error:
-            st.error(f"구글 캘린더 이벤트 삭제 오류: {error}")
+            print(f"구글 캘린더 이벤트 삭제 오류: {error}")
             return 0
+
+    def delete_expiry_events(self, progress=None):
+        """
+        냉요에서 생성한 모든 소비기한 이벤트 삭제
+
+        이 가구의 앱 식별자 태그(private extendedProperties)로 찾은 이벤트, 매핑에 저장된 이벤트,
+        기본 가구라면 태그를 붙이기 전 버전이 만든 이벤트(태그 없이 설명 문구로 검색)도 삭제합니다.
+
+        Args:
+            progress: 배치마다 호출되는 progress(완료 수, 전체 수) 함수 (True 반환 시 중단)
+
+        Returns:
+            dict: deleted, failed, cancelled 개수와 errors(오류 메시지 리스트)
+
+        Raises:
+            CalendarError: 인증 실패
+            HttpError: 이벤트 목록 조회 실패
+        """
+        if not self.service:
+            self.authenticate()
+
+        # 오늘 이후 이벤트만 삭제 (지난 이벤트는 기록으로 남김)
+        time_min = datetime.utcnow().isoformat() + 'Z'
+        event_ids = {event['id'] for event in self._list_app_events(timeMin=time_min, singleEvents=True)}
+        if self.household_id == default_household():
+            event_ids.update(event['id'] for event in self._list_legacy_events(timeMin=time_min, singleEvents=True))
+        if self.db:
+            today = date.today()
+            event_ids.update(mapping.event_id for mapping in self.db.get_calendar_events().values()
+                             if mapping.expiry_date >= today)
+
+        service_events = self.service.events()
+        results = self._execute_batch({
+            event_id: (lambda event_id=event_id: service_events.delete(
+                calendarId='primary', eventId=event_id))
+            for event_id in sorted(event_ids)
+        }, progress=progress)
+
+        stats = {'deleted': 0, 'failed': 0, 'cancelled': 0, 'errors': []}
+        for response, error in results.values():
+            if error is None or (isinstance(error, HttpError) and error.resp.status in (404, 410)):
+                stats['deleted'] += 1
+            elif isinstance(error, SyncCancelled):
+                stats['cancelled'] += 1
+            else:
+                stats['failed'] += 1
+                stats['errors'].append(f"이벤트 삭제 실패: {error}")
+
+        # 캘린더에서 모두 지웠으면 매핑도 초기화
+        if self.db and stats['failed'] == 0 and stats['cancelled'] == 0:
+            self.db.delete_calendar_events()
+
+        return stats
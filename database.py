@@ -1,18 +1,71 @@
 """
 냉장고 음식 관리 데이터베이스 모델
 """
-from datetime import datetime, date
-from sqlalchemy import create_engine, Column, Integer, String, Date, DateTime, Float
+import json
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from sqlalchemy import (delete, func, insert, inspect, literal, select, text, update, Column, Integer,
+                        String, Date, DateTime, Float, Boolean, Text, Index)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from db_config import create_db_engine
+from tracing import trace_methods
+
 Base = declarative_base()
 
+# 카테고리 및 위치 옵션
+CATEGORIES = [
+    "채소", "과일", "육류/해산물", "계란/두부", "유제품", "쌀/잡곡",
+    "조미료/소스", "반찬/김치", "즉석식품/밀키트", "빵/디저트", "음료", "기타"
+]
+LOCATIONS = ["냉장", "냉동", "실온"]
+UNITS = ["개", "kg", "g", "L", "mL", "팩", "봉지"]
+
+# 가구(테넌트) ID (가구를 지정하지 않은 기존 데이터는 기본 가구)
+DEFAULT_HOUSEHOLD = "default"
+# 특정 가구가 아닌 저장소(데이터베이스 파일) 단위 작업(정기 점검)을 기록하는 가구 ID
+SYSTEM_HOUSEHOLD = "_system"
+HOUSEHOLD_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# 음식 기록(food_history)으로 옮기는 이유 → 화면 표시 이름
+HISTORY_OUTCOMES = {
+    "consumed": "다 먹음",
+    "discarded": "버림",
+    "expired": "만료 정리",
+}
+
+# 한 번에 옮길 음식 수 (IN 목록 길이와 트랜잭션이 쓰기 잠금을 잡는 시간을 제한)
+ARCHIVE_BATCH_SIZE = 500
+
+
+def validate_household_id(household_id):
+    """가구 ID 검사 (영문/숫자/_/-, 64자 이하, 샤드 파일 이름으로도 사용)"""
+    if not isinstance(household_id, str) or not HOUSEHOLD_ID_PATTERN.fullmatch(household_id):
+        raise ValueError(f"잘못된 가구 ID입니다: {household_id!r}")
+    return household_id
+
+
+def household_column():
+    return Column(String(64), nullable=False, default=DEFAULT_HOUSEHOLD, server_default=DEFAULT_HOUSEHOLD)
+
+
 class FoodItem(Base):
     """음식 아이템 모델"""
     __tablename__ = 'food_items'
+    # 모든 조회가 가구로 시작하므로 (가구, 소비기한) 복합 인덱스로 다른 가구의 음식을 읽지 않음
+    # PostgreSQL: 재실행마다 조회하는 get_inventory_stamp를 테이블 접근 없이 인덱스만으로 처리
+    # (만료 전 음식만 담는 부분 인덱스는 CURRENT_DATE가 IMMUTABLE이 아니라 만들 수 없음)
+    __table_args__ = (
+        Index('ix_food_items_household_expiry', 'household_id', 'expiry_date'),
+        Index('ix_food_items_household_stamp', 'household_id',
+              postgresql_include=['id', 'updated_at']).ddl_if(dialect='postgresql'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    household_id = household_column()
     name = Column(String(100), nullable=False)
     category = Column(String(50), nullable=False)  # 채소, 육류, 유제품, 과일, 조미료, 기타
     purchase_date = Column(Date, nullable=False)
@@ -42,13 +95,251 @@ class FoodItem(Base):
         return f"<FoodItem(name='{self.name}', expiry='{self.expiry_date}', status='{self.status()}')>"
 
 
+class FoodHistory(Base):
+    """다 먹었거나 버렸거나 만료 후 정리한 음식 기록 (분석용, food_items에는 현재 재고만 남김)"""
+    __tablename__ = 'food_history'
+    __table_args__ = (
+        Index('ix_food_history_household_closed', 'household_id', 'closed_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    food_id = Column(Integer, nullable=False)  # food_items에서의 ID
+    household_id = household_column()
+    name = Column(String(100), nullable=False)
+    category = Column(String(50), nullable=False)
+    location = Column(String(20), nullable=False)
+    quantity = Column(Float)
+    unit = Column(String(20))
+    purchase_date = Column(Date, nullable=False)
+    expiry_date = Column(Date, nullable=False)
+    outcome = Column(String(20), nullable=False)  # consumed, discarded, expired
+    closed_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<FoodHistory(name='{self.name}', outcome='{self.outcome}', closed_at='{self.closed_at}')>"
+
+
+class CalendarEvent(Base):
+    """음식 ↔ 구글 캘린더 이벤트 매핑 모델"""
+    __tablename__ = 'calendar_events'
+    __table_args__ = (
+        Index('ix_calendar_events_household', 'household_id'),
+    )
+
+    # 음식이 삭제되어도 이벤트를 지울 수 있도록 외래키 없이 ID만 보관
+    food_id = Column(Integer, primary_key=True)
+    household_id = household_column()
+    event_id = Column(String(200), nullable=False)
+    content_hash = Column(String(64), nullable=False)  # 마지막으로 동기화한 내용의 해시
+    expiry_date = Column(Date, nullable=False)
+    dirty = Column(Boolean, nullable=False, default=False)  # 음식 수정/삭제 후 재동기화 필요
+    synced_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"<CalendarEvent(food_id={self.food_id}, event_id='{self.event_id}', dirty={self.dirty})>"
+
+
+class Job(Base):
+    """백그라운드 작업 모델 (페이지 새로고침/서버 재시작 후에도 유지)"""
+    __tablename__ = 'jobs'
+    # PostgreSQL: 끝난 작업이 계속 쌓이므로 대기/실행 중 작업만 담는 부분 인덱스로 작업 확인
+    __table_args__ = (
+        Index('ix_jobs_household_status', 'household_id', 'status', 'created_at'),
+        Index('ix_jobs_active', 'household_id', 'kind', 'created_at',
+              postgresql_where=text("status IN ('queued', 'running')")).ddl_if(dialect='postgresql'),
+    )
+
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    household_id = household_column()
+    kind = Column(String(50), nullable=False)  # calendar_sync, calendar_delete 등
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, done, failed, cancelled
+    payload = Column(Text, nullable=True)  # 작업 인자 (JSON)
+    result = Column(Text, nullable=True)  # 작업 결과 (JSON)
+    error = Column(String(500), nullable=True)
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=False, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    ACTIVE_STATUSES = ('queued', 'running')
+
+    def is_active(self):
+        """대기 중이거나 실행 중인지"""
+        return self.status in self.ACTIVE_STATUSES
+
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else {}
+
+    def get_result(self):
+        return json.loads(self.result) if self.result else None
+
+    def __repr__(self):
+        return f"<Job(id='{self.id}', kind='{self.kind}', status='{self.status}', progress={self.progress_done}/{self.progress_total})>"
+
+
+def summarize_foods(foods, today=None, expiring_days=3, calendar_days=30):
+    """
+    대시보드 집계 (음식 목록을 한 번만 순회)
+
+    Args:
+        foods: 소비기한순으로 정렬된 FoodItem 리스트
+        today: 기준 날짜 (기본값: 오늘)
+        expiring_days: 임박으로 볼 남은 일수
+        calendar_days: 소비기한 캘린더에 표시할 기간 (일)
+
+    Returns:
+        dict: expiring_soon(소비기한순), expired(최근 만료순), calendar(날짜 → 음식 리스트),
+              by_location, by_category(위치/카테고리별 개수)
+    """
+    today = today or date.today()
+    expiring_until = today + timedelta(days=expiring_days)
+    calendar_until = today + timedelta(days=calendar_days)
+
+    expiring_soon, expired = [], []
+    calendar = defaultdict(list)
+    by_location, by_category = defaultdict(int), defaultdict(int)
+    for food in foods:
+        expiry_date = food.expiry_date
+        if expiry_date < today:
+            expired.append(food)
+        else:
+            if expiry_date <= expiring_until:
+                expiring_soon.append(food)
+            if expiry_date <= calendar_until:
+                calendar[expiry_date].append(food)
+        by_location[food.location] += 1
+        by_category[food.category] += 1
+    expired.reverse()
+
+    return {
+        'expiring_soon': expiring_soon,
+        'expired': expired,
+        'calendar': calendar,
+        'by_location': dict(by_location),
+        'by_category': dict(by_category),
+    }
+
+
+def ensure_schema(conn):
+    """
+    테이블/인덱스 생성 및 기존 데이터베이스 갱신 (가구 열이 없던 파일에 열과 인덱스 추가)
+
+    Args:
+        conn: SQLAlchemy Connection (트랜잭션 안에서 호출)
+    """
+    Base.metadata.create_all(conn)
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        columns = {column['name'] for column in inspector.get_columns(table.name)}
+        if 'household_id' not in columns:
+            # 기존 행은 모두 기본 가구로
+            conn.execute(text(
+                f"ALTER TABLE {table.name} ADD COLUMN household_id VARCHAR(64) "
+                f"NOT NULL DEFAULT '{DEFAULT_HOUSEHOLD}'"
+            ))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def apply_food_changes(food, changes):
+    """
+    음식에 수정 사항 반영 (Database/AsyncDatabase 공용, 반영한 값으로 날짜 검사)
+
+    Raises:
+        ValueError: 반영한 소비기한이 구매일보다 이전인 경우 (커밋하지 않아야 함)
+    """
+    for key, value in changes.items():
+        if hasattr(food, key) and key not in ('id', 'household_id'):
+            setattr(food, key, value)
+    if food.purchase_date and food.expiry_date and food.expiry_date < food.purchase_date:
+        raise ValueError("소비기한은 구매일보다 이후여야 합니다.")
+
+
+def food_filters(category=None, location=None, status=None):
+    """
+    음식 목록 필터 조건 (Database/AsyncDatabase 공용)
+
+    Args:
+        category: 카테고리
+        location: 보관 위치
+        status: 상태 (신선/임박/만료, FoodItem.status()와 같은 기준)
+
+    Returns:
+        list: filter()/where()에 넘길 조건 리스트
+    """
+    conditions = []
+    if category:
+        conditions.append(FoodItem.category == category)
+    if location:
+        conditions.append(FoodItem.location == location)
+    if status:
+        today = date.today()
+        soon = today + timedelta(days=3)
+        if status == "만료":
+            conditions.append(FoodItem.expiry_date < today)
+        elif status == "임박":
+            conditions.extend([FoodItem.expiry_date >= today, FoodItem.expiry_date <= soon])
+        else:
+            conditions.append(FoodItem.expiry_date > soon)
+    return conditions
+
+
+def close_food_statements(household_id, food_ids, outcome, closed_at):
+    """
+    음식을 기록 테이블로 옮기는 SQL (Database/AsyncDatabase 공용, 같은 트랜잭션에서 순서대로 실행)
+
+    행을 파이썬으로 불러오지 않고 INSERT ... SELECT 한 번과 DELETE 한 번으로 옮깁니다.
+
+    Args:
+        household_id: 가구 ID
+        food_ids: 옮길 음식 ID 리스트 (ARCHIVE_BATCH_SIZE개 이하)
+        outcome: HISTORY_OUTCOMES의 키
+        closed_at: 기록 시각
+
+    Returns:
+        tuple: (기록 INSERT, 음식 DELETE, 캘린더 매핑 재동기화 표시 UPDATE)
+    """
+    if outcome not in HISTORY_OUTCOMES:
+        raise ValueError(f"알 수 없는 음식 기록 종류입니다: {outcome!r}")
+    scope = (FoodItem.household_id == household_id, FoodItem.id.in_(food_ids))
+    columns = ('name', 'category', 'location', 'quantity', 'unit', 'purchase_date', 'expiry_date')
+    archive = insert(FoodHistory).from_select(
+        ['food_id', 'household_id', *columns, 'outcome', 'closed_at'],
+        select(FoodItem.id, FoodItem.household_id, *(getattr(FoodItem, column) for column in columns),
+               literal(outcome, String), literal(closed_at, DateTime)).where(*scope)
+    )
+    remove = delete(FoodItem).where(*scope)
+    mark_dirty = update(CalendarEvent).where(
+        CalendarEvent.household_id == household_id, CalendarEvent.food_id.in_(food_ids)
+    ).values(dirty=True)
+    return archive, remove, mark_dirty
+
+
+@trace_methods("db", exclude=("get_session", "for_household"))
 class Database:
-    """데이터베이스 관리 클래스"""
+    """데이터베이스 관리 클래스 (한 가구의 데이터만 조회/수정)"""
 
-    def __init__(self, db_url='sqlite:///fridge.db'):
-        self.engine = create_engine(db_url, echo=False)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+    def __init__(self, db_url=None, household_id=DEFAULT_HOUSEHOLD, engine=None):
+        """
+        Args:
+            db_url: 데이터베이스 URL (None이면 db_config.database_url(), engine을 주면 무시)
+            household_id: 가구 ID (모든 조회/추가가 이 가구로 한정됨)
+            engine: 공유할 엔진 (주면 스키마가 이미 준비된 것으로 간주)
+        """
+        self.household_id = validate_household_id(household_id)
+        if engine is None:
+            engine = create_db_engine(db_url)
+            with engine.begin() as conn:
+                ensure_schema(conn)
+        self.engine = engine
+        # 커밋 후에도 반환한 객체의 속성을 그대로 읽을 수 있도록 만료하지 않음
+        # (세션을 닫은 뒤 화면의 음식 목록 캐시를 제자리에서 갱신하는 데 사용)
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def for_household(self, household_id):
+        """같은 엔진(연결 풀)을 쓰는 다른 가구의 Database"""
+        return Database(household_id=household_id, engine=self.engine)
 
     def get_session(self):
         """세션 생성"""
@@ -60,6 +351,7 @@ class Database:
         session = self.get_session()
         try:
             food = FoodItem(
+                household_id=self.household_id,
                 name=name,
                 category=category,
                 purchase_date=purchase_date,
@@ -75,11 +367,83 @@ class Database:
         finally:
             session.close()
 
+    def add_foods(self, items):
+        """
+        음식 여러 개 일괄 추가 (단일 트랜잭션)
+
+        Args:
+            items: add_food 인자와 같은 키를 가진 dict 리스트
+
+        Returns:
+            int: 추가된 음식 개수
+        """
+        if not items:
+            return 0
+
+        session = self.get_session()
+        try:
+            session.add_all([
+                FoodItem(
+                    household_id=self.household_id,
+                    name=item['name'],
+                    category=item['category'],
+                    purchase_date=item['purchase_date'],
+                    expiry_date=item['expiry_date'],
+                    location=item.get('location', '냉장'),
+                    quantity=item.get('quantity', 1.0),
+                    unit=item.get('unit', '개'),
+                    memo=item.get('memo')
+                )
+                for item in items
+            ])
+            session.commit()
+            return len(items)
+        finally:
+            session.close()
+
     def get_all_foods(self):
         """모든 음식 조회"""
         session = self.get_session()
         try:
-            return session.query(FoodItem).order_by(FoodItem.expiry_date).all()
+            return self._foods(session).order_by(FoodItem.expiry_date).all()
+        finally:
+            session.close()
+
+    def get_foods_page(self, limit=50, offset=0, category=None, location=None, status=None):
+        """
+        음식 목록 한 페이지 (소비기한순, 필터 적용)
+
+        Args:
+            limit: 페이지 크기
+            offset: 건너뛸 개수
+            category: 카테고리 필터
+            location: 보관 위치 필터
+            status: 상태 필터 (신선/임박/만료, FoodItem.status()와 같은 기준)
+
+        Returns:
+            tuple: (음식 리스트, 필터에 맞는 전체 개수)
+        """
+        session = self.get_session()
+        try:
+            query = self._foods(session).filter(*food_filters(category, location, status))
+            total = query.count()
+            foods = query.order_by(FoodItem.expiry_date, FoodItem.id).offset(offset).limit(limit).all()
+            return foods, total
+        finally:
+            session.close()
+
+    def get_inventory_stamp(self):
+        """
+        음식 테이블 변경 확인용 값 (전체 조회 없이 다른 세션/CLI의 변경 감지)
+
+        Returns:
+            tuple: (개수, 최대 ID, 최근 수정 시각)
+        """
+        session = self.get_session()
+        try:
+            return tuple(session.query(
+                func.count(FoodItem.id), func.max(FoodItem.id), func.max(FoodItem.updated_at)
+            ).filter(FoodItem.household_id == self.household_id).one())
         finally:
             session.close()
 
@@ -88,8 +452,8 @@ class Database:
         session = self.get_session()
         try:
             today = date.today()
-            target_date = today + __import__('datetime').timedelta(days=days)
-            return session.query(FoodItem).filter(
+            target_date = today + timedelta(days=days)
+            return self._foods(session).filter(
                 FoodItem.expiry_date >= today,
                 FoodItem.expiry_date <= target_date
             ).order_by(FoodItem.expiry_date).all()
@@ -101,21 +465,25 @@ class Database:
         session = self.get_session()
         try:
             today = date.today()
-            return session.query(FoodItem).filter(
+            return self._foods(session).filter(
                 FoodItem.expiry_date < today
             ).order_by(FoodItem.expiry_date.desc()).all()
         finally:
             session.close()
 
     def update_food(self, food_id, **kwargs):
-        """음식 정보 수정"""
+        """
+        음식 정보 수정
+
+        Raises:
+            ValueError: 수정한 소비기한이 구매일보다 이전인 경우 (저장하지 않음)
+        """
         session = self.get_session()
         try:
-            food = session.query(FoodItem).filter(FoodItem.id == food_id).first()
+            food = self._foods(session).filter(FoodItem.id == food_id).first()
             if food:
-                for key, value in kwargs.items():
-                    if hasattr(food, key):
-                        setattr(food, key, value)
+                apply_food_changes(food, kwargs)
+                self._mark_calendar_dirty(session, food_id)
                 session.commit()
                 return food
             return None
@@ -126,19 +494,397 @@ class Database:
         """음식 삭제"""
         session = self.get_session()
         try:
-            food = session.query(FoodItem).filter(FoodItem.id == food_id).first()
+            food = self._foods(session).filter(FoodItem.id == food_id).first()
             if food:
                 session.delete(food)
+                self._mark_calendar_dirty(session, food_id)
                 session.commit()
                 return True
             return False
         finally:
             session.close()
 
+    def close_foods(self, food_ids, outcome):
+        """
+        음식을 재고에서 빼고 기록 테이블로 옮김 (단일 트랜잭션)
+
+        Args:
+            food_ids: 음식 ID 리스트
+            outcome: consumed(다 먹음), discarded(버림), expired(만료 정리)
+
+        Returns:
+            int: 옮긴 음식 개수 (다른 가구이거나 이미 없는 음식은 제외)
+        """
+        food_ids = list(dict.fromkeys(food_ids))
+        if not food_ids:
+            return 0
+
+        closed_at = datetime.now()
+        session = self.get_session()
+        try:
+            moved = 0
+            for start in range(0, len(food_ids), ARCHIVE_BATCH_SIZE):
+                archive, remove, mark_dirty = close_food_statements(
+                    self.household_id, food_ids[start:start + ARCHIVE_BATCH_SIZE], outcome, closed_at
+                )
+                session.execute(archive)
+                moved += session.execute(remove).rowcount
+                session.execute(mark_dirty)
+            session.commit()
+            return moved
+        finally:
+            session.close()
+
+    def archive_expired_foods(self, retention_days=30):
+        """
+        소비기한이 retention_days일 넘게 지난 음식을 기록 테이블로 옮김
+
+        ARCHIVE_BATCH_SIZE개씩 나눠 커밋하여 쌓인 음식이 많아도 다른 쓰기를 오래 막지 않습니다.
+
+        Returns:
+            int: 옮긴 음식 개수
+        """
+        cutoff = date.today() - timedelta(days=retention_days)
+        moved = 0
+        while True:
+            session = self.get_session()
+            try:
+                food_ids = [food_id for food_id, in session.query(FoodItem.id).filter(
+                    FoodItem.household_id == self.household_id, FoodItem.expiry_date < cutoff
+                ).limit(ARCHIVE_BATCH_SIZE)]
+            finally:
+                session.close()
+            if not food_ids:
+                return moved
+            moved += self.close_foods(food_ids, 'expired')
+
+    def archive_all_expired_foods(self, retention_days=30):
+        """
+        이 저장소(같은 엔진)의 모든 가구에서 오래 지난 만료 음식을 기록 테이블로 옮김 (정기 점검용)
+
+        Returns:
+            dict: archived(옮긴 음식 개수), households(정리한 가구 수)
+        """
+        cutoff = date.today() - timedelta(days=retention_days)
+        session = self.get_session()
+        try:
+            household_ids = [household_id for household_id, in session.query(FoodItem.household_id).filter(
+                FoodItem.expiry_date < cutoff
+            ).distinct()]
+        finally:
+            session.close()
+        archived = sum(self.for_household(household_id).archive_expired_foods(retention_days)
+                       for household_id in household_ids)
+        return {'archived': archived, 'households': len(household_ids)}
+
+    def get_food_history(self, limit=50, offset=0, outcome=None):
+        """
+        음식 기록 한 페이지 (최근순)
+
+        Returns:
+            tuple: (FoodHistory 리스트, 전체 개수)
+        """
+        session = self.get_session()
+        try:
+            query = self._history(session)
+            if outcome:
+                query = query.filter(FoodHistory.outcome == outcome)
+            total = query.count()
+            items = query.order_by(FoodHistory.closed_at.desc(), FoodHistory.id.desc()).offset(offset).limit(limit).all()
+            return items, total
+        finally:
+            session.close()
+
+    def get_history_summary(self, since=None):
+        """
+        기록 종류별 개수
+
+        Args:
+            since: 이 시각 이후 기록만 (None이면 전체)
+
+        Returns:
+            dict: outcome → 개수
+        """
+        session = self.get_session()
+        try:
+            query = session.query(FoodHistory.outcome, func.count(FoodHistory.id)).filter(
+                FoodHistory.household_id == self.household_id
+            )
+            if since is not None:
+                query = query.filter(FoodHistory.closed_at >= since)
+            return dict(query.group_by(FoodHistory.outcome).all())
+        finally:
+            session.close()
+
+    def optimize_storage(self, min_free_ratio=0.2):
+        """
+        SQLite 통계 갱신(ANALYZE)과 빈 공간 회수(VACUUM)
+
+        ANALYZE는 표본만 읽도록 analysis_limit를 걸어 항상 실행하고,
+        VACUUM은 파일 전체를 다시 쓰므로 빈 페이지 비율이 min_free_ratio 이상일 때만 실행합니다.
+        PostgreSQL은 autovacuum이 처리하므로 ANALYZE만 실행합니다.
+
+        Returns:
+            dict: analyzed, vacuumed, page_count, freelist_count
+        """
+        # VACUUM은 트랜잭션 안에서 실행할 수 없음
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if self.engine.dialect.name != 'sqlite':
+                conn.execute(text("ANALYZE food_items"))
+                conn.execute(text("ANALYZE food_history"))
+                return {'analyzed': True, 'vacuumed': False}
+
+            conn.execute(text("PRAGMA analysis_limit=1000"))
+            conn.execute(text("ANALYZE"))
+            page_count = conn.execute(text("PRAGMA page_count")).scalar()
+            freelist_count = conn.execute(text("PRAGMA freelist_count")).scalar()
+            vacuumed = bool(page_count) and freelist_count / page_count >= min_free_ratio
+            if vacuumed:
+                conn.execute(text("VACUUM"))
+                page_count = conn.execute(text("PRAGMA page_count")).scalar()
+                freelist_count = conn.execute(text("PRAGMA freelist_count")).scalar()
+            return {'analyzed': True, 'vacuumed': vacuumed,
+                    'page_count': page_count, 'freelist_count': freelist_count}
+
     def get_food_by_id(self, food_id):
         """ID로 음식 조회"""
         session = self.get_session()
         try:
-            return session.query(FoodItem).filter(FoodItem.id == food_id).first()
+            return self._foods(session).filter(FoodItem.id == food_id).first()
+        finally:
+            session.close()
+
+    def _foods(self, session):
+        """이 가구의 음식 쿼리"""
+        return session.query(FoodItem).filter(FoodItem.household_id == self.household_id)
+
+    def _history(self, session):
+        """이 가구의 음식 기록 쿼리"""
+        return session.query(FoodHistory).filter(FoodHistory.household_id == self.household_id)
+
+    def _calendar_events(self, session):
+        """이 가구의 캘린더 매핑 쿼리"""
+        return session.query(CalendarEvent).filter(CalendarEvent.household_id == self.household_id)
+
+    def _jobs(self, session):
+        """이 가구의 작업 쿼리"""
+        return session.query(Job).filter(Job.household_id == self.household_id)
+
+    def _mark_calendar_dirty(self, session, food_id):
+        """음식이 수정/삭제되면 캘린더 매핑을 재동기화 대상으로 표시"""
+        self._calendar_events(session).filter(
+            CalendarEvent.food_id == food_id
+        ).update({CalendarEvent.dirty: True}, synchronize_session=False)
+
+    def get_calendar_events(self):
+        """캘린더 이벤트 매핑 전체 조회 (food_id → CalendarEvent)"""
+        session = self.get_session()
+        try:
+            return {event.food_id: event for event in self._calendar_events(session).all()}
+        finally:
+            session.close()
+
+    def get_calendar_event(self, food_id):
+        """음식 하나의 캘린더 이벤트 매핑 조회"""
+        session = self.get_session()
+        try:
+            return self._calendar_events(session).filter(CalendarEvent.food_id == food_id).first()
+        finally:
+            session.close()
+
+    def save_calendar_events(self, entries):
+        """
+        캘린더 이벤트 매핑 일괄 저장 (동기화 완료 상태로)
+
+        Args:
+            entries: food_id, event_id, content_hash, expiry_date 키를 가진 dict 리스트
+        """
+        if not entries:
+            return
+        session = self.get_session()
+        try:
+            existing = {
+                event.food_id: event for event in self._calendar_events(session).filter(
+                    CalendarEvent.food_id.in_([entry['food_id'] for entry in entries])
+                )
+            }
+            for entry in entries:
+                event = existing.get(entry['food_id'])
+                if event is None:
+                    event = CalendarEvent(food_id=entry['food_id'], household_id=self.household_id)
+                    session.add(event)
+                event.event_id = entry['event_id']
+                event.content_hash = entry['content_hash']
+                event.expiry_date = entry['expiry_date']
+                event.dirty = False
+            session.commit()
+        finally:
+            session.close()
+
+    def delete_calendar_events(self, food_ids=None):
+        """
+        캘린더 이벤트 매핑 삭제
+
+        Args:
+            food_ids: 삭제할 음식 ID 리스트 (None이면 전체 삭제)
+
+        Returns:
+            int: 삭제된 매핑 개수
+        """
+        session = self.get_session()
+        try:
+            query = self._calendar_events(session)
+            if food_ids is not None:
+                query = query.filter(CalendarEvent.food_id.in_(list(food_ids)))
+            count = query.delete(synchronize_session=False)
+            session.commit()
+            return count
+        finally:
+            session.close()
+
+    def create_job(self, kind, payload=None):
+        """
+        백그라운드 작업 등록 (같은 종류/인자의 작업이 대기/실행 중이면 그 작업을 반환)
+
+        Args:
+            kind: 작업 종류
+            payload: 작업 인자 (JSON 직렬화 가능한 dict)
+
+        Returns:
+            Job: 등록된(또는 진행 중인) 작업
+        """
+        payload_json = json.dumps(payload or {}, ensure_ascii=False, sort_keys=True)
+        session = self.get_session()
+        try:
+            job = self._jobs(session).filter(
+                Job.kind == kind, Job.payload == payload_json, Job.status.in_(Job.ACTIVE_STATUSES)
+            ).first()
+            if job is None:
+                job = Job(household_id=self.household_id, kind=kind, payload=payload_json)
+                session.add(job)
+                session.commit()
+            return job
+        finally:
+            session.close()
+
+    def get_job(self, job_id):
+        """ID로 작업 조회"""
+        session = self.get_session()
+        try:
+            return self._jobs(session).filter(Job.id == job_id).first()
+        finally:
+            session.close()
+
+    def get_recent_jobs(self, kinds=None, limit=5):
+        """최근 작업 조회 (최신순)"""
+        session = self.get_session()
+        try:
+            query = self._jobs(session)
+            if kinds:
+                query = query.filter(Job.kind.in_(list(kinds)))
+            return query.order_by(Job.created_at.desc()).limit(limit).all()
+        finally:
+            session.close()
+
+    def claim_next_job(self, kinds, households=None, any_household=False):
+        """
+        가장 오래된 대기 작업을 실행 중으로 변경하여 반환
+
+        대기 상태일 때만 바꾸므로 여러 워커가 같은 작업을 가져가지 않습니다.
+
+        Args:
+            kinds: 처리할 수 있는 작업 종류
+            households: 작업을 가져올 가구 ID 목록 (기본값: 이 가구)
+            any_household: True면 이 저장소의 모든 가구 작업 (프로세스 전체 워커용)
+
+        Returns:
+            Job: 실행할 작업 (없거나 다른 워커가 먼저 가져갔으면 None)
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Job).filter(Job.status == 'queued', Job.kind.in_(list(kinds)))
+            if not any_household:
+                query = query.filter(Job.household_id.in_(list(households or [self.household_id])))
+            job = query.order_by(Job.created_at).first()
+            if job is None:
+                return None
+            status = 'cancelled' if job.cancel_requested else 'running'
+            claimed = session.query(Job).filter(Job.id == job.id, Job.status == 'queued').update(
+                {Job.status: status}, synchronize_session=False
+            )
+            session.commit()
+            if not claimed or job.cancel_requested:
+                return None
+            job.status = status
+            return job
+        finally:
+            session.close()
+
+    def update_job_progress(self, job_id, done, total):
+        """
+        작업 진행 상황 기록
+
+        Returns:
+            bool: 취소 요청 여부
+        """
+        session = self.get_session()
+        try:
+            job = self._jobs(session).filter(Job.id == job_id).first()
+            if job is None:
+                return True
+            job.progress_done = done
+            job.progress_total = total
+            session.commit()
+            return job.cancel_requested
+        finally:
+            session.close()
+
+    def finish_job(self, job_id, status, result=None, error=None):
+        """
+        작업 종료 상태 기록 (done, failed, cancelled)
+
+        이미 끝난 작업은 바꾸지 않습니다. (먼저 기록된 종료 상태를 덮어쓰지 않도록)
+
+        Returns:
+            Job: 기록한 작업 (없거나 이미 끝났으면 None)
+        """
+        session = self.get_session()
+        try:
+            job = self._jobs(session).filter(Job.id == job_id).first()
+            if job is None or not job.is_active():
+                return None
+            job.status = status
+            job.result = json.dumps(result, ensure_ascii=False) if result is not None else None
+            job.error = error[:500] if error else None
+            session.commit()
+            return job
+        finally:
+            session.close()
+
+    def request_job_cancel(self, job_id):
+        """작업 취소 요청 (대기 중이면 즉시 취소, 실행 중이면 다음 확인 시점에 중단)"""
+        session = self.get_session()
+        try:
+            job = self._jobs(session).filter(Job.id == job_id).first()
+            if job is None or not job.is_active():
+                return False
+            job.cancel_requested = True
+            if job.status == 'queued':
+                job.status = 'cancelled'
+            session.commit()
+            return True
+        finally:
+            session.close()
+
+    def requeue_interrupted_jobs(self, any_household=False):
+        """서버 재시작으로 중단된 실행 중 작업을 다시 대기열로 (any_household면 이 저장소의 모든 가구)"""
+        session = self.get_session()
+        try:
+            query = session.query(Job) if any_household else self._jobs(session)
+            count = query.filter(Job.status == 'running').update(
+                {Job.status: 'queued'}, synchronize_session=False
+            )
+            session.commit()
+            return count
         finally:
             session.close()
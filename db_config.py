@@ -0,0 +1,135 @@
+"""
+데이터베이스 백엔드 설정 (SQLite / PostgreSQL)
+
+연결 URL과 연결 풀 설정은 환경 변수 또는 Streamlit secrets(앱 실행 시)에서 읽습니다.
+환경 변수가 secrets보다 우선합니다.
+
+    FRIDGE_DB_URL (또는 DATABASE_URL)    sqlite:///fridge.db, postgresql://user:pw@host:5432/db
+    FRIDGE_DB_POOL_SIZE=5                상시 유지할 연결 수 (PostgreSQL)
+    FRIDGE_DB_MAX_OVERFLOW=10            pool_size를 넘어 잠시 더 열 수 있는 연결 수
+    FRIDGE_DB_POOL_TIMEOUT=30            연결을 기다리는 최대 시간 (초)
+    FRIDGE_DB_POOL_RECYCLE=1800          이 시간(초)보다 오래된 연결은 다시 연결 (서버/프록시 유휴 종료 대비)
+    FRIDGE_DB_STATEMENT_CACHE=500        SQLAlchemy 컴파일된 SQL 캐시 크기 (asyncpg는 서버 준비 문 캐시 크기에도 사용)
+
+SQLite는 파일 데이터베이스에 WAL 모드와 busy_timeout을 설정하여
+읽기와 쓰기가 서로 막지 않고, 동시 쓰기는 잠금 오류 대신 기다리도록 합니다.
+"""
+import os
+import sys
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+DEFAULT_DB_URL = 'sqlite:///fridge.db'
+
+# 설정 이름 → 기본값
+POOL_DEFAULTS = {
+    'FRIDGE_DB_POOL_SIZE': 5,
+    'FRIDGE_DB_MAX_OVERFLOW': 10,
+    'FRIDGE_DB_POOL_TIMEOUT': 30,
+    'FRIDGE_DB_POOL_RECYCLE': 1800,
+    'FRIDGE_DB_STATEMENT_CACHE': 500,
+}
+
+# SQLite 잠금 대기 시간 (ms)
+SQLITE_BUSY_TIMEOUT_MS = 30000
+
+
+def get_setting(name, default=None):
+    """설정값 (환경 변수 → Streamlit secrets → 기본값)"""
+    value = os.getenv(name)
+    if value:
+        return value
+    # 앱(Streamlit) 안에서만 secrets 확인 (API 서버/CLI에서 streamlit을 불러오지 않도록)
+    if 'streamlit' in sys.modules:
+        try:
+            value = sys.modules['streamlit'].secrets.get(name)
+        except Exception:
+            value = None  # secrets.toml 없음
+        if value:
+            return str(value)
+    return default
+
+
+def database_url():
+    """
+    데이터베이스 URL (FRIDGE_DB_URL → DATABASE_URL → sqlite:///fridge.db)
+
+    Supabase/Heroku 형식의 postgres:// 는 postgresql:// 로 바꿉니다.
+    """
+    url = get_setting('FRIDGE_DB_URL') or get_setting('DATABASE_URL') or DEFAULT_DB_URL
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite_file(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def engine_options(url, pooled=True):
+    """
+    백엔드별 create_engine 인자
+
+    Args:
+        url: 데이터베이스 URL
+        pooled: 연결 풀 설정 포함 여부 (NullPool을 쓸 때는 False)
+    """
+    backend = make_url(url).get_backend_name()
+    options = {
+        'echo': False,
+        'query_cache_size': int(get_setting('FRIDGE_DB_STATEMENT_CACHE', POOL_DEFAULTS['FRIDGE_DB_STATEMENT_CACHE'])),
+    }
+    if backend == 'postgresql':
+        if pooled:
+            options.update(
+                pool_size=int(get_setting('FRIDGE_DB_POOL_SIZE', POOL_DEFAULTS['FRIDGE_DB_POOL_SIZE'])),
+                max_overflow=int(get_setting('FRIDGE_DB_MAX_OVERFLOW', POOL_DEFAULTS['FRIDGE_DB_MAX_OVERFLOW'])),
+                pool_timeout=float(get_setting('FRIDGE_DB_POOL_TIMEOUT', POOL_DEFAULTS['FRIDGE_DB_POOL_TIMEOUT'])),
+                pool_recycle=int(get_setting('FRIDGE_DB_POOL_RECYCLE', POOL_DEFAULTS['FRIDGE_DB_POOL_RECYCLE'])),
+                # 끊긴 연결(서버 재시작, 유휴 종료)을 꺼내기 전에 확인
+                pool_pre_ping=True,
+                # 최근 쓴 연결부터 재사용하여 한가할 때 남는 연결이 유휴 종료되도록
+                pool_use_lifo=True,
+            )
+    return options
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine):
+    """엔진 연결 이벤트 등록 (SQLite 파일이면 WAL/busy_timeout), engine 반환"""
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    if is_sqlite_file(sync_engine.url):
+        event.listen(sync_engine, 'connect', _sqlite_pragmas)
+    return engine
+
+
+def create_db_engine(url=None, **overrides):
+    """설정을 적용한 동기 엔진 (url이 없으면 database_url())"""
+    url = url or database_url()
+    pooled = 'poolclass' not in overrides
+    return configure_engine(create_engine(url, **{**engine_options(url, pooled), **overrides}))
+
+
+def create_async_db_engine(url=None, **overrides):
+    """설정을 적용한 비동기 엔진 (sqlite → aiosqlite, postgresql → asyncpg)"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from async_database import async_url
+
+    url = async_url(url or database_url())
+    pooled = 'poolclass' not in overrides
+    options = engine_options(url, pooled)
+    if url.get_backend_name() == 'postgresql':
+        # asyncpg 서버 준비 문(prepared statement) 캐시
+        options['connect_args'] = {'prepared_statement_cache_size': options['query_cache_size']}
+    return configure_engine(create_async_engine(url, **{**options, **overrides}))
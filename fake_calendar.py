@@ -0,0 +1,348 @@
+"""
+로컬 가짜 구글 캘린더 서버 (오프라인 동기화 테스트/벤치마크용)
+
+Calendar API v3 중 이 앱이 사용하는 부분만 구현합니다.
+- POST   /calendar/v3/calendars/{calendarId}/events             (insert)
+- GET    /calendar/v3/calendars/{calendarId}/events             (list: q, timeMin, timeMax, privateExtendedProperty,
+                                                                 maxResults, pageToken)
+- GET    /calendar/v3/calendars/{calendarId}/events/{eventId}   (get)
+- PATCH  /calendar/v3/calendars/{calendarId}/events/{eventId}   (patch)
+- DELETE /calendar/v3/calendars/{calendarId}/events/{eventId}   (delete)
+- POST   /batch/calendar/v3                                      (multipart/mixed 배치)
+
+사용법:
+    python fake_calendar.py --port 8765 --latency-ms 30 --error-rate 0.02
+    GOOGLE_CALENDAR_API_ENDPOINT=http://127.0.0.1:8765/calendar/v3/ streamlit run app.py
+"""
+import argparse
+import email
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+API_PREFIX = "/calendar/v3/calendars/"
+BATCH_PATH = "/batch/calendar/v3"
+DEFAULT_PAGE_SIZE = 250
+
+# 여러 번 지정할 수 있는 쿼리 파라미터 (값 리스트로 전달)
+REPEATED_PARAMS = ("privateExtendedProperty",)
+
+
+class FakeCalendarBackend:
+    """이벤트 저장소와 API 동작 (HTTP와 무관한 부분)"""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=None):
+        """
+        Args:
+            latency: HTTP 요청마다 추가할 지연 시간 (초)
+            error_rate: 개별 API 호출이 429/403 속도 제한 오류를 낼 확률 (0~1)
+            seed: 오류 주입 난수 시드
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.calendars = {}
+        self.lock = threading.Lock()
+        self.stats = {"http_requests": 0, "batch_requests": 0, "api_calls": 0, "injected_errors": 0}
+
+    def reset_stats(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _events(self, calendar_id):
+        return self.calendars.setdefault(calendar_id, {})
+
+    def _maybe_fail(self):
+        """설정된 확률로 속도 제한 오류 주입"""
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            if self.random.random() < 0.5:
+                return 429, _error_body(429, "rateLimitExceeded", "Rate Limit Exceeded")
+            return 403, _error_body(403, "userRateLimitExceeded", "User Rate Limit Exceeded")
+        return None
+
+    def handle(self, method, path, query, body):
+        """
+        API 호출 하나 처리
+
+        Returns:
+            tuple: (HTTP 상태 코드, 응답 dict 또는 None)
+        """
+        with self.lock:
+            self.stats["api_calls"] += 1
+            failure = self._maybe_fail()
+            if failure:
+                return failure
+
+            if not path.startswith(API_PREFIX):
+                return 404, _error_body(404, "notFound", "Not Found")
+            parts = [unquote(p) for p in path[len(API_PREFIX):].strip("/").split("/")]
+            if len(parts) < 2 or parts[1] != "events":
+                return 404, _error_body(404, "notFound", "Not Found")
+
+            events = self._events(parts[0])
+            event_id = parts[2] if len(parts) > 2 else None
+
+            if event_id is None and method == "POST":
+                event = dict(body or {})
+                event["id"] = uuid.uuid4().hex
+                event["status"] = "confirmed"
+                event["updated"] = _now()
+                events[event["id"]] = event
+                return 200, event
+
+            if event_id is None and method == "GET":
+                return 200, self._list(events, query)
+
+            event = events.get(event_id)
+            if event is None:
+                return 404, _error_body(404, "notFound", "Not Found")
+            if event.get("status") == "cancelled":
+                return 410, _error_body(410, "deleted", "Resource has been deleted")
+
+            if method == "GET":
+                return 200, event
+            if method in ("PATCH", "PUT"):
+                if method == "PUT":
+                    event = {"id": event_id, "status": "confirmed"}
+                event.update(body or {})
+                event["updated"] = _now()
+                events[event_id] = event
+                return 200, event
+            if method == "DELETE":
+                event["status"] = "cancelled"
+                return 204, None
+
+            return 405, _error_body(405, "methodNotAllowed", "Method Not Allowed")
+
+    def _list(self, events, query):
+        """events.list (삭제된 이벤트 제외, 시작일 순)"""
+        time_min = _parse_time(query.get("timeMin"))
+        time_max = _parse_time(query.get("timeMax"))
+        text = query.get("q")
+        private_filters = [f.split("=", 1) for f in query.get("privateExtendedProperty", [])]
+
+        matched = []
+        for event in events.values():
+            if event.get("status") == "cancelled":
+                continue
+            start = _event_start(event)
+            if time_min and start and start < time_min:
+                continue
+            if time_max and start and start >= time_max:
+                continue
+            if text and text not in event.get("summary", "") and text not in event.get("description", ""):
+                continue
+            private = event.get("extendedProperties", {}).get("private", {})
+            if any(private.get(key) != value for key, value in private_filters):
+                continue
+            matched.append(event)
+        matched.sort(key=lambda e: (_event_start(e) or "", e["id"]))
+
+        page_size = min(int(query.get("maxResults", DEFAULT_PAGE_SIZE)), 2500)
+        offset = int(query.get("pageToken") or 0)
+        page = matched[offset:offset + page_size]
+        result = {"kind": "calendar#events", "items": page}
+        if offset + page_size < len(matched):
+            result["nextPageToken"] = str(offset + page_size)
+        return result
+
+
+def _now():
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def _parse_time(value):
+    """RFC3339 시각을 비교용 'YYYY-MM-DDTHH:MM:SS' 문자열로"""
+    if not value:
+        return None
+    return value.replace("Z", "")[:19]
+
+
+def _event_start(event):
+    start = event.get("start", {})
+    if "dateTime" in start:
+        return start["dateTime"].replace("Z", "")[:19]
+    if "date" in start:
+        return start["date"] + "T00:00:00"
+    return None
+
+
+def _error_body(status, reason, message):
+    return {"error": {"code": status, "message": message,
+                      "errors": [{"domain": "usageLimits" if status in (403, 429) else "global",
+                                  "reason": reason, "message": message}]}}
+
+
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+               405: "Method Not Allowed", 410: "Gone", 429: "Too Many Requests"}
+
+
+def _parse_query(query_string):
+    """쿼리 문자열 파싱 (REPEATED_PARAMS만 리스트, 나머지는 첫 값)"""
+    return {k: v if k in REPEATED_PARAMS else v[0] for k, v in parse_qs(query_string).items()}
+
+
+def _parse_inner_request(payload):
+    """배치 파트 안의 HTTP 요청 파싱 (method, path, query, body)"""
+    if isinstance(payload, bytes):
+        payload = payload.decode("utf-8")
+    payload = payload.replace("\r\n", "\n")
+    request_line, _, rest = payload.partition("\n")
+    method, target, _ = request_line.split(" ", 2)
+    _, _, body = rest.partition("\n\n")
+    parsed = urlparse(target)
+    query = _parse_query(parsed.query)
+    return method, parsed.path, query, json.loads(body) if body.strip() else None
+
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    """가짜 캘린더 HTTP 핸들러"""
+
+    protocol_version = "HTTP/1.1"
+    # keep-alive 연결에서 헤더/본문 분할 전송 시 Nagle + delayed ACK로 40ms씩 지연되는 것 방지
+    disable_nagle_algorithm = True
+    backend = None  # make_server에서 설정
+
+    def log_message(self, format, *args):
+        pass  # 벤치마크 출력이 지저분해지지 않도록 로그 생략
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status, payload, content_type="application/json; charset=UTF-8"):
+        if isinstance(payload, (dict, list)):
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        else:
+            data = payload or b""
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _dispatch(self, method):
+        backend = self.backend
+        with backend.lock:
+            backend.stats["http_requests"] += 1
+        if backend.latency:
+            time.sleep(backend.latency)
+
+        parsed = urlparse(self.path)
+        body = self._read_body()
+
+        if parsed.path == BATCH_PATH and method == "POST":
+            self._handle_batch(body)
+            return
+
+        query = _parse_query(parsed.query)
+        status, payload = backend.handle(method, parsed.path, query, json.loads(body) if body else None)
+        self._send(status, payload)
+
+    def _handle_batch(self, body):
+        """multipart/mixed 배치 요청 처리"""
+        with self.backend.lock:
+            self.backend.stats["batch_requests"] += 1
+
+        content_type = self.headers.get("Content-Type", "")
+        message = email.message_from_bytes(
+            b"Content-Type: " + content_type.encode("utf-8") + b"\r\n\r\n" + body
+        )
+        if not message.is_multipart():
+            self._send(400, _error_body(400, "badRequest", "Batch body must be multipart/mixed"))
+            return
+
+        boundary = "batch_" + uuid.uuid4().hex
+        chunks = []
+        for part in message.get_payload():
+            content_id = part.get("Content-ID", "")
+            method, path, query, request_body = _parse_inner_request(part.get_payload(decode=True))
+            status, payload = self.backend.handle(method, path, query, request_body)
+
+            inner_body = json.dumps(payload, ensure_ascii=False) if payload is not None else ""
+            inner = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            if inner_body:
+                inner += "Content-Type: application/json; charset=UTF-8\r\n"
+            inner += f"Content-Length: {len(inner_body.encode('utf-8'))}\r\n\r\n{inner_body}"
+
+            response_id = f"<response-{content_id.strip('<>')}>"
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: {response_id}\r\n\r\n{inner}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        self._send(200, "".join(chunks).encode("utf-8"), content_type=f"multipart/mixed; boundary={boundary}")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def make_server(host="127.0.0.1", port=0, latency=0.0, error_rate=0.0, seed=None):
+    """
+    가짜 캘린더 서버 생성 (serve_forever는 호출하지 않음)
+
+    Returns:
+        ThreadingHTTPServer: server.backend로 저장소/통계 접근
+    """
+    backend = FakeCalendarBackend(latency=latency, error_rate=error_rate, seed=seed)
+    handler = type("BoundFakeCalendarHandler", (FakeCalendarHandler,), {"backend": backend})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.backend = backend
+    return server
+
+
+def start_in_thread(**kwargs):
+    """
+    백그라운드 스레드에서 서버 시작 (테스트/벤치마크용)
+
+    Returns:
+        tuple: (server, api_endpoint)
+    """
+    server = make_server(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/calendar/v3/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 가짜 구글 캘린더 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="HTTP 요청마다 추가할 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0, help="429/403 오류 주입 확률 (0~1)")
+    parser.add_argument("--seed", type=int, help="오류 주입 난수 시드")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency_ms / 1000, args.error_rate, args.seed)
+    print(f"🗓️ 가짜 캘린더 서버: http://{args.host}:{args.port}/calendar/v3/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
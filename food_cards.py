@@ -0,0 +1,175 @@
+"""
+음식 카드/목록 HTML 렌더링
+
+Streamlit은 재실행마다 화면 전체를 다시 그리므로, 변경되지 않은 음식은
+(음식 ID, 수정 시각, 기준 날짜) 기준으로 캐시된 마크업을 재사용합니다.
+"""
+from datetime import date
+from html import escape
+
+from cache_utils import LRUCache
+
+# 상태별 색상
+STATUS_COLORS = {
+    "신선": "🟢",
+    "임박": "🟡",
+    "만료": "🔴"
+}
+
+# 보관 위치별 아이콘 및 색상
+LOCATION_ICONS = {
+    "냉장": "❄️",
+    "냉동": "🧊",
+    "실온": "🌡️"
+}
+
+LOCATION_COLORS = {
+    "냉장": "#E3F2FD",  # 연한 파랑
+    "냉동": "#B3E5FC",  # 진한 파랑
+    "실온": "#FFF9C4"   # 연한 노랑
+}
+
+# 카테고리별 아이콘 및 색상
+CATEGORY_ICONS = {
+    "채소": "🥬",
+    "과일": "🍎",
+    "육류/해산물": "🥩",
+    "계란/두부": "🥚",
+    "유제품": "🥛",
+    "쌀/잡곡": "🌾",
+    "조미료/소스": "🧂",
+    "반찬/김치": "🥘",
+    "즉석식품/밀키트": "🍱",
+    "빵/디저트": "🍰",
+    "음료": "🥤",
+    "기타": "📦"
+}
+
+CATEGORY_COLORS = {
+    "채소": "#C8E6C9",      # 연한 초록
+    "과일": "#FFCCBC",      # 연한 주황
+    "육류/해산물": "#D7CCC8",  # 연한 갈색
+    "계란/두부": "#FFF9C4",    # 연한 노랑
+    "유제품": "#E1F5FE",     # 연한 하늘색
+    "쌀/잡곡": "#F0E68C",    # 카키색
+    "조미료/소스": "#F5F5F5",   # 연한 회색
+    "반찬/김치": "#FFCDD2",    # 연한 빨강
+    "즉석식품/밀키트": "#FFE0B2", # 연한 오렌지
+    "빵/디저트": "#F8BBD0",    # 연한 핑크
+    "음료": "#B3E5FC",      # 연한 파랑
+    "기타": "#E0E0E0"       # 회색
+}
+
+# 음식 목록 한 페이지에 표시할 카드 수
+FOOD_LIST_PAGE_SIZE = 50
+
+# "나머지 재료" 태그 최대 표시 개수 (수만 개를 한 번에 보내지 않도록)
+MAX_REMAINING_TAGS = 300
+
+# 캘린더 표 열 너비 (행마다 스타일을 반복하지 않도록 colgroup으로 한 번만 지정)
+CALENDAR_TABLE_HEAD = ("<table style='width: 100%; border-collapse: collapse;'>"
+                       "<colgroup><col style='width: 50%'><col style='width: 25%'><col style='width: 25%'></colgroup>")
+
+TAG_STYLE = ("display: inline-block; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); "
+             "color: white; padding: 8px 15px; margin: 5px; border-radius: 20px; font-size: 14px; "
+             "font-weight: 500; box-shadow: 0 2px 4px rgba(0,0,0,0.1);")
+
+# (음식 ID, 수정 시각, 기준 날짜) → 카드 HTML
+_card_html_cache = LRUCache("food_card_html", max_entries=5000)
+
+# (음식 ID, 수정 시각) → 캘린더 행 HTML
+_calendar_row_cache = LRUCache("calendar_row_html", max_entries=5000)
+
+
+def food_status(food, today):
+    """기준 날짜의 음식 상태와 남은 일수 (FoodItem.status()와 같은 기준)"""
+    days = (food.expiry_date - today).days
+    if days < 0:
+        return "만료", days
+    if days <= 3:
+        return "임박", days
+    return "신선", days
+
+
+def _build_food_card_html(food, today):
+    location_icon = LOCATION_ICONS.get(food.location, "📦")
+    status, days = food_status(food, today)
+    days_text = f"D-{days}" if days >= 0 else f"D+{abs(days)}"
+
+    # 상태별 카드 배경색 및 D-day 색상
+    if status == "만료":
+        card_bg_color = "#FFEBEE"  # 연한 빨강
+        dday_color = "#9E9E9E"  # 회색
+    elif status == "임박":
+        card_bg_color = "#FFF9C4"  # 연한 노랑
+        dday_color = "#F44336" if days <= 2 else "#FF9800"  # 빨강 / 주황
+    else:  # 신선
+        card_bg_color = "#E8F5E9"  # 연한 초록
+        dday_color = "#4CAF50"  # 초록
+
+    memo_html = (f"<div style='color: #555; font-size: 13px; margin-top: 5px;'>📝 {escape(food.memo)}</div>"
+                 if food.memo else "")
+
+    return f"""
+    <div style='background-color: {card_bg_color}; padding: 15px; border-radius: 10px; margin-bottom: 10px; border: 1px solid #ddd;'>
+        <div style='margin-bottom: 8px;'>
+            <span style='font-size: 18px; font-weight: bold; color: #333;'>{STATUS_COLORS[status]} {location_icon} {escape(food.name)}</span>
+            <span style='font-size: 22px; font-weight: bold; color: {dday_color}; margin-left: 15px;'>{days_text}</span>
+        </div>
+        <div style='color: #555; font-size: 13px; margin-bottom: 5px;'>
+            {escape(food.category)} | {escape(food.location)} | {food.quantity} {escape(food.unit or '')}
+        </div>
+        <div style='color: #555; font-size: 13px;'>
+            소비기한: {food.expiry_date.strftime('%m/%d')}
+        </div>
+        {memo_html}
+    </div>
+    """
+
+
+def food_card_html(food, today=None):
+    """
+    음식 카드 HTML (변경되지 않은 음식은 캐시 재사용)
+
+    Args:
+        food: FoodItem
+        today: 기준 날짜 (D-day/상태 계산용, 기본값: 오늘)
+
+    Returns:
+        str: 카드 HTML
+    """
+    today = today or date.today()
+    key = (food.id, food.updated_at, today)
+    return _card_html_cache.get_or_compute(key, lambda: _build_food_card_html(food, today))
+
+
+def _build_calendar_row_html(food):
+    category_icon = CATEGORY_ICONS.get(food.category, "📦")
+    location_icon = LOCATION_ICONS.get(food.location, "📦")
+    return (f"<tr><td>{category_icon} <b>{escape(food.name)}</b> {location_icon}</td>"
+            f"<td>{food.quantity} {escape(food.unit or '')}</td><td>{escape(food.category)}</td></tr>")
+
+
+def calendar_rows_html(foods):
+    """소비기한 캘린더의 날짜별 음식 표 HTML (행 단위 캐시, 날짜당 마크다운 하나)"""
+    rows = "".join(
+        _calendar_row_cache.get_or_compute((food.id, food.updated_at), lambda food=food: _build_calendar_row_html(food))
+        for food in foods
+    )
+    return CALENDAR_TABLE_HEAD + rows + "</table>"
+
+
+def ingredient_tags_html(foods, limit=None):
+    """재료 태그 HTML (limit개까지만)"""
+    if limit is not None:
+        foods = foods[:limit]
+    return "".join(
+        f"<span style='{TAG_STYLE}'>{CATEGORY_ICONS.get(food.category, '📦')} {escape(food.name)}</span>"
+        for food in foods
+    )
+
+
+def clear_render_caches():
+    """렌더링 캐시 비우기 (측정용)"""
+    _card_html_cache.clear()
+    _calendar_row_cache.clear()
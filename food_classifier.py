@@ -0,0 +1,476 @@
+"""
+로컬 음식 이름 정규화 및 카테고리 분류기
+
+동의어 사전 + 문자 n-gram 점수로 음식 이름을 표준 이름과 앱 카테고리로
+매핑합니다. API 호출 없이 동작하며, 등록된 음식 기록으로 추가 학습합니다.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+
+from cache_utils import LRUCache
+
+# 앱 카테고리별 표준 이름과 동의어 (표준 이름: [동의어, ...])
+SEED_SYNONYMS = {
+    "채소": {
+        "양파": ["적양파", "자색양파"],
+        "대파": ["파", "쪽파", "실파"],
+        "마늘": ["깐마늘", "다진마늘", "통마늘"],
+        "감자": ["햇감자", "알감자"],
+        "고구마": ["밤고구마", "호박고구마"],
+        "당근": ["흙당근", "미니당근"],
+        "배추": ["알배추", "알배기배추", "봄동"],
+        "양배추": ["적양배추", "캐비지"],
+        "상추": ["적상추", "청상추", "양상추"],
+        "오이": ["백오이", "다다기오이", "취청오이"],
+        "애호박": ["호박", "주키니"],
+        "토마토": ["방울토마토", "대추토마토", "완숙토마토"],
+        "파프리카": ["피망", "빨간파프리카", "노란파프리카"],
+        "브로콜리": ["브로컬리"],
+        "시금치": ["포항초", "섬초"],
+        "콩나물": ["숙주", "숙주나물"],
+        "버섯": ["느타리버섯", "표고버섯", "팽이버섯", "새송이버섯", "양송이버섯"],
+        "고추": ["청양고추", "풋고추", "꽈리고추", "홍고추"],
+        "깻잎": ["들깻잎"],
+        "무": ["무우", "총각무", "알타리무"],
+        "가지": [],
+        "부추": [],
+        "생강": [],
+    },
+    "과일": {
+        "사과": ["부사", "홍로", "애플"],
+        "배": ["신고배"],
+        "바나나": ["banana"],
+        "딸기": ["설향", "킹스베리"],
+        "포도": ["샤인머스캣", "청포도", "거봉", "캠벨"],
+        "귤": ["감귤", "한라봉", "천혜향", "레드향", "밀감"],
+        "오렌지": ["네이블오렌지"],
+        "수박": ["애플수박"],
+        "참외": ["성주참외"],
+        "복숭아": ["백도", "황도", "천도복숭아"],
+        "키위": ["골드키위", "참다래"],
+        "블루베리": ["냉동블루베리"],
+        "레몬": ["라임"],
+        "망고": ["애플망고"],
+        "감": ["단감", "홍시", "곶감"],
+        "아보카도": [],
+        "체리": [],
+        "자두": [],
+    },
+    "육류/해산물": {
+        "돼지고기": ["삼겹살", "목살", "앞다리살", "뒷다리살", "항정살", "돼지갈비", "대패삼겹살"],
+        "소고기": ["쇠고기", "한우", "등심", "안심", "차돌박이", "우삼겹", "불고기용", "양지", "사태"],
+        "닭고기": ["닭", "닭가슴살", "닭다리", "닭날개", "닭안심", "생닭", "통닭"],
+        "오리고기": ["훈제오리", "오리"],
+        "다진고기": ["다짐육", "간고기"],
+        "햄": ["스팸", "슬라이스햄", "통조림햄"],
+        "소시지": ["비엔나", "비엔나소시지", "후랑크"],
+        "베이컨": [],
+        "고등어": ["자반고등어"],
+        "연어": ["훈제연어", "연어회"],
+        "새우": ["냉동새우", "칵테일새우", "대하", "흰다리새우"],
+        "오징어": ["한치", "갑오징어"],
+        "조개": ["바지락", "모시조개", "홍합", "가리비", "전복", "굴"],
+        "참치": ["참치캔", "참치통조림"],
+        "멸치": ["볶음멸치", "국물멸치"],
+        "어묵": ["오뎅", "사각어묵"],
+        "게맛살": ["크래미", "맛살"],
+        "생선": ["갈치", "삼치", "조기", "명태", "동태", "코다리", "가자미"],
+    },
+    "계란/두부": {
+        "달걀": ["계란", "유정란", "무정란", "특란", "왕란", "대란", "egg", "메추리알"],
+        "두부": ["부침두부", "찌개두부", "순두부", "연두부", "유부"],
+    },
+    "유제품": {
+        "우유": ["흰우유", "저지방우유", "멸균우유", "milk", "딸기우유", "초코우유", "바나나우유"],
+        "치즈": ["슬라이스치즈", "모짜렐라", "체다치즈", "크림치즈", "파마산"],
+        "요거트": ["요구르트", "그릭요거트", "떠먹는요거트", "야쿠르트"],
+        "버터": ["무염버터", "가염버터"],
+        "생크림": ["휘핑크림", "휘핑"],
+    },
+    "쌀/잡곡": {
+        "쌀": ["백미", "현미", "찹쌀", "햅쌀"],
+        "잡곡": ["귀리", "보리", "흑미", "오트밀", "퀴노아", "혼합잡곡"],
+        "밀가루": ["부침가루", "튀김가루", "전분", "부침개가루"],
+        "국수": ["소면", "중면", "칼국수면", "우동면", "당면", "파스타", "스파게티"],
+        "떡": ["떡국떡", "떡볶이떡", "가래떡"],
+    },
+    "조미료/소스": {
+        "간장": ["진간장", "국간장", "양조간장"],
+        "고추장": ["초고추장"],
+        "된장": ["쌈장", "청국장"],
+        "케첩": ["케찹", "토마토케첩"],
+        "마요네즈": ["마요"],
+        "식용유": ["카놀라유", "포도씨유", "올리브유", "참기름", "들기름"],
+        "소금": ["천일염", "맛소금"],
+        "설탕": ["흑설탕", "올리고당", "물엿", "꿀"],
+        "식초": ["사과식초", "현미식초"],
+        "고춧가루": ["고추가루"],
+        "굴소스": ["스리라차", "머스타드", "돈까스소스", "드레싱"],
+    },
+    "반찬/김치": {
+        "김치": ["배추김치", "포기김치", "김장김치", "묵은지", "겉절이"],
+        "깍두기": ["총각김치", "열무김치", "파김치", "갓김치", "동치미", "백김치"],
+        "장아찌": ["단무지", "피클", "오이지", "락교"],
+        "젓갈": ["새우젓", "명란젓", "창난젓", "오징어젓"],
+        "나물": ["시금치나물", "고사리", "무생채", "도라지무침"],
+        "멸치볶음": ["진미채", "어묵볶음", "장조림", "콩자반"],
+        "김": ["조미김", "김밥김", "파래김"],
+    },
+    "즉석식품/밀키트": {
+        "라면": ["컵라면", "신라면", "짜파게티", "봉지라면"],
+        "즉석밥": ["햇반", "컵밥"],
+        "만두": ["냉동만두", "물만두", "군만두", "교자"],
+        "밀키트": ["부대찌개밀키트", "밀푀유나베"],
+        "냉동피자": ["피자"],
+        "돈까스": ["냉동돈까스", "치킨너겟", "너겟"],
+        "볶음밥": ["냉동볶음밥"],
+        "도시락": ["편의점도시락", "삼각김밥", "샌드위치"],
+        "국": ["무국", "미역국", "된장국", "북엇국", "육개장", "곰탕", "설렁탕", "찌개", "김치찌개", "된장찌개"],
+    },
+    "빵/디저트": {
+        "식빵": ["통식빵", "우유식빵", "모닝빵", "베이글", "바게트", "크루아상", "빵"],
+        "케이크": ["조각케이크", "롤케이크", "치즈케이크"],
+        "아이스크림": ["하드", "콘아이스크림", "젤라또"],
+        "과자": ["쿠키", "비스킷", "초콜릿", "초콜렛", "스낵", "감자칩", "포테이토칩", "새우깡", "양파링", "나초", "크래커"],
+        "떡류": ["찹쌀떡", "인절미", "송편", "약과"],
+        "푸딩": ["젤리", "마카롱"],
+    },
+    "음료": {
+        "생수": ["물", "삼다수", "탄산수"],
+        "주스": ["오렌지주스", "사과주스", "포도주스", "토마토주스", "착즙주스"],
+        "탄산음료": ["콜라", "사이다", "환타", "제로콜라"],
+        "커피": ["캔커피", "콜드브루", "아메리카노", "라떼"],
+        "두유": ["베지밀", "아몬드브리즈", "귀리음료"],
+        "맥주": ["캔맥주", "소주", "와인", "막걸리"],
+        "차": ["녹차", "보리차", "옥수수수염차", "아이스티"],
+    },
+}
+
+# Vision 모델의 18개 분류 → 앱 카테고리
+MODEL_CATEGORY_MAP = {
+    "채소": "채소",
+    "과일": "과일",
+    "육류": "육류/해산물",
+    "해산물": "육류/해산물",
+    "계란": "계란/두부",
+    "두부": "계란/두부",
+    "유제품": "유제품",
+    "쌀": "쌀/잡곡",
+    "잡곡": "쌀/잡곡",
+    "조미료": "조미료/소스",
+    "소스": "조미료/소스",
+    "반찬": "반찬/김치",
+    "김치": "반찬/김치",
+    "즉석식품": "즉석식품/밀키트",
+    "밀키트": "즉석식품/밀키트",
+    "빵": "빵/디저트",
+    "디저트": "빵/디저트",
+    "과자": "빵/디저트",  # 18개 분류 밖이지만 모델이 자주 쓰는 이름
+    "스낵": "빵/디저트",
+    "음료": "음료",
+    "기타": "기타",
+}
+
+# 이름 정리용 패턴 (괄호 내용, 수량/용량 표기, 특수문자)
+_PAREN_RE = re.compile(r"[\(\[\{].*?[\)\]\}]")
+_AMOUNT_RE = re.compile(r"\d+(\.\d+)?\s*(kg|g|ml|mL|l|L|개입|개|구|팩|봉|입|매|인분|%)?", re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"[^0-9A-Za-z가-힣]")
+
+
+def clean_name(name):
+    """음식 이름에서 괄호, 용량 표기, 공백 및 특수문자 제거"""
+    if not name:
+        return ""
+    text = _PAREN_RE.sub("", str(name))
+    text = _AMOUNT_RE.sub("", text)
+    return _NON_WORD_RE.sub("", text).lower()
+
+
+# 계란 껍질의 날짜는 산란일자 (냉장 보관 시 산란일 + N일이 소비기한, 사진 분석 프롬프트와 같은 기준)
+EGG_SHELF_LIFE_DAYS = 40
+EGG_NAMES = ["달걀", *SEED_SYNONYMS["계란/두부"]["달걀"]]
+
+
+def is_egg_result(result):
+    """AI 분석 결과가 계란인지 (계란/두부 카테고리이고 이름에 계란 이름이 있는지)"""
+    name = clean_name(result.get("name"))
+    return (result.get("category") == "계란/두부"
+            and any(egg_name in name for egg_name in EGG_NAMES))
+
+
+def detected_expiry_date(result):
+    """
+    AI 분석 결과에서 읽은 날짜(detected_date)를 소비기한으로 변환
+
+    계란은 껍질 날짜가 산란일자이므로 EGG_SHELF_LIFE_DAYS를 더합니다.
+
+    Returns:
+        date: 소비기한 (읽은 날짜가 없거나 형식이 틀리면 None)
+    """
+    value = result.get("detected_date")
+    if isinstance(value, date):
+        detected = value
+    else:
+        try:
+            detected = datetime.strptime(value, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return None
+    if is_egg_result(result):
+        detected += timedelta(days=EGG_SHELF_LIFE_DAYS)
+    return detected
+
+
+# 분류 결과를 기억할 이름 수
+CLASSIFY_CACHE_SIZE = 2048
+
+# AI 분석 결과의 카테고리를 바꿀 수 없을 때 n-gram 추측을 쓰는 최소 신뢰도 (낮으면 기본 카테고리)
+NORMALIZE_MIN_CONFIDENCE = 50
+
+
+def char_ngrams(text, n_min=1, n_max=3):
+    """문자 n-gram 추출 (단어 경계 표시 포함)"""
+    padded = f"^{text}$"
+    grams = []
+    for n in range(n_min, n_max + 1):
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            if gram not in ("^", "$"):
+                grams.append(gram)
+    return grams
+
+
+class FoodClassifier:
+    """동의어 사전 + 문자 n-gram 기반 음식 분류기"""
+
+    def __init__(self, categories, default_category="기타", synonyms=None):
+        """
+        Args:
+            categories: 앱 카테고리 리스트 (app.CATEGORIES)
+            default_category: 분류할 수 없을 때 사용할 카테고리
+            synonyms: 카테고리별 동의어 사전 (기본값: SEED_SYNONYMS)
+        """
+        self.categories = list(categories)
+        self.default_category = default_category if default_category in self.categories else self.categories[-1]
+
+        # 정리된 이름 → (표준 이름, 카테고리)
+        self._lookup = {}
+        # 단어 끝 매칭용 (긴 이름 우선)
+        self._containment = []
+        # 카테고리별 n-gram 빈도
+        self._gram_counts = defaultdict(Counter)
+        self._gram_totals = Counter()
+        self._vocabulary = set()
+        # 분류 결과 메모이제이션 (최근 이름 CLASSIFY_CACHE_SIZE개)
+        self._cache = LRUCache("food_classifier", max_entries=CLASSIFY_CACHE_SIZE)
+        # 앱에서 세션끼리 한 인스턴스를 공유하므로 학습(쓰기)은 하나씩
+        # (조회는 잠그지 않음, _containment는 통째로 교체)
+        self._lock = threading.Lock()
+
+        for category, entries in (synonyms or SEED_SYNONYMS).items():
+            if category not in self.categories:
+                continue
+            for canonical, aliases in entries.items():
+                for alias in [canonical] + list(aliases):
+                    self._register(alias, canonical, category)
+
+        self._rebuild_containment()
+
+    def _register(self, alias, canonical, category, weight=1):
+        """이름 하나를 사전과 n-gram 프로파일에 등록"""
+        key = clean_name(alias)
+        if not key:
+            return
+        self._lookup[key] = (canonical, category)
+        for gram in char_ngrams(key):
+            self._gram_counts[category][gram] += weight
+            self._gram_totals[category] += weight
+            self._vocabulary.add(gram)
+
+    def _rebuild_containment(self):
+        # 한 글자 이름('무', '배', '김')은 오탐이 많아 단어 끝 매칭에서 제외
+        self._containment = sorted(
+            ((key, value) for key, value in self._lookup.items() if len(key) >= 2),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self._cache.clear()
+
+    def fit(self, food_items):
+        """
+        등록된 음식 기록으로 사전과 n-gram 프로파일 보강
+
+        사용자가 직접 고른 카테고리가 시드 사전보다 우선합니다.
+
+        Args:
+            food_items: FoodItem 리스트 (name, category 속성 사용)
+
+        Returns:
+            FoodClassifier: self
+        """
+        votes = defaultdict(Counter)
+        for food in food_items:
+            if food.category in self.categories:
+                votes[clean_name(food.name)][food.category] += 1
+
+        with self._lock:
+            for key, counter in votes.items():
+                if not key:
+                    continue
+                category, count = counter.most_common(1)[0]
+                canonical = self._lookup.get(key, (None, None))[0]
+                self._register(key, canonical or key, category, weight=count)
+
+            self._rebuild_containment()
+        return self
+
+    def learn(self, name, category):
+        """새로 등록된 음식 한 건을 학습"""
+        if category not in self.categories:
+            return
+        key = clean_name(name)
+        if not key:
+            return
+        with self._lock:
+            canonical = self._lookup.get(key, (None, None))[0]
+            self._register(key, canonical or key, category)
+            self._rebuild_containment()
+
+    def _match_word_end(self, words):
+        """
+        단어 중 사전 이름과 같거나 사전 이름으로 끝나는 단어 찾기 (긴 이름 우선)
+
+        한국어 복합어는 마지막 말이 음식 종류이므로('국산양파' → 양파, '서울우유' → 우유)
+        앞이나 중간에만 들어 있는 이름은 무시합니다. ('새우깡', '감자칩', '소고기무국')
+
+        Args:
+            words: 정리된 단어 목록 (이름을 공백으로 나눈 뒤 clean_name)
+
+        Returns:
+            tuple: (표준 이름, 카테고리) (없으면 None)
+        """
+        for alias, value in self._containment:
+            if any(word.endswith(alias) for word in words):
+                return value
+        return None
+
+    def _score_categories(self, key):
+        """나이브 베이즈 방식의 카테고리별 로그 점수"""
+        grams = char_ngrams(key)
+        vocab_size = len(self._vocabulary) or 1
+        scores = {}
+        for category in self.categories:
+            counts = self._gram_counts.get(category)
+            if not counts:
+                continue
+            denom = self._gram_totals[category] + vocab_size
+            # 긴 n-gram일수록 변별력이 높으므로 가중치 부여
+            scores[category] = sum(
+                (len(gram.strip("^$")) or 1) * math.log((counts.get(gram, 0) + 1) / denom)
+                for gram in grams
+            )
+        return scores
+
+    def classify(self, name):
+        """
+        음식 이름을 표준 이름과 앱 카테고리로 분류
+
+        Args:
+            name: 음식 이름
+
+        Returns:
+            dict: {name, category, confidence(0-100), source(synonym/contains/ngram/default)}
+        """
+        key = clean_name(name)
+        words = [word for word in (clean_name(part) for part in str(name or "").split()) if word]
+        cache_key = " ".join(words)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        if not key:
+            result = {"name": name or "", "category": self.default_category, "confidence": 0, "source": "default"}
+        elif key in self._lookup:
+            canonical, category = self._lookup[key]
+            result = {"name": canonical, "category": category, "confidence": 100, "source": "synonym"}
+        else:
+            result = None
+            matched = self._match_word_end(words)
+            if matched is not None:
+                # 브랜드/수식어가 붙은 이름은 원래 이름을 유지
+                result = {"name": str(name).strip(), "category": matched[1], "confidence": 85, "source": "contains"}
+
+            if result is None:
+                scores = self._score_categories(key)
+                if scores:
+                    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+                    best_category, best_score = ranked[0]
+                    second_score = ranked[1][1] if len(ranked) > 1 else best_score - 10
+                    # 1, 2위 점수 차이를 0-80 신뢰도로 변환
+                    margin = best_score - second_score
+                    confidence = int(80 * (1 - math.exp(-margin / 2)))
+                    result = {"name": str(name).strip(), "category": best_category,
+                              "confidence": confidence, "source": "ngram"}
+                else:
+                    result = {"name": str(name).strip(), "category": self.default_category,
+                              "confidence": 0, "source": "default"}
+
+        self._cache.set(cache_key, result)
+        return dict(result)
+
+    def predict_category(self, name, min_confidence=0):
+        """
+        카테고리만 예측
+
+        Args:
+            name: 음식 이름
+            min_confidence: 이 신뢰도 미만이면 기본 카테고리 반환
+
+        Returns:
+            str: 앱 카테고리
+        """
+        result = self.classify(name)
+        if result["confidence"] < min_confidence:
+            return self.default_category
+        return result["category"]
+
+    def map_model_category(self, model_category):
+        """Vision 모델 카테고리를 앱 카테고리로 변환 (변환 불가 시 None)"""
+        if not model_category:
+            return None
+        if model_category in self.categories:
+            return model_category
+        for part in re.split(r"[/,\s]+", str(model_category)):
+            mapped = MODEL_CATEGORY_MAP.get(part)
+            if mapped in self.categories:
+                return mapped
+        return None
+
+    def normalize_result(self, result):
+        """
+        AI 분석 결과의 이름과 카테고리를 앱 기준으로 정규화
+
+        Args:
+            result: FoodRecognitionAgent.analyze_food_image 결과
+
+        Returns:
+            dict: 정규화된 결과 (원본 카테고리는 model_category, 표준 이름은 canonical_name)
+        """
+        normalized = dict(result)
+        classification = self.classify(result.get("name", ""))
+        normalized["canonical_name"] = classification["name"]
+
+        model_category = result.get("category")
+        normalized["model_category"] = model_category
+        mapped = self.map_model_category(model_category)
+        if mapped and mapped != self.default_category:
+            normalized["category"] = mapped
+        elif classification["source"] != "ngram" or classification["confidence"] >= NORMALIZE_MIN_CONFIDENCE:
+            normalized["category"] = classification["category"]
+        else:
+            # 모델 카테고리를 쓸 수 없고 이름 추측도 약하면 틀린 카테고리보다 기본 카테고리
+            normalized["category"] = self.default_category
+
+        return normalized
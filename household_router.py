@@ -0,0 +1,207 @@
+"""
+가구(테넌트)별 데이터베이스 연결 라우터
+
+기본은 모든 가구가 한 데이터베이스(FRIDGE_DB_URL, db_config 참고)를 함께 쓰고 household_id 열로 구분합니다.
+FRIDGE_SHARD_DIR를 설정하면 가구를 여러 SQLite 파일로 나눠 저장하여,
+가구 수가 늘어도 한 가구의 조회 비용(테이블/인덱스 크기)이 일정하게 유지됩니다.
+
+가구는 클라이언트가 고르지 않고 서버에 설정한 가구별 접속 키로 정합니다. (authenticate_household)
+키를 설정하지 않으면 모든 요청이 기본 가구(FRIDGE_HOUSEHOLD_ID)를 사용합니다.
+
+환경 변수 (FRIDGE_HOUSEHOLD_KEYS는 Streamlit secrets에 넣어도 됨):
+    FRIDGE_HOUSEHOLD_ID=default     키를 설정하지 않았을 때 사용하는 기본 가구
+    FRIDGE_HOUSEHOLD_KEYS=가구ID:접속키,가구ID:접속키
+    FRIDGE_SHARD_DIR=shards         샤드 SQLite 파일 디렉터리 (설정하면 샤딩)
+    FRIDGE_SHARD_COUNT=0            샤드 파일 수 (0이면 가구마다 파일 하나, N이면 가구 ID 해시로 N개에 분배)
+
+샤드 파일의 연결은 풀링하지 않고(NullPool) 요청마다 열어 많은 가구가 파일 핸들을 계속 점유하지 않도록 합니다.
+"""
+import asyncio
+import hmac
+import os
+import threading
+import zlib
+from pathlib import Path
+
+from sqlalchemy.pool import NullPool
+
+from cache_utils import LRUCache
+from database import DEFAULT_HOUSEHOLD, SYSTEM_HOUSEHOLD, Database, ensure_schema, validate_household_id
+from db_config import create_async_db_engine, create_db_engine, database_url, get_setting
+
+# 열어 둘 샤드 엔진 수 (넘으면 오래 안 쓴 샤드부터 다시 열어야 함)
+MAX_OPEN_SHARDS = 256
+
+
+def default_household():
+    """기본 가구 ID (FRIDGE_HOUSEHOLD_ID, 없으면 default)"""
+    return validate_household_id(os.getenv('FRIDGE_HOUSEHOLD_ID', DEFAULT_HOUSEHOLD))
+
+
+def tenant_household(household_id=None):
+    """요청/실행의 가구 ID 검사 (없으면 기본 가구, 저장소 작업용 SYSTEM_HOUSEHOLD는 사용할 수 없음)"""
+    household_id = validate_household_id(household_id or default_household())
+    if household_id == SYSTEM_HOUSEHOLD:
+        raise ValueError(f"예약된 가구 ID입니다: {household_id!r}")
+    return household_id
+
+
+def household_keys():
+    """
+    가구별 접속 키 (FRIDGE_HOUSEHOLD_KEYS="가구ID:접속키,...")
+
+    Returns:
+        list: (가구 ID, 접속 키) 목록 (설정하지 않았으면 빈 목록)
+    """
+    keys = []
+    for entry in (get_setting('FRIDGE_HOUSEHOLD_KEYS') or '').split(','):
+        if not entry.strip():
+            continue
+        household_id, _, key = entry.strip().partition(':')
+        if not key:
+            raise ValueError("FRIDGE_HOUSEHOLD_KEYS는 '가구ID:접속키,가구ID:접속키' 형식이어야 합니다.")
+        keys.append((tenant_household(household_id), key))
+    return keys
+
+
+def authenticate_household(key):
+    """
+    접속 키로 가구 확인 (키를 설정하지 않았으면 항상 기본 가구)
+
+    Returns:
+        str: 가구 ID (키가 틀리면 None)
+    """
+    keys = household_keys()
+    if not keys:
+        return default_household()
+    matched = None
+    for household_id, household_key in keys:
+        # 모든 키를 같은 시간에 비교 (응답 시간으로 키를 추측하지 못하도록)
+        if hmac.compare_digest(household_key.encode(), (key or '').encode()):
+            matched = household_id
+    return matched
+
+
+class HouseholdRouter:
+    """가구 ID → Database/AsyncDatabase"""
+
+    def __init__(self, db_url=None, shard_dir=None, shard_count=0, max_open=MAX_OPEN_SHARDS):
+        """
+        Args:
+            db_url: 공유 데이터베이스 URL (shard_dir가 없을 때, None이면 db_config.database_url())
+            shard_dir: 샤드 SQLite 파일 디렉터리 (주면 샤딩)
+            shard_count: 샤드 파일 수 (0이면 가구마다 파일 하나)
+            max_open: 열어 둘 샤드 엔진 수
+        """
+        self.db_url = db_url or database_url()
+        self.shard_dir = Path(shard_dir) if shard_dir else None
+        self.shard_count = shard_count
+        self._engines = LRUCache("household_shards", max_entries=max_open)
+        self._async_engines = LRUCache("household_shards_async", max_entries=max_open)
+        self._lock = threading.Lock()
+        self._async_lock = None
+        self._shared = None
+        self._shared_async = None
+        if self.shard_dir:
+            self.shard_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            db_url=database_url(),
+            shard_dir=os.getenv('FRIDGE_SHARD_DIR') or None,
+            shard_count=int(os.getenv('FRIDGE_SHARD_COUNT', 0)),
+        )
+
+    @property
+    def sharded(self):
+        return self.shard_dir is not None
+
+    def shard_name(self, household_id):
+        """가구가 저장되는 샤드 파일 이름"""
+        validate_household_id(household_id)
+        if self.shard_count:
+            # 프로세스마다 달라지는 hash() 대신 crc32로 고정 분배
+            return f"shard_{zlib.crc32(household_id.encode()) % self.shard_count:04d}.db"
+        return f"household_{household_id}.db"
+
+    def shard_url(self, household_id):
+        """가구의 데이터베이스 URL"""
+        if not self.sharded:
+            return self.db_url
+        return f"sqlite:///{self.shard_dir / self.shard_name(household_id)}"
+
+    def database(self, household_id=None):
+        """가구의 Database (같은 파일의 가구끼리 엔진 공유)"""
+        household_id = tenant_household(household_id)
+        if not self.sharded:
+            with self._lock:
+                if self._shared is None:
+                    self._shared = Database(self.db_url)
+            return self._shared.for_household(household_id)
+
+        url = self.shard_url(household_id)
+        engine = self._engines.get(url)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(url)
+                if engine is None:
+                    engine = create_db_engine(url, poolclass=NullPool)
+                    with engine.begin() as conn:
+                        ensure_schema(conn)
+                    self._engines.set(url, engine)
+        return Database(household_id=household_id, engine=engine)
+
+    def storages(self, all_shards=False):
+        """
+        저장소(데이터베이스 파일)마다 Database 하나 (가구는 SYSTEM_HOUSEHOLD)
+
+        백그라운드 작업 워커가 모든 가구의 작업을 가져오고 저장소 단위 점검을 등록할 때 사용합니다.
+
+        Args:
+            all_shards: False면 이 프로세스가 열어 둔 샤드(최근 max_open개)만,
+                        True면 샤드 디렉터리의 모든 파일 (열려 있지 않은 파일은 캐시에 넣지 않는 임시 엔진)
+        """
+        if not self.sharded:
+            return [self.database().for_household(SYSTEM_HOUSEHOLD)]
+        engines = {str(engine.url): engine for engine in self._engines.values()}
+        if all_shards:
+            for path in sorted(self.shard_dir.glob('*.db')):
+                url = f"sqlite:///{path}"
+                if url not in engines:
+                    engines[url] = create_db_engine(url, poolclass=NullPool)
+        return [Database(household_id=SYSTEM_HOUSEHOLD, engine=engine) for engine in engines.values()]
+
+    async def async_database(self, household_id=None):
+        """가구의 AsyncDatabase (처음 여는 파일은 테이블 생성)"""
+        from async_database import AsyncDatabase
+
+        household_id = tenant_household(household_id)
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+
+        if not self.sharded:
+            if self._shared_async is None:
+                async with self._async_lock:
+                    if self._shared_async is None:
+                        db = AsyncDatabase(self.db_url)
+                        await db.create_tables()
+                        self._shared_async = db
+            return self._shared_async.for_household(household_id)
+
+        url = self.shard_url(household_id)
+        engine = self._async_engines.get(url)
+        if engine is None:
+            async with self._async_lock:
+                engine = self._async_engines.get(url)
+                if engine is None:
+                    engine = create_async_db_engine(url, poolclass=NullPool)
+                    await AsyncDatabase(household_id=household_id, engine=engine).create_tables()
+                    self._async_engines.set(url, engine)
+        return AsyncDatabase(household_id=household_id, engine=engine)
+
+    async def dispose_async(self):
+        """공유 AsyncDatabase 연결 풀 정리 (샤드 엔진은 풀이 없음)"""
+        if self._shared_async is not None:
+            await self._shared_async.dispose()
+            self._shared_async = None
@@ -0,0 +1,278 @@
+"""
+이미지 전처리 모듈 (EXIF 방향 보정, 리사이즈, 해시)
+"""
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
+
+from cache_utils import LRUCache
+from tracing import record
+
+# Vision API에 보낼 이미지의 최대 변 길이 (픽셀)
+MAX_ANALYSIS_SIZE = 1568
+
+# 재인코딩 JPEG 품질
+JPEG_QUALITY = 90
+
+# 업로드 미리보기 썸네일 최대 변 길이 (픽셀)
+THUMBNAIL_SIZE = 320
+
+# EXIF Orientation 태그와 값별 변환 (2~8, 1은 변환 없음)
+ORIENTATION_TAG = 0x0112
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# 업로드 해시 → 파이프라인 결과 (썸네일 + 분석용 축소 이미지)
+_pipeline_cache = LRUCache("image_pipeline", max_entries=64)
+
+# 파이프라인 단계 이름 (타이밍 집계 순서)
+PIPELINE_STAGES = ("hash", "decode", "orient", "resize", "encode")
+
+MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+def hash_bytes(data):
+    """이미지 바이트의 SHA-256 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_orientation(image):
+    """EXIF Orientation 태그 값 (없으면 1)"""
+    try:
+        return image.getexif().get(ORIENTATION_TAG, 1) or 1
+    except Exception:
+        return 1
+
+
+def apply_orientation(image, orientation):
+    """EXIF Orientation 값에 맞게 이미지 변환 (리샘플링 없는 transpose)"""
+    method = ORIENTATION_TRANSPOSE.get(orientation)
+    if method is None:
+        return image
+    return image.transpose(method)
+
+
+def normalize_image(image_bytes, max_size=None, quality=JPEG_QUALITY):
+    """
+    EXIF 방향 보정 + (선택) 축소
+
+    - 8가지 Orientation 값 모두 transpose로 처리 (리샘플링 없음)
+    - max_size가 주어지면 JPEG draft 모드로 축소 디코딩 (미리보기용)
+    - 보정이나 축소가 필요 없으면 디코딩/재인코딩 없이 원본 반환
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        max_size: 최대 변 길이 (None이면 원본 크기 유지)
+        quality: 재인코딩 JPEG 품질
+
+    Returns:
+        bytes: 보정된 이미지 바이트
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    orientation = get_orientation(image)
+    needs_resize = max_size is not None and max(image.size) > max_size
+
+    if orientation == 1 and not needs_resize:
+        return image_bytes
+
+    image_format = image.format or 'JPEG'
+    if needs_resize and image_format == 'JPEG':
+        # DCT 단계에서 1/2, 1/4, 1/8로 축소 디코딩 (전체 디코딩보다 훨씬 빠름)
+        image.draft('RGB', (max_size, max_size))
+
+    image = apply_orientation(image, orientation)
+    if needs_resize:
+        image.thumbnail((max_size, max_size), Image.BILINEAR)
+
+    output = io.BytesIO()
+    if image_format == 'JPEG':
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(output, format='JPEG', quality=quality)
+    else:
+        image.save(output, format=image_format)
+    return output.getvalue()
+
+
+def preprocess_image_file(path, max_size=MAX_ANALYSIS_SIZE):
+    """
+    이미지 파일을 읽어 방향 보정 및 리사이즈 (프로세스 풀에서 실행 가능)
+
+    Args:
+        path: 이미지 파일 경로
+        max_size: 최대 변 길이 (픽셀)
+
+    Returns:
+        dict: {path, hash(원본 파일 기준), image_bytes, image_type}
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    try:
+        # 방향 보정과 축소를 한 번의 디코딩/인코딩으로 처리
+        processed = normalize_image(raw, max_size=max_size)
+    except Exception as e:
+        print(f"이미지 전처리 오류: {e}")
+        processed = raw
+
+    extension = "." + str(path).rsplit(".", 1)[-1].lower()
+    image_type = MIME_TYPES.get(extension, "image/jpeg")
+
+    return {
+        "path": str(path),
+        "hash": hash_bytes(raw),
+        "image_bytes": processed,
+        "image_type": image_type,
+    }
+
+
+def process_upload(image_bytes, image_hash=None, analysis_size=MAX_ANALYSIS_SIZE,
+                   thumbnail_size=THUMBNAIL_SIZE):
+    """
+    업로드 이미지 한 장을 한 번만 디코딩하여 분석용 이미지와 썸네일 생성
+
+    스레드 풀/프로세스 풀 워커에서 실행됩니다. (PIL 디코딩/리사이즈/인코딩은 GIL 해제)
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        image_hash: 미리 계산한 해시 (없으면 계산)
+        analysis_size: 분석용 이미지 최대 변 길이
+        thumbnail_size: 썸네일 최대 변 길이
+
+    Returns:
+        dict: {hash, analysis_bytes, image_type, thumbnail, size, timings(단계별 ms)}
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    image_hash = image_hash or hash_bytes(image_bytes)
+    timings["hash"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    image = Image.open(io.BytesIO(image_bytes))
+    orientation = get_orientation(image)
+    if image.format == 'JPEG':
+        # 분석 크기 이상으로만 축소 디코딩
+        image.draft('RGB', (analysis_size, analysis_size))
+    image.load()
+    timings["decode"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    image = apply_orientation(image, orientation)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    timings["orient"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if max(image.size) > analysis_size:
+        image.thumbnail((analysis_size, analysis_size), Image.BILINEAR)
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_size, thumbnail_size), Image.BILINEAR)
+    timings["resize"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    analysis_output = io.BytesIO()
+    image.save(analysis_output, format='JPEG', quality=JPEG_QUALITY)
+    thumbnail_output = io.BytesIO()
+    thumbnail.save(thumbnail_output, format='JPEG', quality=80)
+    timings["encode"] = (time.perf_counter() - started) * 1000
+
+    return {
+        "hash": image_hash,
+        "analysis_bytes": analysis_output.getvalue(),
+        "image_type": "image/jpeg",
+        "thumbnail": thumbnail_output.getvalue(),
+        "size": image.size,
+        "timings": timings,
+    }
+
+
+class ImagePipeline:
+    """여러 장의 업로드 이미지를 병렬로 전처리하는 파이프라인"""
+
+    def __init__(self, max_workers=None, use_processes=False):
+        """
+        Args:
+            max_workers: 워커 수 (기본값: CPU 코어 수, 최대 8)
+            use_processes: True면 ProcessPoolExecutor, False면 ThreadPoolExecutor
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 2)
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=self.max_workers)
+
+    def process(self, images):
+        """
+        이미지들을 병렬 처리하고 입력 순서대로 결과를 하나씩 반환
+
+        앞선 이미지가 끝나는 대로 바로 반환하므로 화면에 순차적으로 표시할 수 있습니다.
+        이미 처리한 이미지(업로드 해시 기준)는 캐시에서 바로 반환합니다.
+        파이프라인은 여러 세션이 공유하므로 시간 집계는 인스턴스가 아닌 결과마다 담아 반환합니다.
+
+        Args:
+            images: 원본 이미지 바이트 리스트
+
+        Yields:
+            dict: process_upload 결과 (cached 키로 캐시 적중 여부,
+                  batch_timings 키로 이 호출에서 지금까지의 단계별 누적 시간과 전체 소요 시간(wall) 표시)
+        """
+        started = time.perf_counter()
+        stage_totals = dict.fromkeys(PIPELINE_STAGES, 0.0)
+
+        pending = []
+        for image_bytes in images:
+            hash_started = time.perf_counter()
+            image_hash = hash_bytes(image_bytes)
+            stage_totals["hash"] += (time.perf_counter() - hash_started) * 1000
+            cached = _pipeline_cache.get(image_hash)
+            if cached is not None:
+                pending.append((dict(cached, cached=True), image_bytes, image_hash))
+            else:
+                future = self.executor.submit(process_upload, image_bytes, image_hash)
+                pending.append((future, image_bytes, image_hash))
+
+        for item, image_bytes, image_hash in pending:
+            if isinstance(item, dict):
+                result = item
+            else:
+                try:
+                    result = item.result()
+                    _pipeline_cache.set(image_hash, result)
+                    for stage, elapsed in result["timings"].items():
+                        if stage != "hash":
+                            stage_totals[stage] += elapsed
+                    result = dict(result, cached=False)
+                    # 워커 스레드의 처리 시간을 현재 트레이스에 기록
+                    record("image.process_upload", "image", sum(result["timings"].values()),
+                           bytes=len(image_bytes))
+                except Exception as e:
+                    # 디코딩할 수 없는 이미지는 원본 그대로 전달 (image_type은 호출자가 결정)
+                    print(f"이미지 전처리 오류: {e}")
+                    result = {
+                        "hash": image_hash,
+                        "analysis_bytes": image_bytes,
+                        "image_type": None,
+                        "thumbnail": image_bytes,
+                        "size": None,
+                        "timings": {},
+                        "cached": False,
+                    }
+
+            result["batch_timings"] = dict(stage_totals, wall=(time.perf_counter() - started) * 1000)
+            yield result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,216 @@
+"""
+가상 냉장고 데이터 생성기 (성능 측정/데모용)
+
+사용법:
+    python inventory_generator.py --count 100000 [--db sqlite:///fridge.db] [--seed 42]
+
+같은 시드와 기준 날짜면 항상 같은 데이터를 만듭니다.
+- 카테고리 비율, 보관 위치, 단위/수량은 일반 가정의 장보기 구성을 따름
+- 구매일은 최근일수록 많고 (지수 분포, 최대 90일 전)
+- 소비기한 = 구매일 + 카테고리/보관 위치별 보관 기간 (삼각 분포)
+  → 오래 보관한 신선식품은 자연스럽게 만료/임박 상태가 됨
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from database import DEFAULT_HOUSEHOLD, Database, FoodItem
+
+# 카테고리별 구성
+# - weight: 전체 중 비율
+# - names: 대표 품목
+# - units: (단위, 최소 수량, 최대 수량, 소수점 여부)
+# - locations: 보관 위치 → (비율, (최소, 최빈, 최대) 보관 일수)
+FOOD_CATALOG = {
+    "채소": {
+        "weight": 18,
+        "names": ["양파", "대파", "감자", "당근", "애호박", "오이", "양배추", "배추", "무", "깻잎",
+                  "상추", "시금치", "브로콜리", "파프리카", "콩나물", "숙주", "마늘", "고추", "버섯", "고구마"],
+        "units": [("개", 1, 6, False), ("봉지", 1, 2, False), ("g", 100, 500, False)],
+        "locations": {"냉장": (85, (3, 7, 14)), "실온": (15, (5, 14, 30))},
+    },
+    "과일": {
+        "weight": 10,
+        "names": ["사과", "배", "귤", "바나나", "딸기", "포도", "수박", "참외", "복숭아", "키위",
+                  "블루베리", "토마토", "방울토마토", "레몬", "오렌지"],
+        "units": [("개", 1, 10, False), ("팩", 1, 2, False), ("kg", 1, 3, True)],
+        "locations": {"냉장": (70, (4, 10, 21)), "실온": (30, (2, 5, 10))},
+    },
+    "육류/해산물": {
+        "weight": 12,
+        "names": ["돼지고기 삼겹살", "돼지고기 앞다리살", "소고기 불고기용", "소고기 국거리", "닭가슴살",
+                  "닭다리", "생닭", "다진 돼지고기", "고등어", "갈치", "오징어", "새우", "조개", "연어", "훈제오리"],
+        "units": [("g", 200, 1000, False), ("팩", 1, 3, False), ("kg", 1, 2, True)],
+        "locations": {"냉장": (55, (1, 3, 5)), "냉동": (45, (30, 90, 180))},
+    },
+    "계란/두부": {
+        "weight": 7,
+        "names": ["계란", "메추리알", "두부", "순두부", "연두부", "유부"],
+        "units": [("개", 10, 30, False), ("팩", 1, 2, False)],
+        "locations": {"냉장": (100, (5, 14, 30))},
+    },
+    "유제품": {
+        "weight": 8,
+        "names": ["우유", "저지방 우유", "플레인 요거트", "그릭 요거트", "체다 치즈", "슬라이스 치즈",
+                  "모짜렐라 치즈", "버터", "생크림", "요구르트"],
+        "units": [("L", 1, 2, True), ("mL", 200, 1000, False), ("개", 1, 8, False)],
+        "locations": {"냉장": (95, (5, 10, 30)), "냉동": (5, (30, 60, 120))},
+    },
+    "쌀/잡곡": {
+        "weight": 3,
+        "names": ["백미", "현미", "찹쌀", "잡곡", "귀리", "보리", "밀가루", "부침가루", "국수", "라면"],
+        "units": [("kg", 1, 10, False), ("봉지", 1, 5, False)],
+        "locations": {"실온": (90, (60, 180, 365)), "냉장": (10, (90, 180, 365))},
+    },
+    "조미료/소스": {
+        "weight": 9,
+        "names": ["간장", "고추장", "된장", "쌈장", "참기름", "들기름", "식초", "굴소스", "케첩",
+                  "마요네즈", "고춧가루", "올리고당", "맛술", "액젓", "드레싱"],
+        "units": [("개", 1, 2, False), ("mL", 300, 1000, False), ("g", 200, 1000, False)],
+        "locations": {"냉장": (60, (60, 180, 365)), "실온": (40, (90, 240, 540))},
+    },
+    "반찬/김치": {
+        "weight": 10,
+        "names": ["배추김치", "깍두기", "총각김치", "열무김치", "멸치볶음", "진미채볶음", "장조림",
+                  "콩자반", "어묵볶음", "시금치나물", "무생채", "오이소박이", "단무지", "명란젓"],
+        "units": [("팩", 1, 3, False), ("kg", 1, 5, True), ("g", 200, 800, False)],
+        "locations": {"냉장": (95, (3, 7, 60)), "냉동": (5, (30, 60, 90))},
+    },
+    "즉석식품/밀키트": {
+        "weight": 9,
+        "names": ["만두", "냉동 피자", "떡볶이 밀키트", "부대찌개 밀키트", "햇반", "컵밥", "어묵",
+                  "소시지", "햄", "스팸", "베이컨", "냉동 볶음밥", "돈까스", "치킨너겟"],
+        "units": [("개", 1, 6, False), ("봉지", 1, 3, False), ("팩", 1, 2, False)],
+        "locations": {"냉동": (50, (60, 120, 270)), "냉장": (35, (3, 10, 30)), "실온": (15, (90, 180, 365))},
+    },
+    "빵/디저트": {
+        "weight": 5,
+        "names": ["식빵", "모닝빵", "베이글", "크루아상", "케이크", "떡", "아이스크림", "초콜릿", "쿠키", "마카롱"],
+        "units": [("개", 1, 6, False), ("봉지", 1, 2, False)],
+        "locations": {"실온": (45, (2, 4, 7)), "냉장": (25, (3, 5, 10)), "냉동": (30, (30, 60, 120))},
+    },
+    "음료": {
+        "weight": 6,
+        "names": ["생수", "탄산수", "콜라", "사이다", "오렌지 주스", "두유", "커피", "녹차", "보리차", "식혜"],
+        "units": [("L", 1, 2, True), ("mL", 250, 1500, False), ("개", 1, 12, False)],
+        "locations": {"냉장": (60, (7, 30, 180)), "실온": (40, (30, 180, 365))},
+    },
+    "기타": {
+        "weight": 3,
+        "names": ["견과류", "김", "미역", "다시마", "멸치", "건새우", "참깨", "꿀", "잼", "시리얼"],
+        "units": [("봉지", 1, 3, False), ("g", 50, 500, False), ("개", 1, 3, False)],
+        "locations": {"실온": (60, (60, 180, 365)), "냉장": (30, (30, 90, 180)), "냉동": (10, (90, 180, 365))},
+    },
+}
+
+MEMOS = ["마트 할인", "반찬가게", "엄마가 주심", "개봉함", "절반 사용", "코스트코", "온라인 주문", "선물"]
+
+# 구매일 분포 (평균 N일 전, 최대 MAX_PURCHASE_AGE_DAYS일 전)
+MEAN_PURCHASE_AGE_DAYS = 12
+MAX_PURCHASE_AGE_DAYS = 90
+MEMO_RATIO = 0.1
+
+
+def _weighted_choice(rng, options):
+    """{값: 비율} 또는 {값: (비율, ...)}에서 하나 선택"""
+    keys = list(options)
+    weights = [value[0] if isinstance(value, tuple) else value for value in options.values()]
+    return rng.choices(keys, weights=weights)[0]
+
+
+def generate_foods(count, seed=42, today=None):
+    """
+    가상 음식 데이터 생성
+
+    Args:
+        count: 생성할 음식 개수
+        seed: 난수 시드 (같은 시드/기준 날짜면 같은 결과)
+        today: 기준 날짜 (기본값: 오늘)
+
+    Yields:
+        dict: Database.add_foods 항목과 같은 키를 가진 음식 정보
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    categories = {category: spec["weight"] for category, spec in FOOD_CATALOG.items()}
+
+    for _ in range(count):
+        category = _weighted_choice(rng, categories)
+        spec = FOOD_CATALOG[category]
+        location = _weighted_choice(rng, spec["locations"])
+        low, mode, high = spec["locations"][location][1]
+        unit, min_quantity, max_quantity, fractional = rng.choice(spec["units"])
+
+        age = min(int(rng.expovariate(1 / MEAN_PURCHASE_AGE_DAYS)), MAX_PURCHASE_AGE_DAYS)
+        purchase_date = today - timedelta(days=age)
+        shelf_life = round(rng.triangular(low, high, mode))
+
+        if fractional:
+            quantity = round(rng.uniform(min_quantity, max_quantity) * 2) / 2 or 0.5
+        else:
+            quantity = float(rng.randint(min_quantity, max_quantity))
+
+        yield {
+            "name": rng.choice(spec["names"]),
+            "category": category,
+            "purchase_date": purchase_date,
+            "expiry_date": purchase_date + timedelta(days=shelf_life),
+            "location": location,
+            "quantity": quantity,
+            "unit": unit,
+            "memo": rng.choice(MEMOS) if rng.random() < MEMO_RATIO else None,
+        }
+
+
+def populate_database(db, count, seed=42, today=None, batch_size=10000):
+    """
+    데이터베이스에 가상 음식 N개 추가 (db의 가구로, 배치 단위 INSERT, 배치마다 커밋)
+
+    ORM 객체를 만들지 않고 executemany로 넣으므로 수백만 행도 빠르게 생성할 수 있습니다.
+
+    Returns:
+        int: 추가된 음식 개수
+    """
+    added = 0
+    batch = []
+    for item in generate_foods(count, seed=seed, today=today):
+        item['household_id'] = db.household_id
+        batch.append(item)
+        if len(batch) >= batch_size:
+            added += _insert_batch(db, batch)
+            batch = []
+    if batch:
+        added += _insert_batch(db, batch)
+    return added
+
+
+def _insert_batch(db, batch):
+    with db.engine.begin() as conn:
+        conn.execute(insert(FoodItem), batch)
+    return len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 냉장고 데이터를 생성하여 데이터베이스에 추가합니다.")
+    parser.add_argument("--count", type=int, default=1000, help="생성할 음식 개수")
+    parser.add_argument("--db", help="데이터베이스 URL (기본값: FRIDGE_DB_URL 또는 sqlite:///fridge.db)")
+    parser.add_argument("--household", default=DEFAULT_HOUSEHOLD, help="가구 ID")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--today", type=date.fromisoformat, help="기준 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="INSERT 배치 크기")
+    args = parser.parse_args()
+
+    db = Database(args.db, household_id=args.household)
+    started = time.perf_counter()
+    added = populate_database(db, args.count, seed=args.seed, today=args.today, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - started
+    print(f"음식 {added}개를 추가했습니다. ({elapsed:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
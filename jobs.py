@@ -0,0 +1,298 @@
+"""
+백그라운드 작업 큐 (구글 캘린더 동기화/삭제 등 오래 걸리는 작업용)
+
+작업은 데이터베이스의 jobs 테이블에 저장되므로 페이지를 새로고침해도
+진행 상황을 다시 조회할 수 있고, 서버가 재시작되면 실행 중이던 작업을 다시 실행합니다.
+라우터(HouseholdRouter)를 주면 프로세스에 워커 하나만 두고 모든 저장소에서 모든 가구의 작업을 가져옵니다.
+열려 있는 저장소는 폴링마다, 열려 있지 않은 샤드 파일은 STORAGE_SCAN_SECONDS마다 확인하며
+저장소 하나의 오류(잠긴 파일, 손상된 샤드)는 기록만 하고 다른 저장소의 작업은 계속 실행합니다.
+
+워커는 정기 점검(maintenance) 작업도 주기적으로 등록합니다. (환경 변수 또는 secrets)
+점검은 가구가 아닌 저장소(데이터베이스 파일) 단위 작업(SYSTEM_HOUSEHOLD)이라 가구가 많아도
+주기마다 저장소당 한 번만 모든 가구의 만료 음식을 정리하고 ANALYZE/VACUUM을 실행합니다.
+    FRIDGE_MAINTENANCE_INTERVAL_HOURS=24    점검 주기 (0이면 끔)
+    FRIDGE_EXPIRED_RETENTION_DAYS=30        소비기한이 이 일수보다 오래 지난 음식은 기록(food_history)으로 옮김
+"""
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import tracing
+from database import SYSTEM_HOUSEHOLD
+from db_config import get_setting
+
+# 모든 샤드 파일의 대기 작업과 정기 점검 필요 여부를 확인하는 주기 (초, 매 폴링마다 조회하지 않도록)
+STORAGE_SCAN_SECONDS = 60
+
+# 작업 종류 → 처리 함수 (handler(context) → 결과 dict)
+JOB_HANDLERS = {}
+
+
+def job_handler(kind):
+    """작업 처리 함수 등록 데코레이터"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def expired_retention_days():
+    """만료 음식을 재고에 남겨 둘 일수 (FRIDGE_EXPIRED_RETENTION_DAYS)"""
+    return int(get_setting('FRIDGE_EXPIRED_RETENTION_DAYS', 30))
+
+
+def maintenance_interval():
+    """정기 점검 주기 (초, FRIDGE_MAINTENANCE_INTERVAL_HOURS, 0이면 끔)"""
+    return float(get_setting('FRIDGE_MAINTENANCE_INTERVAL_HOURS', 24)) * 3600
+
+
+class JobContext:
+    """작업 처리 함수에 전달되는 실행 정보"""
+
+    def __init__(self, db, job):
+        self.db = db
+        self.job_id = job.id
+        self.payload = job.get_payload()
+        self.cancelled = False
+
+    def progress(self, done, total):
+        """
+        진행 상황 기록
+
+        Returns:
+            bool: 취소 요청 여부 (True면 처리 함수가 작업을 중단해야 함)
+        """
+        if self.db.update_job_progress(self.job_id, done, total):
+            self.cancelled = True
+        return self.cancelled
+
+
+class JobWorker:
+    """jobs 테이블의 대기 작업을 하나씩 실행하는 백그라운드 스레드"""
+
+    def __init__(self, db=None, handlers=None, poll_interval=2.0, maintenance_interval=None, router=None):
+        """
+        Args:
+            db: Database 인스턴스 (이 가구의 작업만 실행, router를 주면 생략)
+            handlers: 작업 종류 → 처리 함수 (기본값: JOB_HANDLERS)
+            poll_interval: 대기 작업 확인 주기 (초)
+            maintenance_interval: 정기 점검 작업 등록 주기 (초, None/0이면 등록하지 않음)
+            router: HouseholdRouter (주면 열려 있는 모든 저장소의 모든 가구 작업을 실행)
+        """
+        if db is None and router is None:
+            raise ValueError("db 또는 router가 필요합니다.")
+        self.db = db
+        self.router = router
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.poll_interval = poll_interval
+        self.maintenance_interval = maintenance_interval
+        self._next_storage_scan = 0.0
+        self._requeued_urls = set()  # 중단된 작업을 이미 확인한 저장소 (샤드 엔진을 다시 열어도 한 번만)
+        self._pending_storages = {}  # 전체 확인에서 찾은 저장소 (URL → Database, 대기 작업이 없을 때까지 매 폴링 확인)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def storages(self, all_shards=False):
+        """
+        작업을 확인할 저장소별 Database (처음 보는 저장소는 재시작 전에 중단된 작업을 다시 대기열로)
+
+        Args:
+            all_shards: True면 열려 있지 않은 샤드 파일도 포함 (라우터 샤드 모드)
+        """
+        if not self.router:
+            storages = [self.db]
+        else:
+            by_url = {str(storage.engine.url): storage for storage in self.router.storages(all_shards=all_shards)}
+            for url, storage in self._pending_storages.items():
+                by_url.setdefault(url, storage)
+            if all_shards:
+                self._pending_storages = dict(by_url)
+            storages = list(by_url.values())
+        for storage in storages:
+            url = str(storage.engine.url)
+            if url in self._requeued_urls:
+                continue
+            try:
+                requeued = storage.requeue_interrupted_jobs(any_household=self.router is not None)
+            except Exception as e:
+                print(f"중단된 작업 확인 오류 ({url}): {e}")
+                continue
+            self._requeued_urls.add(url)
+            if requeued:
+                print(f"중단된 작업 {requeued}개를 다시 실행합니다.")
+        return storages
+
+    def start(self):
+        """워커 시작 (재시작 전에 중단된 작업은 다시 대기열로)"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self.storages()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="fridge-job-worker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def submit(self, kind, payload=None, db=None):
+        """
+        작업 등록 (같은 종류/인자의 작업이 이미 대기/실행 중이면 그 작업을 반환)
+
+        Args:
+            db: 작업을 등록할 가구의 Database (기본값: 워커의 db)
+
+        Returns:
+            Job: 등록된 작업
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        job = (db or self.db).create_job(kind, payload)
+        self._wakeup.set()
+        return job
+
+    def cancel(self, job_id, db=None):
+        """작업 취소 요청 (db: 작업을 등록한 가구의 Database, 기본값: 워커의 db)"""
+        return (db or self.db).request_job_cancel(job_id)
+
+    def schedule_maintenance(self, storage=None):
+        """
+        저장소의 마지막 정기 점검 작업이 maintenance_interval보다 오래되었으면 새로 등록
+
+        점검 작업은 SYSTEM_HOUSEHOLD로 기록하므로 같은 저장소를 쓰는 여러 가구의 워커가 확인해도 하나만 등록됩니다.
+        이전 점검이 아직 대기/실행 중이면 등록하지 않습니다. (VACUUM이 겹쳐 실행되지 않도록,
+        서버 재시작으로 중단된 점검은 워커가 시작할 때 다시 대기열로 옮겨짐)
+
+        Args:
+            storage: 점검할 저장소의 Database (기본값: 워커의 db)
+
+        Returns:
+            Job: 등록된 작업 (필요 없으면 None)
+        """
+        if not self.maintenance_interval or 'maintenance' not in self.handlers:
+            return None
+        system_db = (storage or self.db).for_household(SYSTEM_HOUSEHOLD)
+        latest = system_db.get_recent_jobs(kinds=['maintenance'], limit=1)
+        if latest and (latest[0].is_active()
+                       or latest[0].created_at > datetime.now() - timedelta(seconds=self.maintenance_interval)):
+            return None
+        job = system_db.create_job('maintenance')
+        self._wakeup.set()
+        return job
+
+    def claim_next_job(self, storage):
+        """저장소에서 실행할 다음 작업 (라우터 모드면 모든 가구, 아니면 워커의 가구와 저장소 점검 작업)"""
+        if self.router:
+            return storage.claim_next_job(self.handlers.keys(), any_household=True)
+        return storage.claim_next_job(self.handlers.keys(), households=(self.db.household_id, SYSTEM_HOUSEHOLD))
+
+    def next_job(self, storages):
+        """
+        저장소를 차례로 확인하여 실행할 다음 작업 가져오기
+
+        한 저장소의 오류는 기록하고 건너뛰므로 다른 저장소(가구)의 작업은 계속 실행됩니다.
+
+        Returns:
+            tuple: (작업, 저장소의 Database) (없으면 (None, None))
+        """
+        for storage in storages:
+            url = str(storage.engine.url)
+            try:
+                job = self.claim_next_job(storage)
+            except Exception as e:
+                print(f"작업 가져오기 오류 ({url}): {e}")
+                traceback.print_exc()
+                self._pending_storages.pop(url, None)  # 열려 있지 않은 샤드는 다음 전체 확인에서 다시 시도
+                continue
+            if job is None:
+                self._pending_storages.pop(url, None)
+                continue
+            return job, storage
+        return None, None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            full_scan = time.monotonic() >= self._next_storage_scan
+            if full_scan:
+                self._next_storage_scan = time.monotonic() + STORAGE_SCAN_SECONDS
+            try:
+                storages = self.storages(all_shards=full_scan)
+            except Exception as e:
+                print(f"작업 저장소 확인 오류: {e}")
+                traceback.print_exc()
+                storages = []
+            if full_scan:
+                for storage in storages:
+                    try:
+                        self.schedule_maintenance(storage)
+                    except Exception as e:
+                        print(f"정기 점검 작업 등록 오류 ({storage.engine.url}): {e}")
+            try:
+                job, storage = self.next_job(storages)
+                if job is not None:
+                    self.run_job(job, storage)
+                    continue
+            except Exception as e:
+                # 데이터베이스 오류(잠김/연결 끊김)로 워커 스레드가 멈추지 않도록 기록 후 다음 폴링에서 재시도
+                print(f"작업 처리 오류: {e}")
+                traceback.print_exc()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def run_job(self, job, storage=None):
+        """작업 하나 실행 후 결과 기록 (storage: 작업이 있는 저장소의 Database, 기본값: 워커의 db)"""
+        context = JobContext((storage or self.db).for_household(job.household_id), job)
+        with tracing.trace("job", kind=job.kind, job_id=job.id):
+            try:
+                result = self.handlers[job.kind](context)
+            except Exception as e:
+                print(f"작업 실행 오류 ({job.kind}): {e}")
+                traceback.print_exc()
+                try:
+                    context.db.finish_job(job.id, 'failed', error=str(e))
+                except Exception as finish_error:
+                    print(f"작업 실패 기록 오류 ({job.kind}): {finish_error}")
+                    traceback.print_exc()
+                return
+            status = 'cancelled' if context.cancelled else 'done'
+            context.db.finish_job(job.id, status, result=result)
+
+
+@job_handler('calendar_sync')
+def run_calendar_sync(context):
+    """향후 SYNC_WINDOW_DAYS일 내 만료 예정 음식을 구글 캘린더에 증분 동기화"""
+    from calendar_integration import GoogleCalendarIntegration, select_foods_to_sync
+
+    calendar = GoogleCalendarIntegration(db=context.db)
+    foods_to_sync = select_foods_to_sync(context.db.get_all_foods())
+    return calendar.sync_food_items(foods_to_sync, progress=context.progress)
+
+
+@job_handler('calendar_delete')
+def run_calendar_delete(context):
+    """냉요에서 생성한 모든 소비기한 이벤트 삭제"""
+    from calendar_integration import GoogleCalendarIntegration
+
+    calendar = GoogleCalendarIntegration(db=context.db)
+    return calendar.delete_expiry_events(progress=context.progress)
+
+
+@job_handler('calendar_delete_food')
+def run_calendar_delete_food(context):
+    """삭제된 음식 하나의 소비기한 이벤트 삭제"""
+    from calendar_integration import GoogleCalendarIntegration
+
+    calendar = GoogleCalendarIntegration(db=context.db)
+    return {'deleted': calendar.delete_food_event(context.payload['food_id'])}
+
+
+@job_handler('maintenance')
+def run_maintenance(context):
+    """저장소의 모든 가구에서 오래 지난 만료 음식을 기록으로 옮긴 뒤 한 번만 통계 갱신/빈 공간 회수"""
+    retention_days = context.payload.get('retention_days', expired_retention_days())
+    return {**context.db.archive_all_expired_foods(retention_days), **context.db.optimize_storage()}
@@ -0,0 +1,118 @@
+"""
+가짜 AI 에이전트 (OpenAI 호출 없이 고정된 응답, 벤치마크/오프라인 개발용)
+
+FRIDGE_MOCK_LLM=1로 앱을 실행하면 get_agent()가 FoodRecognitionAgent 대신 이 에이전트를 반환합니다.
+FRIDGE_MOCK_LLM_LATENCY_MS로 응답 지연을 흉내낼 수 있습니다.
+"""
+import threading
+import time
+
+from tracing import annotate, trace_methods
+
+
+@trace_methods("llm", exclude=("estimate_cost", "stream_recipe_suggestions", "stream_cooking_answer"))
+class MockFoodRecognitionAgent:
+    """FoodRecognitionAgent와 같은 메서드를 가진 가짜 에이전트"""
+
+    # 호출당 기록할 가짜 토큰 수 (모델, 입력, 출력)
+    TOKENS = {
+        "analyze_food_image": ("gpt-4o", 1100, 80),
+        "estimate_shelf_life": ("gpt-4o-mini", 350, 60),
+        "get_recipe_suggestions": ("gpt-4o-mini", 200, 600),
+        "ask_cooking_question": ("gpt-4o-mini", 250, 400),
+    }
+
+    def __init__(self, latency=0.0):
+        """
+        Args:
+            latency: 호출당 응답 지연 (초)
+        """
+        self.latency = latency
+        self.usage = {}
+        self._usage_lock = threading.Lock()
+
+    def _respond(self, method, wait=True):
+        if wait and self.latency:
+            time.sleep(self.latency)
+        model, prompt_tokens, completion_tokens = self.TOKENS[method]
+        annotate(model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        with self._usage_lock:
+            totals = self.usage.setdefault(model, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            totals["requests"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+
+    def estimate_cost(self):
+        """가짜 에이전트는 비용이 들지 않음"""
+        return 0.0
+
+    def analyze_food_image(self, image_data, image_type="image/jpeg"):
+        """항상 우유 1팩으로 인식"""
+        self._respond("analyze_food_image")
+        return {
+            "name": "우유",
+            "category": "유제품",
+            "estimated_shelf_life_days": 7,
+            "location": "냉장",
+            "quantity": 1,
+            "confidence": 95,
+            "detected_date": None,
+        }
+
+    def estimate_shelf_life(self, food_name, category="기타", storage_location="냉장"):
+        self._respond("estimate_shelf_life")
+        return {
+            "estimated_days": 7,
+            "min_days": 5,
+            "max_days": 10,
+            "tips": f"{food_name}은(는) {storage_location} 보관 후 빨리 드세요.",
+        }
+
+    def get_recipe_suggestions(self, ingredients):
+        if not ingredients:
+            return "냉장고에 재료가 없습니다."
+        self._respond("get_recipe_suggestions")
+        return self._recipe_text(ingredients)
+
+    def ask_cooking_question(self, question, ingredients=None):
+        if not question or question.strip() == "":
+            return "질문을 입력해주세요."
+        self._respond("ask_cooking_question")
+        return self._answer_text(question, ingredients)
+
+    def stream_recipe_suggestions(self, ingredients):
+        if not ingredients:
+            yield "냉장고에 재료가 없습니다."
+            return
+        yield from self._stream("get_recipe_suggestions", self._recipe_text(ingredients))
+
+    def stream_cooking_answer(self, question, ingredients=None):
+        if not question or question.strip() == "":
+            yield "질문을 입력해주세요."
+            return
+        yield from self._stream("ask_cooking_question", self._answer_text(question, ingredients))
+
+    def _stream(self, method, text, chunk_size=20):
+        """응답 지연을 조각마다 나누어 흉내내며 텍스트 조각 반환"""
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        self._respond(method, wait=False)
+        for chunk in chunks:
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    @staticmethod
+    def _recipe_text(ingredients):
+        main = ", ".join(list(ingredients)[:3])
+        return "\n\n".join(
+            f"### {idx}. {main} 요리 {idx}\n"
+            f"- 주재료: {main}\n"
+            f"- 조리 방법: 재료 손질 → 볶기 → 간 맞추기\n"
+            f"- 예상 조리 시간: {10 * idx}분"
+            for idx in range(1, 4)
+        )
+
+    @staticmethod
+    def _answer_text(question, ingredients=None):
+        context = f" 냉장고 재료 {len(ingredients)}개를 참고했습니다." if ingredients else ""
+        return f"'{question}'에 대한 답변입니다.{context}"
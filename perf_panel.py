@@ -0,0 +1,151 @@
+"""
+개발자용 성능 패널 (사이드바, 숨김)
+
+?perf=1 쿼리 파라미터 또는 FRIDGE_PERF_PANEL=1 환경 변수로 켭니다.
+켜면 트레이싱도 켜지며, 이 세션의 최근 재실행별 시간 구성과 캐시 적중률,
+세션 스테이트 크기를 사이드바에 표시합니다.
+"""
+import os
+import sys
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import query_profiler
+import tracing
+from cache_utils import all_cache_stats
+
+# 표시할 최근 재실행 수
+PERF_PANEL_RERUNS = 10
+
+# 트레이스 카테고리 → 표 열 이름
+CATEGORY_LABELS = {
+    "db": "DB",
+    "llm": "AI",
+    "image": "이미지",
+    "calendar": "캘린더",
+}
+
+
+def perf_panel_requested():
+    """성능 패널 표시 여부 (환경 변수 또는 ?perf=1)"""
+    if os.getenv('FRIDGE_PERF_PANEL'):
+        return True
+    return st.query_params.get('perf', '').lower() in ('1', 'true', 'on')
+
+
+def session_trace_attrs():
+    """트레이스 기본 속성 (현재 Streamlit 세션 ID, 백그라운드 스레드는 없음)"""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return {'session_id': ctx.session_id} if ctx is not None else {}
+
+
+def trace_breakdown(trace):
+    """
+    재실행 하나의 시간 구성
+
+    렌더링 시간은 전체 시간에서 DB/AI/이미지/캘린더 호출 시간을 뺀 나머지입니다.
+    """
+    summary = trace.summary()
+    row = {
+        "시각": datetime.fromtimestamp(trace.start_epoch_ns / 1e9).strftime('%H:%M:%S'),
+        "실행": trace.attrs.get('view', trace.name),
+        "전체(ms)": round(trace.duration_ms, 1),
+    }
+    measured = 0.0
+    for category, label in CATEGORY_LABELS.items():
+        entry = summary.get(category, {"count": 0, "ms": 0.0})
+        row[f"{label}(ms)"] = round(entry["ms"], 1)
+        row[f"{label}(회)"] = entry["count"]
+        measured += entry["ms"]
+    row["렌더링(ms)"] = round(max(trace.duration_ms - measured, 0.0), 1)
+    return row
+
+
+def approx_size(obj, seen=None):
+    """
+    객체의 대략적인 메모리 크기 (바이트, 컨테이너/객체 속성 포함)
+
+    SQLAlchemy 객체는 매핑된 속성만 셉니다. (_sa_instance_state로 세션 전체를 따라가지 않도록)
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(approx_size(key, seen) + approx_size(value, seen) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(approx_size(item, seen) for item in obj)
+    if hasattr(obj, '__dict__'):
+        return size + sum(approx_size(value, seen) for key, value in vars(obj).items()
+                          if not key.startswith('_sa_'))
+    return size
+
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def show_query_run(run, limit=5):
+    """직전 재실행의 SQL 요약 (쿼리 형태별 횟수/시간/행 수, 많이 실행된 순)"""
+    st.caption(f"직전 재실행 SQL {len(run.queries)}개 · {run.total_ms:.1f}ms")
+    shapes = {}
+    for query in run.queries:
+        entry = shapes.setdefault(query.shape, {"쿼리": query_profiler.short_statement(query.shape, 120), "횟수": 0, "시간(ms)": 0.0, "행": 0})
+        entry["횟수"] += 1
+        entry["시간(ms)"] = round(entry["시간(ms)"] + query.duration_ms, 1)
+        entry["행"] += query.rows or 0
+    rows = sorted(shapes.values(), key=lambda entry: (entry["횟수"], entry["시간(ms)"]), reverse=True)[:limit]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+def show_perf_panel(limit=PERF_PANEL_RERUNS):
+    """사이드바에 성능 패널 표시 (현재 재실행은 끝나기 전이라 직전 재실행까지 표시)"""
+    session_id = session_trace_attrs().get('session_id')
+    traces = [trace for trace in tracing.recent_traces()
+              if trace.attrs.get('session_id') == session_id][:limit]
+
+    with st.sidebar:
+        st.subheader("⚙️ 성능 패널")
+
+        st.caption(f"최근 재실행 {len(traces)}개 (최신순)")
+        if traces:
+            st.dataframe([trace_breakdown(trace) for trace in traces], hide_index=True,
+                         use_container_width=True)
+
+            slowest = sorted(traces[0].spans, key=lambda span: span.duration_ns, reverse=True)[:5]
+            if slowest:
+                st.caption("직전 재실행의 느린 호출")
+                st.dataframe([{"호출": span.name, "시간(ms)": round(span.duration_ms, 1),
+                               "정보": ", ".join(f"{k}={v}" for k, v in span.attrs.items())}
+                              for span in slowest], hide_index=True, use_container_width=True)
+        else:
+            st.info("다음 재실행부터 기록됩니다.")
+
+        profiler = query_profiler.PROFILER
+        if profiler is not None:
+            runs = profiler.recent_runs(1, session_id=session_id)
+            if runs:
+                show_query_run(runs[0])
+
+        st.caption("캐시 적중률")
+        st.dataframe([{"캐시": stats["name"], "항목": f"{stats['entries']}/{stats['max_entries']}",
+                       "적중": stats["hits"], "실패": stats["misses"],
+                       "적중률": f"{stats['hit_rate']:.0%}"}
+                      for stats in all_cache_stats()], hide_index=True, use_container_width=True)
+
+        sizes = sorted(((key, approx_size(value)) for key, value in st.session_state.items()),
+                       key=lambda item: item[1], reverse=True)
+        st.caption(f"세션 스테이트 크기 (전체 {_format_bytes(sum(size for _, size in sizes))})")
+        st.dataframe([{"키": str(key), "크기": _format_bytes(size)} for key, size in sizes[:10]],
+                     hide_index=True, use_container_width=True)
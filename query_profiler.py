@@ -0,0 +1,301 @@
+"""
+SQL 쿼리 프로파일러 (느린 쿼리 로그 + 실행 계획, 재실행별 쿼리 수, N+1 감지)
+
+환경 변수 (FRIDGE_QUERY_PROFILE을 설정해야 엔진 이벤트가 등록됨, 아니면 비용 없음):
+    FRIDGE_QUERY_PROFILE=1                 프로파일러 켜기
+    FRIDGE_SLOW_QUERY_MS=100               이 시간(ms) 이상 걸린 쿼리를 실행 계획과 함께 기록
+    FRIDGE_QUERY_REPEAT_THRESHOLD=10       한 번의 재실행에서 같은 형태의 쿼리가 N번 이상이면 경고
+    FRIDGE_SLOW_QUERY_LOG=slow.jsonl       느린 쿼리를 JSONL 파일에도 기록
+
+쿼리 형태는 파라미터 자리표시자가 들어간 SQL 문자열이며, IN (?, ?, ...) 목록 길이는 무시합니다.
+반환 행 수는 UPDATE/DELETE는 영향받은 행 수, SELECT는 ORM으로 불러온 객체 수입니다.
+(집계 쿼리처럼 ORM 객체가 아닌 결과는 기록하지 않음)
+쿼리 시간은 DBAPI execute 시간이며 결과 행을 가져와 ORM 객체로 만드는 시간은 포함하지 않습니다.
+프로파일러는 프로세스에 하나이며, 가구별 샤드처럼 엔진이 여러 개면 엔진마다 이벤트를 등록합니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+from database import Base
+
+# 프로세스 전역 프로파일러 (install_query_profiler로 설정)
+PROFILER = None
+
+# 보관할 최근 실행 수
+MAX_RUNS = 50
+
+# 실행 계획을 캐시할 쿼리 형태 수
+MAX_CACHED_PLANS = 256
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_SELECT_COLUMNS = re.compile(r"^SELECT (.+?) FROM ", re.IGNORECASE)
+
+
+def statement_shape(statement):
+    """파라미터 목록 길이와 공백 차이를 무시한 쿼리 형태"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?...)", shape)
+
+
+def short_statement(shape, limit=200):
+    """표시용 짧은 쿼리 (SELECT 열 목록 생략)"""
+    short = _SELECT_COLUMNS.sub(lambda m: "SELECT … FROM " if len(m.group(1)) > 40 else m.group(0), shape, count=1)
+    return short if len(short) <= limit else short[:limit] + "…"
+
+
+class QueryRecord:
+    """실행된 SQL 문 하나"""
+
+    __slots__ = ("shape", "statement", "duration_ms", "rows", "plan")
+
+    def __init__(self, shape, statement, duration_ms, rows):
+        self.shape = shape
+        self.statement = statement
+        self.duration_ms = duration_ms
+        self.rows = rows
+        self.plan = None
+
+
+class QueryRun:
+    """Streamlit 재실행 한 번 동안 실행된 쿼리"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now()
+        self.queries = []
+
+    @property
+    def total_ms(self):
+        return sum(query.duration_ms for query in self.queries)
+
+    def repeated_shapes(self, threshold):
+        """
+        threshold번 이상 반복된 쿼리 형태 (N+1 의심)
+
+        Returns:
+            list: (형태, 횟수, 시간 합계 ms) 리스트 (횟수 내림차순)
+        """
+        counts = Counter(query.shape for query in self.queries)
+        return [
+            (shape, count, sum(q.duration_ms for q in self.queries if q.shape == shape))
+            for shape, count in counts.most_common() if count >= threshold
+        ]
+
+
+class QueryProfiler:
+    """엔진 커서 이벤트로 쿼리 시간/행 수를 기록하는 프로파일러"""
+
+    def __init__(self, slow_ms=100.0, repeat_threshold=10, log_path=None):
+        """
+        Args:
+            slow_ms: 느린 쿼리 기준 (ms)
+            repeat_threshold: 한 번의 실행에서 같은 형태가 이 횟수 이상이면 경고
+            log_path: 느린 쿼리 JSONL 로그 경로 (None이면 출력만)
+        """
+        # 이벤트를 등록한 엔진 (닫혀서 사라진 샤드 엔진은 자동으로 빠짐)
+        self.engines = weakref.WeakSet()
+        self.slow_ms = slow_ms
+        self.repeat_threshold = repeat_threshold
+        self.log_path = log_path
+        self.runs = deque(maxlen=MAX_RUNS)
+        self._local = threading.local()
+        self._plans = {}
+        self._log_lock = threading.Lock()
+        self._install_lock = threading.Lock()
+        self._loading = False
+
+    def install(self, engine):
+        """엔진 이벤트 등록 (이미 등록한 엔진이면 무시)"""
+        with self._install_lock:
+            if engine in self.engines:
+                return self
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.listen(engine, "handle_error", self._handle_error)
+            self.engines.add(engine)
+            if not self._loading:
+                event.listen(Base, "load", self._on_load, propagate=True)
+                self._loading = True
+        return self
+
+    def uninstall(self):
+        """모든 엔진의 이벤트 제거"""
+        with self._install_lock:
+            for engine in list(self.engines):
+                event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+                event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+                event.remove(engine, "handle_error", self._handle_error)
+            self.engines = weakref.WeakSet()
+            if self._loading:
+                event.remove(Base, "load", self._on_load)
+                self._loading = False
+
+    def begin_run(self, name="rerun", **attrs):
+        """현재 스레드에서 실행 단위 시작 (진행 중인 실행은 버림)"""
+        run = QueryRun(name, attrs)
+        self._local.run = run
+        self._local.last = None
+        return run
+
+    def end_run(self):
+        """
+        실행 단위 종료 (느린 쿼리 기록, 반복 쿼리 경고)
+
+        Returns:
+            QueryRun: 종료된 실행 (진행 중인 실행이 없으면 None)
+        """
+        run = getattr(self._local, "run", None)
+        if run is None:
+            return None
+        self._local.run = None
+        self._local.last = None
+        self.runs.append(run)
+
+        for query in run.queries:
+            if query.duration_ms >= self.slow_ms:
+                self._log_slow(query, run)
+        for shape, count, total_ms in run.repeated_shapes(self.repeat_threshold):
+            print(f"⚠️ 같은 쿼리가 한 번의 실행에서 {count}번 반복되었습니다 (N+1 의심, 합계 {total_ms:.1f}ms): "
+                  f"{short_statement(shape)}")
+        return run
+
+    @contextmanager
+    def run(self, name="rerun", **attrs):
+        run = self.begin_run(name, **attrs)
+        try:
+            yield run
+        finally:
+            self.end_run()
+
+    def recent_runs(self, limit=None, **attrs):
+        """최근 실행 (최신순, attrs가 모두 일치하는 것만)"""
+        runs = [run for run in reversed(self.runs)
+                if all(run.attrs.get(key) == value for key, value in attrs.items())]
+        return runs[:limit] if limit else runs
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_profiler_start"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        rowcount = cursor.rowcount
+        query = QueryRecord(statement_shape(statement), statement, duration_ms,
+                            rowcount if rowcount is not None and rowcount >= 0 else None)
+
+        if duration_ms >= self.slow_ms and not executemany:
+            query.plan = self._explain(conn, cursor, statement, parameters, query.shape)
+
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            run.queries.append(query)
+            self._local.last = query
+        elif duration_ms >= self.slow_ms:
+            # 재실행 밖(백그라운드 작업 등)의 느린 쿼리는 바로 기록
+            self._log_slow(query, None)
+
+    def _handle_error(self, exception_context):
+        """실패한 쿼리의 시작 시각 제거"""
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_profiler_start"):
+            conn.info["query_profiler_start"].pop()
+
+    def _on_load(self, target, context):
+        """ORM 객체가 로드될 때마다 마지막 쿼리의 행 수 증가"""
+        query = getattr(self._local, "last", None)
+        if query is not None:
+            query.rows = (query.rows or 0) + 1
+
+    def _explain(self, conn, cursor, statement, parameters, shape):
+        """실행 계획 조회 (형태별로 한 번, 같은 DBAPI 연결의 새 커서 사용)"""
+        if shape in self._plans:
+            return self._plans[shape]
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return None
+
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            explain_cursor = cursor.connection.cursor()
+            try:
+                explain_cursor.execute(prefix + statement, parameters)
+                plan = [" | ".join(str(column) for column in row) for row in explain_cursor.fetchall()]
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            plan = [f"실행 계획 조회 실패: {e}"]
+
+        if len(self._plans) >= MAX_CACHED_PLANS:
+            self._plans.clear()
+        self._plans[shape] = plan
+        return plan
+
+    def _log_slow(self, query, run):
+        rows = "?" if query.rows is None else query.rows
+        lines = [f"🐢 느린 쿼리 {query.duration_ms:.1f}ms (행 {rows}): {short_statement(query.shape, 500)}"]
+        lines.extend(f"    {line}" for line in query.plan or [])
+        print("\n".join(lines))
+
+        if self.log_path:
+            entry = {
+                "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+                "run": run.name if run else None,
+                "attrs": run.attrs if run else {},
+                "duration_ms": round(query.duration_ms, 3),
+                "rows": query.rows,
+                "statement": query.statement,
+                "plan": query.plan,
+            }
+            with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def install_query_profiler(engine, enabled=None, slow_ms=None, repeat_threshold=None, log_path=None):
+    """
+    전역 프로파일러에 엔진 추가 (처음이면 프로파일러 생성, 인자가 없으면 환경 변수 설정 사용)
+
+    가구마다 엔진이 다른 샤드 모드에서도 모든 엔진의 쿼리가 같은 실행 기록에 모입니다.
+
+    Args:
+        engine: SQLAlchemy Engine
+        enabled: 켜기 여부 (None이면 FRIDGE_QUERY_PROFILE 설정 여부)
+
+    Returns:
+        QueryProfiler: 설치된 프로파일러 (꺼져 있으면 None)
+    """
+    global PROFILER
+    if not (enabled if enabled is not None else os.getenv("FRIDGE_QUERY_PROFILE")):
+        return None
+    if PROFILER is not None:
+        return PROFILER.install(engine)
+
+    PROFILER = QueryProfiler(
+        slow_ms=slow_ms if slow_ms is not None else float(os.getenv("FRIDGE_SLOW_QUERY_MS", 100)),
+        repeat_threshold=(repeat_threshold if repeat_threshold is not None
+                          else int(os.getenv("FRIDGE_QUERY_REPEAT_THRESHOLD", 10))),
+        log_path=log_path or os.getenv("FRIDGE_SLOW_QUERY_LOG"),
+    ).install(engine)
+    return PROFILER
+
+
+def begin_run(name="rerun", **attrs):
+    """전역 프로파일러의 실행 단위 시작 (설치되지 않았으면 아무것도 하지 않음)"""
+    if PROFILER is not None:
+        PROFILER.begin_run(name, **attrs)
+
+
+def end_run():
+    """전역 프로파일러의 실행 단위 종료"""
+    if PROFILER is not None:
+        return PROFILER.end_run()
+    return None
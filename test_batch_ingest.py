@@ -0,0 +1,49 @@
+"""
+사진 일괄 등록 변환(result_to_food) 테스트 (AI 호출 없이 분석 결과로 실행)
+
+실행:
+    python test_batch_ingest.py    (또는 pytest test_batch_ingest.py)
+"""
+from datetime import date, timedelta
+
+from batch_ingest import result_to_food
+from database import CATEGORIES
+from food_classifier import EGG_SHELF_LIFE_DAYS, FoodClassifier
+
+TODAY = date(2026, 10, 19)
+
+
+def analysis(**fields):
+    return {"name": "우유", "category": "유제품", "estimated_shelf_life_days": 7, "location": "냉장",
+            "quantity": 1, "confidence": 95, "detected_date": None, **fields}
+
+
+def test_egg_date_is_laying_date():
+    """계란 껍질 날짜는 산란일자이므로 보관 일수를 더한 날이 소비기한"""
+    laid = TODAY - timedelta(days=5)
+    food = result_to_food(analysis(name="달걀", category="계란/두부", estimated_shelf_life_days=35,
+                                   quantity=10, detected_date=laid.isoformat()),
+                          FoodClassifier(CATEGORIES), TODAY)
+    assert food["category"] == "계란/두부"
+    assert food["expiry_date"] == laid + timedelta(days=EGG_SHELF_LIFE_DAYS)
+    assert food["purchase_date"] == TODAY
+
+
+def test_printed_date_is_expiry_date():
+    """계란이 아니면 사진에서 읽은 날짜가 곧 소비기한"""
+    food = result_to_food(analysis(detected_date="2026-10-25"), FoodClassifier(CATEGORIES), TODAY)
+    assert food["expiry_date"] == date(2026, 10, 25)
+
+
+def test_without_date_uses_estimated_days():
+    """읽은 날짜가 없거나 형식이 틀리면 AI가 추정한 남은 일수 사용"""
+    classifier = FoodClassifier(CATEGORIES)
+    assert result_to_food(analysis(), classifier, TODAY)["expiry_date"] == TODAY + timedelta(days=7)
+    assert result_to_food(analysis(detected_date="12/01"), classifier, TODAY)["expiry_date"] == TODAY + timedelta(days=7)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,92 @@
+"""
+백그라운드 작업 워커 테스트 (임시 SQLite, 외부 서비스 없이 실행)
+
+실행:
+    python test_jobs.py    (또는 pytest test_jobs.py)
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from household_router import HouseholdRouter
+from jobs import JobWorker
+
+
+def wait_for(condition, timeout=5.0):
+    """condition()이 참이 될 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+def echo_handlers(seen):
+    return {'echo': lambda context: seen.append(context.db.household_id) or {}}
+
+
+def test_runs_jobs_in_shards_that_are_not_open():
+    """열어 둔 샤드 수(max_open)보다 가구가 많아도 모든 가구의 작업을 실행"""
+    with tempfile.TemporaryDirectory() as tmp:
+        router = HouseholdRouter(shard_dir=tmp, max_open=1)
+        dbs = [router.database(household_id) for household_id in ('kim', 'lee', 'park')]
+        jobs = [db.create_job('echo') for db in dbs]
+        assert len(router.storages()) == 1  # 마지막에 연 샤드만 열려 있음
+
+        seen = []
+        worker = JobWorker(router=router, handlers=echo_handlers(seen), poll_interval=0.05).start()
+        try:
+            assert wait_for(lambda: len(seen) == 3)
+        finally:
+            worker.stop(2)
+        assert sorted(seen) == ['kim', 'lee', 'park']
+        assert [db.get_job(job.id).status for db, job in zip(dbs, jobs)] == ['done'] * 3
+
+
+def test_broken_shard_does_not_stop_other_households():
+    """읽을 수 없는 샤드 파일이 있어도 다른 가구의 작업은 계속 실행"""
+    with tempfile.TemporaryDirectory() as tmp:
+        router = HouseholdRouter(shard_dir=tmp)
+        Path(tmp, 'household_broken.db').write_bytes(b'not a sqlite database' * 100)
+        db = router.database('kim')
+
+        seen = []
+        worker = JobWorker(router=router, handlers=echo_handlers(seen), poll_interval=0.05).start()
+        try:
+            job = worker.submit('echo', db=db)
+            assert wait_for(lambda: db.get_job(job.id).status == 'done')
+            assert worker._thread.is_alive()
+        finally:
+            worker.stop(2)
+
+
+def test_worker_survives_database_errors():
+    """작업을 가져오다 데이터베이스 오류가 나도 워커 스레드가 멈추지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = HouseholdRouter(db_url=f"sqlite:///{tmp}/fridge.db").database('kim')
+        claim_next_job = db.claim_next_job
+        failures = [3]
+
+        def flaky_claim(*args, **kwargs):
+            if failures[0]:
+                failures[0] -= 1
+                raise RuntimeError("database is locked")
+            return claim_next_job(*args, **kwargs)
+
+        db.claim_next_job = flaky_claim
+        seen = []
+        worker = JobWorker(db, handlers=echo_handlers(seen), poll_interval=0.05).start()
+        try:
+            job = worker.submit('echo')
+            assert wait_for(lambda: db.get_job(job.id).status == 'done')
+            assert worker._thread.is_alive()
+        finally:
+            worker.stop(2)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,392 @@
+"""
+경량 트레이싱 (DB/AI/이미지/캘린더 호출 시간 측정)
+
+Streamlit 재실행 한 번(또는 백그라운드 작업 하나)을 트레이스 하나로 보고,
+그 안에서 호출된 Database 메서드, AI 에이전트 호출, 이미지 처리, 캘린더 HTTP 요청을 스팬으로 기록합니다.
+
+환경 변수:
+    FRIDGE_TRACE=1                     트레이싱 켜기 (최근 트레이스는 메모리에만 보관)
+    FRIDGE_TRACE_JSONL=traces.jsonl    끝난 트레이스를 JSONL 파일에 한 줄씩 기록 (트레이싱도 켜짐)
+    FRIDGE_TRACE_OTLP=http://localhost:4318/v1/traces
+                                       OpenTelemetry 수집기로 전송 (opentelemetry-sdk,
+                                       opentelemetry-exporter-otlp-proto-http 설치 필요)
+
+꺼져 있을 때는 감싼 함수마다 전역 플래그 확인 한 번만 추가됩니다.
+활성 트레이스가 없는 스레드(작업 워커의 대기 조회 등)의 호출은 기록하지 않습니다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# 메모리에 보관할 최근 트레이스 수
+MAX_TRACES = 200
+
+# 트레이스 하나에 기록할 최대 스팬 수 (넘으면 개수만 셈)
+MAX_SPANS_PER_TRACE = 2000
+
+_enabled = False
+_state = threading.local()
+_recent = deque(maxlen=MAX_TRACES)
+_recent_lock = threading.Lock()
+_exporters = []
+_attrs_provider = None
+
+
+class Span:
+    """트레이스 안의 호출 하나"""
+
+    __slots__ = ("name", "category", "offset_ns", "duration_ns", "depth", "attrs")
+
+    def __init__(self, name, category, offset_ns, depth, attrs):
+        self.name = name
+        self.category = category
+        self.offset_ns = offset_ns  # 트레이스 시작부터의 시작 시각
+        self.duration_ns = 0
+        self.depth = depth
+        self.attrs = attrs
+
+    @property
+    def duration_ms(self):
+        return self.duration_ns / 1e6
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "category": self.category,
+            "offset_ms": round(self.offset_ns / 1e6, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "depth": self.depth,
+            "attrs": self.attrs,
+        }
+
+
+class Trace:
+    """Streamlit 재실행 한 번 또는 백그라운드 작업 하나"""
+
+    def __init__(self, name, attrs):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attrs = attrs
+        self.start_epoch_ns = time.time_ns()
+        self.start_ns = time.perf_counter_ns()
+        self.duration_ns = 0
+        self.spans = []
+        self.dropped_spans = 0
+        self.thread_name = threading.current_thread().name
+
+    @property
+    def duration_ms(self):
+        return self.duration_ns / 1e6
+
+    def summary(self):
+        """
+        카테고리별 호출 수와 시간 합계 (같은 카테고리 안에 중첩된 스팬은 바깥 스팬만 합산)
+
+        Returns:
+            dict: {카테고리: {"count": 호출 수, "ms": 시간 합계}}
+        """
+        totals = {}
+        open_until = {}  # 카테고리 → 현재 합산 중인 바깥 스팬의 종료 시각
+        for span in self.spans:
+            entry = totals.setdefault(span.category, {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            if span.offset_ns >= open_until.get(span.category, -1):
+                entry["ms"] += span.duration_ms
+                open_until[span.category] = span.offset_ns + span.duration_ns
+        return totals
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": self.start_epoch_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "thread": self.thread_name,
+            "attrs": self.attrs,
+            "summary": self.summary(),
+            "dropped_spans": self.dropped_spans,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    """트레이싱 켜기/끄기 (실행 중에도 변경 가능)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def current_trace():
+    return getattr(_state, "trace", None)
+
+
+def set_attrs_provider(provider):
+    """트레이스 시작 시 기본 속성을 돌려줄 함수 등록 (예: Streamlit 세션 ID)"""
+    global _attrs_provider
+    _attrs_provider = provider
+
+
+def start_trace(name, replace=False, **attrs):
+    """
+    현재 스레드에서 트레이스 시작 (꺼져 있거나 이미 진행 중이면 None)
+
+    Args:
+        name: 트레이스 이름
+        replace: True면 진행 중인 트레이스를 버리고 새로 시작 (이전 실행이 중간에 끊긴 경우)
+        **attrs: 트레이스 속성
+
+    Returns:
+        Trace: 시작된 트레이스 (finish_trace에 전달)
+    """
+    if not _enabled or (getattr(_state, "trace", None) is not None and not replace):
+        return None
+    if _attrs_provider is not None:
+        attrs = {**_attrs_provider(), **attrs}
+    trace = Trace(name, attrs)
+    _state.trace = trace
+    _state.stack = []
+    return trace
+
+
+def set_trace_attrs(**attrs):
+    """진행 중인 트레이스에 속성 추가 (선택한 화면 등)"""
+    trace_ = getattr(_state, "trace", None)
+    if trace_ is not None:
+        trace_.attrs.update(attrs)
+
+
+def finish_trace(trace):
+    """start_trace로 시작한 트레이스 종료 후 보관/내보내기"""
+    if trace is None:
+        return
+    trace.duration_ns = time.perf_counter_ns() - trace.start_ns
+    if getattr(_state, "trace", None) is trace:
+        _state.trace = None
+        _state.stack = []
+    with _recent_lock:
+        _recent.append(trace)
+    for exporter in list(_exporters):
+        try:
+            exporter.export(trace)
+        except Exception as e:
+            print(f"트레이스 내보내기 오류 ({type(exporter).__name__}): {e}")
+
+
+@contextmanager
+def trace(name, **attrs):
+    """트레이스 컨텍스트 (이미 진행 중인 트레이스가 있으면 그 안에서 실행)"""
+    started = start_trace(name, **attrs)
+    try:
+        yield started
+    finally:
+        finish_trace(started)
+
+
+def entry_point(name):
+    """
+    진입 함수 데코레이터 (단독으로 실행될 때만 트레이스 시작)
+
+    st.fragment 함수처럼 전체 재실행 중에도, 단독으로도 실행되는 함수에 사용합니다.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled or getattr(_state, "trace", None) is not None:
+                return func(*args, **kwargs)
+            with trace(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _open_span(trace_, name, category, attrs):
+    stack = _state.stack
+    if len(trace_.spans) >= MAX_SPANS_PER_TRACE:
+        trace_.dropped_spans += 1
+        span = Span(name, category, 0, len(stack), attrs)  # 기록하지 않고 중첩 정보만 유지
+    else:
+        span = Span(name, category, time.perf_counter_ns() - trace_.start_ns, len(stack), attrs)
+        trace_.spans.append(span)
+    stack.append(span)
+    return span
+
+
+def _close_span(trace_, span, started_ns):
+    span.duration_ns = time.perf_counter_ns() - started_ns
+    _state.stack.pop()
+
+
+@contextmanager
+def span(name, category, **attrs):
+    """스팬 컨텍스트 (활성 트레이스가 없으면 아무것도 하지 않음)"""
+    trace_ = getattr(_state, "trace", None) if _enabled else None
+    if trace_ is None:
+        yield None
+        return
+    current = _open_span(trace_, name, category, attrs)
+    started_ns = time.perf_counter_ns()
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        _close_span(trace_, current, started_ns)
+
+
+def traced(category, name=None):
+    """함수 호출을 스팬으로 기록하는 데코레이터"""
+    def decorate(func):
+        span_name = name or f"{category}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            trace_ = getattr(_state, "trace", None)
+            if trace_ is None:
+                return func(*args, **kwargs)
+            current = _open_span(trace_, span_name, category, {})
+            started_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                current.attrs["error"] = type(e).__name__
+                raise
+            finally:
+                _close_span(trace_, current, started_ns)
+        return wrapper
+    return decorate
+
+
+def trace_methods(category, exclude=()):
+    """클래스의 공개 메서드를 모두 traced로 감싸는 클래스 데코레이터"""
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or attr in exclude or not callable(value):
+                continue
+            setattr(cls, attr, traced(category, f"{category}.{attr}")(value))
+        return cls
+    return decorate
+
+
+def annotate(**attrs):
+    """진행 중인 가장 안쪽 스팬에 속성 추가 (모델명, 토큰 수 등)"""
+    if not _enabled:
+        return
+    stack = getattr(_state, "stack", None)
+    if stack:
+        stack[-1].attrs.update(attrs)
+
+
+def record(name, category, duration_ms, **attrs):
+    """
+    이미 측정한 시간을 스팬으로 기록 (스레드 풀에서 실행된 작업 등)
+
+    현재 시각에 끝난 것으로 기록합니다.
+    """
+    trace_ = getattr(_state, "trace", None) if _enabled else None
+    if trace_ is None:
+        return
+    if len(trace_.spans) >= MAX_SPANS_PER_TRACE:
+        trace_.dropped_spans += 1
+        return
+    duration_ns = int(duration_ms * 1e6)
+    offset_ns = max(0, time.perf_counter_ns() - trace_.start_ns - duration_ns)
+    span_ = Span(name, category, offset_ns, len(_state.stack), attrs)
+    span_.duration_ns = duration_ns
+    trace_.spans.append(span_)
+
+
+def recent_traces(limit=None, name=None):
+    """최근 트레이스 (최신순)"""
+    with _recent_lock:
+        traces = [t for t in reversed(_recent) if name is None or t.name == name]
+    return traces[:limit] if limit else traces
+
+
+def clear_traces():
+    with _recent_lock:
+        _recent.clear()
+
+
+def add_exporter(exporter):
+    """끝난 트레이스를 받을 내보내기 객체 등록 (export(trace) 메서드 필요)"""
+    _exporters.append(exporter)
+    return exporter
+
+
+class JsonlExporter:
+    """끝난 트레이스를 JSONL 파일에 한 줄씩 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace_):
+        line = json.dumps(trace_.to_dict(), ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OtlpExporter:
+    """끝난 트레이스를 OpenTelemetry 수집기(OTLP/HTTP)로 전송"""
+
+    def __init__(self, endpoint, service_name="fridge_agent"):
+        from opentelemetry import trace as otel_trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        self._otel_trace = otel_trace
+        self._tracer = provider.get_tracer("fridge_agent.tracing")
+
+    def export(self, trace_):
+        start = trace_.start_epoch_ns
+        root = self._tracer.start_span(trace_.name, start_time=start, attributes=_otel_attrs(trace_.attrs))
+        parents = [root]
+        for span_ in trace_.spans:
+            del parents[span_.depth + 1:]
+            context = self._otel_trace.set_span_in_context(parents[-1])
+            attrs = _otel_attrs(dict(span_.attrs, category=span_.category))
+            child = self._tracer.start_span(span_.name, context=context, start_time=start + span_.offset_ns,
+                                            attributes=attrs)
+            child.end(end_time=start + span_.offset_ns + span_.duration_ns)
+            parents.append(child)
+        root.end(end_time=start + trace_.duration_ns)
+
+
+def _otel_attrs(attrs):
+    return {key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in attrs.items() if value is not None}
+
+
+def configure_from_env():
+    """환경 변수로 트레이싱/내보내기 설정 (모듈 import 시 한 번 실행)"""
+    jsonl_path = os.getenv("FRIDGE_TRACE_JSONL")
+    otlp_endpoint = os.getenv("FRIDGE_TRACE_OTLP")
+
+    if jsonl_path:
+        add_exporter(JsonlExporter(jsonl_path))
+    if otlp_endpoint:
+        try:
+            add_exporter(OtlpExporter(otlp_endpoint))
+        except ImportError:
+            print("OpenTelemetry 내보내기를 사용하려면 다음을 설치하세요: "
+                  "pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http")
+
+    set_enabled(os.getenv("FRIDGE_TRACE") or _exporters)
+
+
+configure_from_env()